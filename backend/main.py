@@ -1,7 +1,7 @@
 from fastapi import FastAPI, HTTPException, UploadFile, File, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from pydantic import BaseModel
-import uvicorn
 import os
 import json
 from typing import Dict, List, Optional
@@ -9,12 +9,20 @@ import asyncio
 from datetime import datetime
 import hashlib
 import secrets
+import time
 
 from .services.youtube_service import YouTubeService
 from .services.logo_detection_service import LogoDetectionService
 from .services.video_processing_service import VideoProcessingService
 from .services.analysis_storage_service import AnalysisStorageService
 from .services.notification_service import NotificationService
+from .services.analysis_pipeline_service import AnalysisPipelineService
+from .services.analysis_cache_service import AnalysisCacheService
+from .services.analysis_job_service import AnalysisJobService, JobQueueFullError
+from .services.model_registry_service import ModelRegistryService
+from .services.tracking_service import TrackingService
+from .services.detection_store_service import DetectionStoreService
+from .services.timeline_encoding import TIMELINE_FORMATS, format_analysis, format_brand_analysis
 
 app = FastAPI(title="브랜드 추적 시스템 API", version="1.0.0")
 
@@ -54,15 +62,83 @@ class ConnectionManager:
         else:
             print(f"⚠️ WebSocket 미연결: {user_id}")
             return False
+    
+    async def send_event(self, user_id: str, message: dict) -> bool:
+        """진행 상황처럼 자주 보내는 이벤트를 로그 없이 전송합니다."""
+        websocket = self.active_connections.get(user_id)
+        if websocket is None:
+            return False
+        try:
+            await websocket.send_json(message)
+            return True
+        except Exception:
+            return False
 
 manager = ConnectionManager()
 
+class AnalysisProgressReporter:
+    """분석 진행 상황을 사용자 WebSocket과 작업 상태로 전달합니다.
+    
+    파이프라인의 추론 스레드에서 호출해도 전송을 이벤트 루프에 맡기고 바로 반환합니다.
+    이전 진행 이벤트를 아직 보내는 중이면 새 진행 이벤트는 버립니다 (단계 전환 이벤트는 항상 보냄).
+    """
+    
+    def __init__(self, user_id: str = None, job_id: str = None, analysis_type: str = "youtube"):
+        self.user_id = user_id
+        self.job_id = job_id
+        self.analysis_type = analysis_type
+        self.loop = asyncio.get_running_loop()
+        self._pending = None
+    
+    def stage(self, stage: str, message: str):
+        """다운로드/분석/요약 등 단계 전환을 알립니다."""
+        self._send({"stage": stage, "message": message}, droppable=False)
+    
+    def report(self, progress: Dict):
+        """파이프라인의 프레임 진행 상황을 알립니다 (progress_callback으로 사용)."""
+        self._send(progress, droppable=True)
+    
+    def _send(self, progress: Dict, droppable: bool):
+        event = {
+            "type": "analysis_progress",
+            "job_id": self.job_id,
+            "analysis_type": self.analysis_type,
+            "timestamp": datetime.now().isoformat(),
+            **progress
+        }
+        if self.job_id:
+            job_service.update_progress(self.job_id, event)
+        if not self.user_id or self.user_id not in manager.active_connections:
+            return
+        if droppable and self._pending is not None and not self._pending.done():
+            return
+        self._pending = asyncio.run_coroutine_threadsafe(manager.send_event(self.user_id, event), self.loop)
+
 # 서비스 인스턴스 생성
 youtube_service = YouTubeService()
-logo_detection_service = LogoDetectionService()
+model_registry_service = ModelRegistryService()
+# 모델은 서버가 요청을 받기 시작한 뒤 백그라운드에서 로드합니다 (/ready로 준비 상태 확인)
+logo_detection_service = LogoDetectionService(model_registry_service, load_model=False)
 video_processing_service = VideoProcessingService()
 storage_service = AnalysisStorageService()
 notification_service = NotificationService()
+tracking_service = TrackingService()
+detection_store_service = DetectionStoreService()
+analysis_pipeline_service = AnalysisPipelineService(video_processing_service, logo_detection_service, tracking_service)
+cache_service = AnalysisCacheService()
+job_service = AnalysisJobService()
+
+@app.on_event("startup")
+async def start_model_loading():
+    logo_detection_service.start_background_load()
+
+@app.on_event("startup")
+async def start_job_workers():
+    await job_service.start()
+
+@app.on_event("shutdown")
+async def stop_job_workers():
+    await job_service.stop()
 
 # 사용자 데이터 파일 경로
 USERS_FILE = "users.json"
@@ -92,6 +168,14 @@ class YouTubeAnalysisRequest(BaseModel):
     url: str
     resolution: str = "360p"
     frame_interval: float = 0.5
+    skip_duplicate_frames: bool = False  # 거의 같은 연속 프레임은 탐지 결과 재사용
+    duplicate_threshold: Optional[float] = None  # 유사 프레임 판정 기준 (0~1, 기본값은 서버 설정)
+    sampling_mode: str = "uniform"  # "uniform" 또는 "adaptive" (성긴 탐색 후 필요한 구간만 촘촘히)
+    coarse_interval: Optional[float] = None  # adaptive 모드의 성긴 탐색 간격 (초, 기본값은 서버 설정)
+    tiling_mode: str = "off"  # "off", "all", "promising" (작은 로고를 위해 겹치는 타일로도 탐지)
+    max_tiles_per_frame: Optional[int] = None  # 프레임당 최대 타일 수 (기본값은 서버 설정)
+    track_stride: int = 1  # k > 1이면 k번째 프레임만 추론하고 사이 프레임은 트래킹으로 채움
+    force_refresh: bool = False  # True면 캐시된 결과를 무시하고 새로 분석
 
 class AnalysisResponse(BaseModel):
     video_info: Dict
@@ -99,6 +183,7 @@ class AnalysisResponse(BaseModel):
     total_analysis_time: float
     timestamp: str
     analysis_settings: Dict
+    processing_stats: Dict = {}
 
 class RegisterRequest(BaseModel):
     id: str  # 이메일 형식
@@ -116,6 +201,15 @@ class AuthResponse(BaseModel):
     token: Optional[str] = None
     user: Optional[Dict] = None
 
+class ModelRegisterRequest(BaseModel):
+    path: str
+    version: Optional[str] = None  # 생략하면 v1, v2, ... 순서로 자동 지정
+    backend: str = "pytorch"  # "pytorch", "onnx", "openvino"
+    precision: str = "fp32"  # "fp32" 또는 "int8"
+    image_size: int = 1280
+    description: str = ""
+    activate: bool = False  # True면 등록 후 바로 백그라운드 교체 시작
+
 class NotificationSendRequest(BaseModel):
     to_user: str
     from_user: str
@@ -124,6 +218,54 @@ class NotificationSendRequest(BaseModel):
     message: str
     data: Optional[Dict] = None
 
+def build_cache_key(source_id: str, settings: Dict) -> str:
+    """영상 식별자, 분석 설정, 모델 정보로 결과 캐시 키를 만듭니다."""
+    return cache_service.make_key(source_id, {
+        **settings,
+        "model": logo_detection_service.get_model_identity(),
+        "confidence_threshold": logo_detection_service.confidence_threshold
+    })
+
+async def save_raw_detections(raw_results: List[Dict], frame_interval: float, track_stride: int,
+                              processing_stats: Dict) -> Optional[str]:
+    """원시 탐지를 열 단위 저장소에 기록하고 저장소 ID를 반환합니다. 실패해도 분석 결과는 그대로 반환합니다."""
+    metadata = {
+        "frame_interval": frame_interval,
+        "track_stride": track_stride,
+        "confidence_floor": processing_stats.get("confidence_floor"),
+        "confidence_threshold": logo_detection_service.confidence_threshold,
+        "model_version": processing_stats.get("detector", {}).get("model_version")
+    }
+    try:
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(None, detection_store_service.save, raw_results, metadata)
+    except Exception as e:
+        print(f"⚠️ 원시 탐지 저장 실패: {str(e)}")
+        return None
+
+def check_timeline_format(timeline_format: str):
+    """타임라인 표현 방식 쿼리 파라미터(expanded/compact)를 검증합니다."""
+    if timeline_format not in TIMELINE_FORMATS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"timeline_format은 {', '.join(TIMELINE_FORMATS)} 중 하나여야 합니다."
+        )
+
+def respond_from_cache(entry: Dict, analysis_type: str, username: str = None) -> AnalysisResponse:
+    """캐시된 분석 결과로 응답을 만들고 사용자 히스토리에도 기록합니다."""
+    response = dict(entry["response"])
+    response["processing_stats"] = {
+        **response.get("processing_stats", {}),
+        "cache_hit": True,
+        "cached_at": datetime.fromtimestamp(entry["created_at"]).isoformat()
+    }
+    analysis_result = AnalysisResponse(**response)
+    
+    analysis_id = storage_service.save_analysis(analysis_result.dict(), analysis_type, username)
+    if analysis_id:
+        print(f"💾 캐시된 분석 결과 저장됨: {analysis_id} (사용자: {username})")
+    return analysis_result
+
 @app.get("/")
 async def root():
     return {"message": "브랜드 추적 시스템 API가 실행 중입니다!"}
@@ -216,47 +358,77 @@ async def login(request: LoginRequest):
         print(f"❌ 로그인 오류: {str(e)}")
         raise HTTPException(status_code=500, detail=f"로그인 중 오류가 발생했습니다: {str(e)}")
 
-@app.post("/analyze/youtube", response_model=AnalysisResponse)
-async def analyze_youtube_video(request: YouTubeAnalysisRequest, username: str = None):
-    """유튜브 영상을 분석하여 브랜드 로고를 탐지합니다."""
+async def run_youtube_analysis(request: YouTubeAnalysisRequest, username: str = None,
+                               job_id: str = None) -> AnalysisResponse:
+    """유튜브 영상을 다운로드하고 브랜드 로고를 탐지해 결과를 저장합니다.
+    
+    /analyze/youtube 요청과 분석 작업 워커가 함께 사용하며, 진행 상황은 사용자 WebSocket으로 전달합니다.
+    """
     video_path = None  # finally에서 사용하기 위해 초기화
+    progress = AnalysisProgressReporter(username, job_id, "youtube")
     try:
         start_time = datetime.now()
         
         print(f"🎬 [YOUTUBE 분석] 요청받음: {request.url} (사용자: {username})")
         print(f"🎬 [YOUTUBE 분석] 해상도: {request.resolution}, 프레임 간격: {request.frame_interval}초")
         
-        # 1. 유튜브 영상 정보 먼저 가져오기
+        # 0. 같은 영상을 같은 설정으로 분석한 결과가 있으면 바로 반환
+        video_id = youtube_service.extract_video_id(request.url)
+        cache_key = build_cache_key(
+            f"youtube:{video_id or request.url}",
+            request.dict(exclude={"url", "force_refresh"})
+        )
+        if not request.force_refresh:
+            cached = cache_service.get(cache_key)
+            if cached:
+                progress.stage("completed", "저장된 분석 결과를 사용합니다.")
+                return respond_from_cache(cached, "youtube", username)
+        
+        # 1. 유튜브 영상 정보 먼저 가져오기 (추출은 한 번만 하고 다운로드에 재사용)
         print("📋 영상 정보 가져오는 중...")
-        video_info_raw = await youtube_service.get_video_info(request.url)
+        progress.stage("downloading", "영상을 다운로드하는 중입니다.")
+        ydl_info = await youtube_service.extract_info(request.url)
+        video_info_raw = youtube_service.summarize_info(ydl_info)
         
-        # 2. 유튜브 영상 다운로드
+        # 2. 유튜브 영상 다운로드 (같은 영상을 동시에 요청하면 다운로드 한 번을 공유)
         print("📥 영상 다운로드 중...")
-        video_path = await youtube_service.download_video(
+        video_path = await youtube_service.acquire_video(
             request.url, 
-            resolution=request.resolution
+            resolution=request.resolution,
+            info=ydl_info
         )
         
         # 3. 영상 파일 정보 추출
         print("📊 영상 파일 분석 중...")
         video_file_info = await video_processing_service.get_video_info(video_path)
         
-        # 4. 프레임 추출
-        print("🖼️ 프레임 추출 중...")
-        frames = await video_processing_service.extract_frames(
+        # 4~5. 프레임 추출과 로고 탐지 (디코딩과 추론을 동시에 진행)
+        print("🔍 프레임 추출 및 브랜드 로고 탐지 중...")
+        progress.stage("analyzing", "브랜드 로고를 탐지하는 중입니다.")
+        raw_results = []
+        detection_results, processing_stats = await analysis_pipeline_service.run(
             video_path, 
-            frame_interval=request.frame_interval
+            frame_interval=request.frame_interval,
+            skip_duplicates=request.skip_duplicate_frames,
+            duplicate_threshold=request.duplicate_threshold,
+            sampling_mode=request.sampling_mode,
+            coarse_interval=request.coarse_interval,
+            progress_callback=progress.report,
+            tiling_mode=request.tiling_mode,
+            max_tiles_per_frame=request.max_tiles_per_frame,
+            track_stride=request.track_stride,
+            raw_results=raw_results
+        )
+        raw_detections_id = await save_raw_detections(
+            raw_results, request.frame_interval, request.track_stride, processing_stats
         )
         
-        print(f"📸 총 {len(frames)}개 프레임 추출 완료")
-        
-        # 5. 로고 탐지
-        print("🔍 브랜드 로고 탐지 중...")
-        detection_results = await logo_detection_service.detect_logos_in_frames(frames)
+        print(f"📸 총 {len(detection_results)}개 프레임 분석 완료")
         
         # 6. 결과 요약
         print("📈 분석 결과 요약 중...")
-        brand_analysis = await logo_detection_service.summarize_timeline(detection_results)
+        progress.stage("summarizing", "분석 결과를 요약하는 중입니다.")
+        brand_analysis = await logo_detection_service.summarize_timeline(detection_results, request.frame_interval)
         
         # 7. 영상 정보 통합
         video_info = {
@@ -285,34 +457,105 @@ async def analyze_youtube_video(request: YouTubeAnalysisRequest, username: str =
             timestamp=datetime.now().isoformat(),
             analysis_settings={
                 "resolution": request.resolution,
-                "frame_interval": request.frame_interval
-            }
+                "frame_interval": request.frame_interval,
+                "skip_duplicate_frames": request.skip_duplicate_frames,
+                "sampling_mode": request.sampling_mode,
+                "tiling_mode": request.tiling_mode,
+                "track_stride": request.track_stride,
+                # 결과를 만든 탐지 모델 버전
+                "model_version": processing_stats.get("detector", {}).get("model_version"),
+                # 다른 신뢰도 기준으로 다시 요약할 때 사용하는 원시 탐지 저장소
+                "raw_detections_id": raw_detections_id
+            },
+            processing_stats=processing_stats
         )
         
         # 분석 결과 저장 (사용자 정보 포함)
         analysis_id = storage_service.save_analysis(analysis_result.dict(), "youtube", username)
         if analysis_id:
             print(f"💾 분석 결과 저장됨: {analysis_id} (사용자: {username})")
+        cache_service.put(cache_key, analysis_result.dict())
         
+        progress.stage("completed", "분석이 완료되었습니다.")
         return analysis_result
-        
+    
+    except Exception as e:
+        progress.stage("failed", str(e))
+        raise
+    
+    finally:
+        # 항상 임시 파일 반환 (공유 중인 다른 요청이 없으면 삭제됨)
+        if video_path:
+            youtube_service.release_video(video_path)
+
+@app.post("/analyze/youtube", response_model=AnalysisResponse)
+async def analyze_youtube_video(request: YouTubeAnalysisRequest, username: str = None,
+                                timeline_format: str = "expanded"):
+    """유튜브 영상을 분석하여 브랜드 로고를 탐지합니다.
+    
+    timeline_format=compact면 브랜드별 타임라인을 연속 구간([시작, 끝, 프레임 수, 평균 신뢰도])으로 묶어 반환합니다.
+    """
+    check_timeline_format(timeline_format)
+    try:
+        analysis_result = await run_youtube_analysis(request, username)
+        return AnalysisResponse(**format_analysis(analysis_result.dict(), timeline_format))
     except Exception as e:
         print(f"❌ YouTube 분석 오류: {str(e)}")
         raise HTTPException(status_code=500, detail=f"분석 중 오류가 발생했습니다: {str(e)}")
+
+@app.post("/jobs/youtube")
+async def submit_youtube_job(request: YouTubeAnalysisRequest, username: str = None):
+    """유튜브 영상 분석 작업을 등록하고 작업 ID를 바로 반환합니다.
     
-    finally:
-        # 항상 임시 파일 정리 (성공/실패 무관)
-        if video_path and os.path.exists(video_path):
-            try:
-                os.remove(video_path)
-                print("🗑️ 임시 파일 정리 완료")
-            except Exception as cleanup_error:
-                print(f"⚠️ 임시 파일 정리 실패: {cleanup_error}")
+    진행 상태와 결과는 GET /jobs/{job_id}로 조회합니다.
+    """
+    async def runner(job_id: str):
+        analysis_result = await run_youtube_analysis(request, username, job_id)
+        return analysis_result.dict()
+    
+    try:
+        job = job_service.submit("youtube", runner, username, request.dict())
+        return {
+            "status": "success",
+            "data": job
+        }
+    except JobQueueFullError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"분석 작업 등록 오류: {str(e)}")
+
+@app.get("/jobs/status")
+async def get_job_queue_status():
+    """분석 작업 대기열과 워커 현황을 확인합니다."""
+    return job_service.get_stats()
+
+@app.get("/jobs/{job_id}")
+async def get_job(job_id: str, username: str = None, timeline_format: str = "expanded"):
+    """분석 작업 상태를 조회합니다. 완료된 작업은 분석 결과를 함께 반환합니다.
+    
+    username을 주면 그 사용자가 등록한 작업만 조회합니다 (다른 사용자의 작업이면 404).
+    """
+    check_timeline_format(timeline_format)
+    job = job_service.get_job(job_id, username=username)
+    if job is None:
+        raise HTTPException(status_code=404, detail="분석 작업을 찾을 수 없거나 권한이 없습니다.")
+    if job.get("result"):
+        job["result"] = format_analysis(job["result"], timeline_format)
+    return {
+        "status": "success",
+        "data": job
+    }
 
 @app.post("/analyze/upload")
-async def analyze_uploaded_video(file: UploadFile = File(...), username: str = None):
+async def analyze_uploaded_video(file: UploadFile = File(...), username: str = None,
+                                 skip_duplicate_frames: bool = False, sampling_mode: str = "uniform",
+                                 tiling_mode: str = "off", max_tiles_per_frame: Optional[int] = None,
+                                 track_stride: int = 1, force_refresh: bool = False,
+                                 timeline_format: str = "expanded"):
     """업로드된 영상 파일을 분석하여 브랜드 로고를 탐지합니다."""
+    check_timeline_format(timeline_format)
     file_path = None  # finally에서 사용하기 위해 초기화
+    progress = AnalysisProgressReporter(username, analysis_type="upload")
     try:
         start_time = datetime.now()
         
@@ -324,11 +567,37 @@ async def analyze_uploaded_video(file: UploadFile = File(...), username: str = N
             content = await file.read()
             buffer.write(content)
         
+        # 같은 파일을 같은 설정으로 분석한 결과가 있으면 바로 반환
+        cache_key = build_cache_key(
+            f"upload:{cache_service.hash_content(content)}",
+            {"skip_duplicate_frames": skip_duplicate_frames, "sampling_mode": sampling_mode,
+             "tiling_mode": tiling_mode, "max_tiles_per_frame": max_tiles_per_frame,
+             "track_stride": track_stride}
+        )
+        if not force_refresh:
+            cached = cache_service.get(cache_key)
+            if cached:
+                progress.stage("completed", "저장된 분석 결과를 사용합니다.")
+                analysis_result = respond_from_cache(cached, "upload", username)
+                return AnalysisResponse(**format_analysis(analysis_result.dict(), timeline_format))
+        
         # 영상 분석
+        progress.stage("analyzing", "브랜드 로고를 탐지하는 중입니다.")
         video_info = await video_processing_service.get_video_info(file_path)
-        frames = await video_processing_service.extract_frames(file_path)
-        detection_results = await logo_detection_service.detect_logos_in_frames(frames)
-        brand_analysis = await logo_detection_service.summarize_timeline(detection_results)
+        raw_results = []
+        detection_results, processing_stats = await analysis_pipeline_service.run(
+            file_path,
+            skip_duplicates=skip_duplicate_frames,
+            sampling_mode=sampling_mode,
+            progress_callback=progress.report,
+            tiling_mode=tiling_mode,
+            max_tiles_per_frame=max_tiles_per_frame,
+            track_stride=track_stride,
+            raw_results=raw_results
+        )
+        raw_detections_id = await save_raw_detections(raw_results, 0.5, track_stride, processing_stats)
+        progress.stage("summarizing", "분석 결과를 요약하는 중입니다.")
+        brand_analysis = await logo_detection_service.summarize_timeline(detection_results, 0.5)
         
         end_time = datetime.now()
         analysis_time = (end_time - start_time).total_seconds()
@@ -341,18 +610,30 @@ async def analyze_uploaded_video(file: UploadFile = File(...), username: str = N
             timestamp=datetime.now().isoformat(),
             analysis_settings={
                 "resolution": "original",
-                "frame_interval": 0.5
-            }
+                "frame_interval": 0.5,
+                "skip_duplicate_frames": skip_duplicate_frames,
+                "sampling_mode": sampling_mode,
+                "tiling_mode": tiling_mode,
+                "track_stride": track_stride,
+                # 결과를 만든 탐지 모델 버전
+                "model_version": processing_stats.get("detector", {}).get("model_version"),
+                # 다른 신뢰도 기준으로 다시 요약할 때 사용하는 원시 탐지 저장소
+                "raw_detections_id": raw_detections_id
+            },
+            processing_stats=processing_stats
         )
         
         # 분석 결과 저장 (사용자 정보 포함)
         analysis_id = storage_service.save_analysis(analysis_result.dict(), "upload", username)
         if analysis_id:
             print(f"💾 업로드 분석 결과 저장됨: {analysis_id} (사용자: {username})")
+        cache_service.put(cache_key, analysis_result.dict())
         
-        return analysis_result
+        progress.stage("completed", "분석이 완료되었습니다.")
+        return AnalysisResponse(**format_analysis(analysis_result.dict(), timeline_format))
         
     except Exception as e:
+        progress.stage("failed", str(e))
         raise HTTPException(status_code=500, detail=f"분석 중 오류가 발생했습니다: {str(e)}")
     
     finally:
@@ -369,10 +650,87 @@ async def get_model_status():
     """YOLO 모델 상태를 확인합니다."""
     return await logo_detection_service.get_model_status()
 
+@app.get("/models")
+async def list_model_versions():
+    """등록된 모델 버전 목록과 현재 사용 중인 버전을 조회합니다."""
+    return {
+        "status": "success",
+        "data": model_registry_service.list_versions(),
+        "active_version": logo_detection_service.model_version,
+        "loading_version": logo_detection_service.loading_version,
+        "last_load_error": logo_detection_service.last_load_error
+    }
+
+@app.post("/models/register")
+async def register_model_version(request: ModelRegisterRequest):
+    """새 모델 버전을 등록합니다. activate가 True면 백그라운드 교체를 시작합니다."""
+    try:
+        entry = model_registry_service.register(
+            request.path, request.version, request.backend,
+            request.precision, request.image_size, request.description
+        )
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"모델 등록 오류: {str(e)}")
+    
+    if request.activate:
+        start_model_activation(entry["version"])
+    return {
+        "status": "success",
+        "data": entry
+    }
+
+@app.post("/models/{version}/activate")
+async def activate_model_version(version: str):
+    """모델 버전을 백그라운드에서 로드/예열한 뒤 새 분석부터 사용하도록 교체합니다.
+    
+    교체 전에 시작한 분석은 이전 모델로 끝까지 실행됩니다. 진행 상황은 GET /models로 확인합니다.
+    """
+    if model_registry_service.get(version) is None:
+        raise HTTPException(status_code=404, detail=f"등록되지 않은 모델 버전입니다: {version}")
+    if logo_detection_service.loading_version:
+        raise HTTPException(status_code=409, detail=f"다른 모델 버전을 로드하는 중입니다: {logo_detection_service.loading_version}")
+    
+    start_model_activation(version)
+    return {
+        "status": "success",
+        "message": f"모델 버전 {version} 로드를 시작했습니다.",
+        "current_version": logo_detection_service.model_version
+    }
+
+def start_model_activation(version: str):
+    """모델 교체를 백그라운드 작업으로 시작합니다. 실패 사유는 last_load_error에 남습니다."""
+    async def activate():
+        try:
+            await logo_detection_service.activate_version(version)
+        except Exception as e:
+            print(f"❌ {str(e)}")
+    
+    asyncio.create_task(activate())
+
+@app.get("/cache/status")
+async def get_cache_status():
+    """분석 결과 캐시 사용 현황을 확인합니다."""
+    return cache_service.get_stats()
+
 @app.get("/health")
 async def health_check():
     return {"status": "healthy", "timestamp": datetime.now().isoformat()}
 
+@app.get("/ready")
+async def readiness_check():
+    """탐지 모델이 로드/예열되어 분석 요청을 바로 처리할 수 있는지 확인합니다."""
+    body = {
+        "status": "ready" if logo_detection_service.is_ready() else logo_detection_service.load_state,
+        "model_version": logo_detection_service.model_version,
+        "load_seconds": logo_detection_service.load_seconds,
+        "timestamp": datetime.now().isoformat()
+    }
+    if not logo_detection_service.is_ready():
+        if logo_detection_service.last_load_error:
+            body["error"] = logo_detection_service.last_load_error
+        return JSONResponse(status_code=503, content=body)
+    return body
+
 @app.get("/users/creators")
 async def get_creators():
     """크리에이터 목록을 가져옵니다."""
@@ -395,16 +753,21 @@ async def get_creators():
         raise HTTPException(status_code=500, detail=f"크리에이터 목록 조회 오류: {str(e)}")
 
 @app.get("/analysis/history")
-async def get_analysis_history(limit: int = 20, username: str = None):
+async def get_analysis_history(limit: int = 20, username: str = None, timeline_format: str = "expanded"):
     """분석 히스토리를 조회합니다.
     
     Args:
         limit: 반환할 최대 개수
         username: 사용자 id (이메일) - users.json의 id와 일치해야 함
+        timeline_format: expanded(프레임별 timestamps/confidence_scores) 또는 compact(연속 구간 intervals)
     """
+    check_timeline_format(timeline_format)
     try:
         print(f"📊 [히스토리 조회] 사용자 id: {username}, 제한: {limit}")
-        history = storage_service.get_analysis_history(limit, username)
+        history = [
+            format_analysis(analysis, timeline_format)
+            for analysis in storage_service.get_analysis_history(limit, username)
+        ]
         return {
             "status": "success",
             "data": history,
@@ -414,10 +777,10 @@ async def get_analysis_history(limit: int = 20, username: str = None):
         raise HTTPException(status_code=500, detail=f"히스토리 조회 오류: {str(e)}")
 
 @app.get("/analysis/statistics")
-async def get_analysis_statistics():
-    """분석 통계 요약을 조회합니다."""
+async def get_analysis_statistics(username: str = None, top_k: int = 10):
+    """분석 통계 요약을 조회합니다. username을 주면 해당 사용자의 분석만 집계합니다."""
     try:
-        stats = storage_service.get_statistics_summary()
+        stats = storage_service.get_statistics_summary(username, top_k)
         return {
             "status": "success",
             "data": stats
@@ -425,15 +788,29 @@ async def get_analysis_statistics():
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"통계 조회 오류: {str(e)}")
 
+@app.post("/analysis/statistics/rebuild")
+async def rebuild_analysis_statistics():
+    """저장된 분석 전체로 통계 집계를 다시 계산하고 기존 집계와 다른 항목을 반환합니다."""
+    try:
+        loop = asyncio.get_event_loop()
+        report = await loop.run_in_executor(None, storage_service.rebuild_statistics)
+        return {
+            "status": "success",
+            "data": report
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"통계 재계산 오류: {str(e)}")
+
 @app.get("/analysis/{analysis_id}")
-async def get_analysis_by_id(analysis_id: str, username: str = None):
+async def get_analysis_by_id(analysis_id: str, username: str = None, timeline_format: str = "expanded"):
     """특정 ID의 분석 결과를 조회합니다."""
+    check_timeline_format(timeline_format)
     try:
         analysis = storage_service.get_analysis_by_id(analysis_id, username)
         if analysis:
             return {
                 "status": "success",
-                "data": analysis
+                "data": format_analysis(analysis, timeline_format)
             }
         else:
             raise HTTPException(status_code=404, detail="분석 결과를 찾을 수 없습니다.")
@@ -442,13 +819,77 @@ async def get_analysis_by_id(analysis_id: str, username: str = None):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"분석 결과 조회 오류: {str(e)}")
 
+@app.get("/analysis/{analysis_id}/rethreshold")
+async def rethreshold_analysis(analysis_id: str, confidence: float, brands: Optional[str] = None,
+                               username: str = None, timeline_format: str = "expanded"):
+    """저장된 원시 탐지로 다른 신뢰도 기준/브랜드 필터의 brand_analysis를 다시 계산합니다 (추론 없음).
+    
+    Args:
+        confidence: 적용할 신뢰도 기준 (분석 당시 원시 탐지 기준 신뢰도 이상)
+        brands: 쉼표로 구분한 브랜드 목록 (생략하면 전체)
+        timeline_format: expanded 또는 compact (brand_analysis 타임라인 표현 방식)
+    """
+    check_timeline_format(timeline_format)
+    try:
+        analysis = storage_service.get_analysis_by_id(analysis_id, username)
+        if not analysis:
+            raise HTTPException(status_code=404, detail="분석 결과를 찾을 수 없습니다.")
+        
+        raw_detections_id = analysis.get("analysis_settings", {}).get("raw_detections_id")
+        started = time.perf_counter()
+        columns = detection_store_service.load(raw_detections_id) if raw_detections_id else None
+        if columns is None:
+            raise HTTPException(status_code=404, detail="이 분석에는 저장된 원시 탐지 결과가 없습니다.")
+        
+        metadata = columns["metadata"]
+        floor = metadata.get("confidence_floor") or 0
+        if confidence < floor:
+            raise HTTPException(status_code=400, detail=f"신뢰도 기준은 {floor} 이상이어야 합니다.")
+        
+        brand_filter = [brand.strip() for brand in brands.split(",") if brand.strip()] if brands else None
+        raw_results = detection_store_service.to_frame_results(columns, brands=brand_filter)
+        loop = asyncio.get_event_loop()
+        brand_analysis = await loop.run_in_executor(
+            None, analysis_pipeline_service.resummarize_sync, raw_results,
+            metadata.get("frame_interval", 0.5), metadata.get("track_stride", 1), confidence
+        )
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        print(f"🎚️ [재요약] {analysis_id}: 신뢰도 {confidence}, 브랜드 {brand_filter or '전체'} ({elapsed_ms:.1f}ms)")
+        
+        return {
+            "status": "success",
+            "data": {
+                "analysis_id": analysis_id,
+                "confidence_threshold": confidence,
+                "brands": brand_filter,
+                "brand_analysis": format_brand_analysis(
+                    brand_analysis, timeline_format, metadata.get("frame_interval")
+                ),
+                "statistics": storage_service.calculate_statistics(brand_analysis),
+                "elapsed_ms": round(elapsed_ms, 1)
+            }
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"재요약 오류: {str(e)}")
+
 @app.delete("/analysis/{analysis_id}")
 async def delete_analysis(analysis_id: str, username: str = None):
     """특정 분석 결과를 삭제합니다."""
     try:
         print(f"🗑️ [삭제 요청] 분석 ID: {analysis_id}, 사용자: {username}")
+        analysis = storage_service.get_analysis_by_id(analysis_id, username)
         success = storage_service.delete_analysis(analysis_id, username)
         if success:
+            # 캐시 적중으로 같은 원시 탐지를 가리키는 다른 분석이 없을 때만 원시 탐지 파일도 지웁니다.
+            # 캐시된 응답도 같은 파일을 가리키므로 먼저 무효화해, 이후 캐시 적중 결과가 없는 파일을 가리키지 않게 합니다
+            raw_detections_id = (analysis or {}).get("analysis_settings", {}).get("raw_detections_id")
+            if raw_detections_id and not storage_service.is_raw_detections_referenced(raw_detections_id):
+                cache_service.invalidate_matching(
+                    lambda response: (response.get("analysis_settings") or {}).get("raw_detections_id") == raw_detections_id
+                )
+                detection_store_service.delete(raw_detections_id)
             return {
                 "status": "success",
                 "message": "분석 결과가 삭제되었습니다."
@@ -631,4 +1072,5 @@ async def delete_notification(notification_id: str, username: str):
         raise HTTPException(status_code=500, detail=f"알림 삭제 실패: {str(e)}")
 
 if __name__ == "__main__":
+    import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000) 
\ No newline at end of file
@@ -0,0 +1,149 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+
+class AnalysisCacheService:
+    """같은 영상을 같은 설정으로 다시 분석하는 요청에 저장된 결과를 돌려주는 캐시입니다.
+
+    키는 영상 식별자(유튜브 영상 ID 또는 업로드 파일의 SHA-256)와 분석 설정, 모델 정보로 만듭니다.
+    항목마다 JSON 파일 하나로 저장하며, 개수/용량/나이 기준으로 오래 안 쓴 항목부터 지웁니다.
+    """
+
+    def __init__(self):
+        self.cache_dir = os.path.join("analysis_results", "cache")
+        # 캐시에 보관할 최대 항목 수
+        self.max_entries = 500
+        # 캐시 파일 전체 용량 한도 (MB)
+        self.max_total_mb = 512
+        # 이 시간(초)보다 오래된 항목은 사용하지 않고 지웁니다 (기본 7일)
+        self.max_age_seconds = 7 * 24 * 3600
+        self._lock = threading.Lock()
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    @staticmethod
+    def hash_content(content: bytes) -> str:
+        """업로드된 영상 내용의 SHA-256 해시를 반환합니다."""
+        return hashlib.sha256(content).hexdigest()
+
+    @staticmethod
+    def make_key(source_id: str, settings: Dict) -> str:
+        """영상 식별자와 분석 설정으로 캐시 키를 만듭니다."""
+        payload = json.dumps({"source": source_id, "settings": settings}, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def get(self, key: str) -> Optional[Dict]:
+        """캐시된 분석 결과를 반환합니다. 없거나 만료되었으면 None을 반환합니다."""
+        path = self._entry_path(key)
+        with self._lock:
+            try:
+                if not os.path.exists(path):
+                    return None
+
+                with open(path, 'r', encoding='utf-8') as f:
+                    entry = json.load(f)
+
+                if time.time() - entry.get("created_at", 0) > self.max_age_seconds:
+                    os.remove(path)
+                    return None
+
+                # 최근 사용 시각을 갱신해 용량 초과 시 나중에 지워지도록 합니다
+                os.utime(path, None)
+                print(f"⚡ 캐시 적중: {key[:12]}")
+                return entry
+            except Exception as e:
+                print(f"캐시 조회 오류: {str(e)}")
+                return None
+
+    def put(self, key: str, response: Dict):
+        """분석 결과를 캐시에 저장하고 한도를 넘으면 오래된 항목을 정리합니다."""
+        entry = {
+            "key": key,
+            "created_at": time.time(),
+            "response": response
+        }
+        with self._lock:
+            try:
+                path = self._entry_path(key)
+                temp_path = f"{path}.tmp"
+                with open(temp_path, 'w', encoding='utf-8') as f:
+                    json.dump(entry, f, ensure_ascii=False)
+                os.replace(temp_path, path)
+                self._evict()
+            except Exception as e:
+                print(f"캐시 저장 오류: {str(e)}")
+
+    def invalidate(self, key: str) -> bool:
+        """특정 캐시 항목을 삭제합니다."""
+        with self._lock:
+            path = self._entry_path(key)
+            if os.path.exists(path):
+                os.remove(path)
+                return True
+            return False
+
+    def invalidate_matching(self, predicate: Callable[[Dict], bool]) -> int:
+        """저장된 응답이 predicate를 만족하는 캐시 항목을 모두 삭제하고 삭제한 개수를 반환합니다."""
+        removed = 0
+        with self._lock:
+            for filename in os.listdir(self.cache_dir):
+                if not filename.endswith(".json"):
+                    continue
+                path = os.path.join(self.cache_dir, filename)
+                try:
+                    with open(path, 'r', encoding='utf-8') as f:
+                        entry = json.load(f)
+                    if predicate(entry.get("response") or {}):
+                        os.remove(path)
+                        removed += 1
+                except Exception as e:
+                    print(f"캐시 무효화 오류: {str(e)}")
+        return removed
+
+    def _evict(self):
+        """만료된 항목을 지우고, 개수/용량 한도를 넘으면 가장 오래 사용하지 않은 항목부터 지웁니다."""
+        now = time.time()
+        entries = []
+        for filename in os.listdir(self.cache_dir):
+            if not filename.endswith(".json"):
+                continue
+            path = os.path.join(self.cache_dir, filename)
+            stat = os.stat(path)
+            if now - stat.st_mtime > self.max_age_seconds:
+                os.remove(path)
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        entries.sort()
+        total_bytes = sum(size for _, size, _ in entries)
+        max_bytes = self.max_total_mb * 1024 * 1024
+        removed = 0
+        while entries and (len(entries) > self.max_entries or total_bytes > max_bytes):
+            _, size, path = entries.pop(0)
+            os.remove(path)
+            total_bytes -= size
+            removed += 1
+
+        if removed:
+            print(f"🧹 캐시 항목 {removed}개 정리")
+
+    def get_stats(self) -> Dict:
+        """캐시 사용 현황을 반환합니다."""
+        with self._lock:
+            sizes = [
+                os.path.getsize(os.path.join(self.cache_dir, filename))
+                for filename in os.listdir(self.cache_dir) if filename.endswith(".json")
+            ]
+        return {
+            "entries": len(sizes),
+            "total_mb": round(sum(sizes) / (1024 * 1024), 2),
+            "max_entries": self.max_entries,
+            "max_total_mb": self.max_total_mb,
+            "max_age_seconds": self.max_age_seconds
+        }
@@ -0,0 +1,172 @@
+import asyncio
+import os
+import time
+import uuid
+from datetime import datetime
+from typing import Awaitable, Callable, Dict, List, Optional
+
+
+class JobQueueFullError(Exception):
+    """대기열이 가득 차 새 작업을 받을 수 없을 때 발생합니다."""
+
+
+class AnalysisJobService:
+    """오래 걸리는 분석을 작업 단위로 받아 제한된 수의 워커가 대기열 순서대로 처리합니다.
+
+    요청은 작업 ID를 바로 돌려받고, 상태와 결과는 get_job으로 조회합니다.
+    부하가 몰리면 작업이 대기열에 쌓이고, 대기열이 가득 차면 새 작업을 거절합니다.
+    """
+
+    def __init__(self):
+        # 동시에 실행할 분석 작업 수
+        self.worker_count = int(os.getenv("ANALYSIS_JOB_WORKERS", "2"))
+        # 실행을 기다릴 수 있는 최대 작업 수
+        self.max_queue_size = int(os.getenv("ANALYSIS_JOB_QUEUE_SIZE", "20"))
+        # 끝난 작업의 상태/결과를 보관할 시간 (초)
+        self.finished_job_ttl = 3600
+        self.jobs: Dict[str, Dict] = {}
+        self._runners: Dict[str, Callable[[str], Awaitable[Dict]]] = {}
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+
+    async def start(self):
+        """워커를 시작합니다. 이벤트 루프가 실행 중일 때 호출해야 합니다."""
+        if self._workers:
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_queue_size)
+        self._workers = [
+            asyncio.create_task(self._worker(index)) for index in range(self.worker_count)
+        ]
+        print(f"🧵 분석 작업 워커 {self.worker_count}개 시작 (대기열 {self.max_queue_size}개)")
+
+    async def stop(self):
+        """워커를 멈춥니다. 실행 중인 작업은 취소됩니다."""
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    def submit(self, job_type: str, runner: Callable[[str], Awaitable[Dict]],
+               username: str = None, params: Dict = None) -> Dict:
+        """작업을 대기열에 넣고 작업 정보를 반환합니다.
+
+        Args:
+            job_type: 작업 종류 (예: "youtube")
+            runner: 작업 ID를 받아 작업을 실행하고 결과 딕셔너리를 반환하는 코루틴 함수
+            username: 작업을 요청한 사용자
+            params: 작업 요청 내용 (조회용)
+        """
+        if self._queue is None:
+            raise Exception("분석 작업 워커가 시작되지 않았습니다.")
+
+        self._prune_finished()
+
+        job_id = str(uuid.uuid4())
+        job = {
+            "id": job_id,
+            "type": job_type,
+            "status": "queued",
+            "username": username,
+            "params": params or {},
+            "created_at": datetime.now().isoformat(),
+            "started_at": None,
+            "finished_at": None,
+            "progress": None,
+            "result": None,
+            "error": None
+        }
+
+        try:
+            self._queue.put_nowait(job_id)
+        except asyncio.QueueFull:
+            raise JobQueueFullError(f"대기 중인 분석 작업이 너무 많습니다 (최대 {self.max_queue_size}개).")
+
+        self.jobs[job_id] = job
+        self._runners[job_id] = runner
+        print(f"📝 분석 작업 등록: {job_id} ({job_type}, 사용자: {username}, 대기 {self._queue.qsize()}개)")
+        return self.get_job(job_id)
+
+    def get_job(self, job_id: str, include_result: bool = True, username: str = None) -> Optional[Dict]:
+        """작업 상태를 반환합니다. 대기 중이면 대기 순번도 함께 반환합니다.
+
+        username을 주면 그 사용자가 요청한 작업일 때만 반환합니다 (다르면 None).
+        """
+        job = self.jobs.get(job_id)
+        if job is None:
+            return None
+        if username and job["username"] != username:
+            print(f"⚠️ 권한 없음: 사용자 '{username}'이 작업 '{job_id}' 조회 시도")
+            return None
+
+        job_view = {key: value for key, value in job.items() if not key.startswith("_")}
+        if job["status"] == "queued":
+            job_view["queue_position"] = self._queue_position(job_id)
+        if not include_result:
+            job_view.pop("result", None)
+        return job_view
+
+    def update_progress(self, job_id: str, progress: Dict):
+        """작업의 최근 진행 상황을 기록합니다. 분석 스레드에서 호출해도 됩니다."""
+        job = self.jobs.get(job_id)
+        if job is not None:
+            job["progress"] = progress
+
+    def get_stats(self) -> Dict:
+        """대기열과 워커 현황을 반환합니다."""
+        statuses: Dict[str, int] = {}
+        for job in self.jobs.values():
+            statuses[job["status"]] = statuses.get(job["status"], 0) + 1
+        return {
+            "worker_count": self.worker_count,
+            "max_queue_size": self.max_queue_size,
+            "queued": self._queue.qsize() if self._queue else 0,
+            "jobs": statuses
+        }
+
+    async def _worker(self, index: int):
+        while True:
+            job_id = await self._queue.get()
+            try:
+                await self._run_job(job_id)
+            finally:
+                self._queue.task_done()
+
+    async def _run_job(self, job_id: str):
+        job = self.jobs.get(job_id)
+        runner = self._runners.pop(job_id, None)
+        if job is None or runner is None:
+            return
+
+        job["status"] = "running"
+        job["started_at"] = datetime.now().isoformat()
+        print(f"▶️ 분석 작업 시작: {job_id}")
+        try:
+            job["result"] = await runner(job_id)
+            job["status"] = "completed"
+            print(f"✅ 분석 작업 완료: {job_id}")
+        except asyncio.CancelledError:
+            job["status"] = "failed"
+            job["error"] = "작업이 취소되었습니다."
+            raise
+        except Exception as e:
+            job["status"] = "failed"
+            job["error"] = str(e)
+            print(f"❌ 분석 작업 실패: {job_id} - {str(e)}")
+        finally:
+            job["finished_at"] = datetime.now().isoformat()
+            job["_finished_monotonic"] = time.monotonic()
+
+    def _queue_position(self, job_id: str) -> Optional[int]:
+        # asyncio.Queue는 내부 deque(_queue)에 대기 항목을 보관합니다
+        pending = list(getattr(self._queue, "_queue", []))
+        return pending.index(job_id) + 1 if job_id in pending else None
+
+    def _prune_finished(self):
+        """보관 기간이 지난 완료/실패 작업을 지웁니다."""
+        now = time.monotonic()
+        expired = [
+            job_id for job_id, job in self.jobs.items()
+            if "_finished_monotonic" in job and now - job["_finished_monotonic"] > self.finished_job_ttl
+        ]
+        for job_id in expired:
+            del self.jobs[job_id]
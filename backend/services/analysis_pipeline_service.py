@@ -0,0 +1,520 @@
+from __future__ import annotations
+
+import asyncio
+import bisect
+import queue
+import threading
+import time
+from typing import TYPE_CHECKING, Callable, List, Dict, Optional, Tuple
+
+from .video_processing_service import VideoProcessingService, FrameLetterboxer
+from .logo_detection_service import LogoDetectionService
+from .tracking_service import TrackingService
+
+if TYPE_CHECKING:
+    import numpy as np
+
+# 디코더가 프레임을 모두 보냈음을 추론 워커에게 알리는 내부 표식
+_END_OF_FRAMES = object()
+
+
+class StageStats:
+    """파이프라인 단계별 작업/대기 시간을 기록합니다."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.frames = 0
+        self.busy_seconds = 0.0      # 실제 작업(디코딩/추론)에 쓴 시간
+        self.starved_seconds = 0.0   # 입력을 기다린 시간
+        self.blocked_seconds = 0.0   # 출력 버퍼가 가득 차 기다린 시간
+        self._lock = threading.Lock()
+
+    def add(self, frames: int = 0, busy: float = 0.0, starved: float = 0.0, blocked: float = 0.0):
+        with self._lock:
+            self.frames += frames
+            self.busy_seconds += busy
+            self.starved_seconds += starved
+            self.blocked_seconds += blocked
+
+    def to_dict(self, wall_seconds: float, workers: int = 1) -> Dict:
+        capacity = wall_seconds * workers
+        return {
+            "workers": workers,
+            "frames": self.frames,
+            "busy_seconds": round(self.busy_seconds, 3),
+            "starved_seconds": round(self.starved_seconds, 3),
+            "blocked_seconds": round(self.blocked_seconds, 3),
+            "utilization": round(self.busy_seconds / capacity, 3) if capacity > 0 else 0
+        }
+
+
+class AnalysisPipelineService:
+    """디코딩과 로고 탐지를 동시에 수행하는 파이프라인입니다.
+
+    디코더 스레드가 크기가 제한된 큐에 프레임을 넣고, 추론 워커들이 동시에 큐를 비웁니다.
+    전체 소요 시간은 디코딩과 추론 시간의 합이 아니라 둘 중 긴 쪽에 가까워집니다.
+    """
+
+    def __init__(self, video_processing_service: VideoProcessingService,
+                 logo_detection_service: LogoDetectionService,
+                 tracking_service: TrackingService = None):
+        self.video_processing_service = video_processing_service
+        self.logo_detection_service = logo_detection_service
+        self.tracking_service = tracking_service or TrackingService()
+        # 디코더와 추론 워커 사이 큐의 최대 프레임 수
+        self.queue_size = 32
+        # 추론 워커 수 (분석 하나가 빌린 탐지기 인스턴스를 워커끼리 공유합니다)
+        self.inference_workers = 1
+        # 적응형 샘플링: 성긴 탐색 간격은 frame_interval의 이 배수 (최소 min_coarse_interval초)
+        self.coarse_interval_multiplier = 4
+        self.min_coarse_interval = 2.0
+        # 적응형 샘플링: 인접한 성긴 프레임의 차이가 이 값 이상이면 장면 전환으로 봅니다
+        self.scene_change_threshold = 0.12
+        # 진행 상황 콜백을 호출하는 최소 간격 (초)
+        self.progress_interval = 1.0
+        # 디코딩 직후 프레임을 모델 입력 크기로 레터박스해 큐에 넣을지 여부
+        self.letterbox_at_decode = True
+
+    async def run(self, video_path: str, frame_interval: float = 0.5,
+                  skip_duplicates: bool = False, duplicate_threshold: float = None,
+                  sampling_mode: str = "uniform", coarse_interval: float = None,
+                  progress_callback: Optional[Callable[[Dict], None]] = None,
+                  tiling_mode: str = "off", max_tiles_per_frame: int = None,
+                  track_stride: int = 1, raw_results: List[Dict] = None) -> Tuple[List[Dict], Dict]:
+        """영상을 분석하여 (프레임별 탐지 결과, 단계별 통계)를 반환합니다.
+
+        Args:
+            video_path: 영상 파일 경로
+            frame_interval: 프레임 추출 간격 (초)
+            skip_duplicates: 직전에 분석한 프레임과 거의 같은 프레임은 추론하지 않고 결과를 재사용
+            duplicate_threshold: 유사 프레임 판정 기준 (기본값: video_processing_service.duplicate_threshold)
+            sampling_mode: "uniform"(전체를 frame_interval로 추출) 또는
+                "adaptive"(성긴 탐색 후 탐지/장면 전환 주변만 frame_interval로 촘촘히 추출)
+            coarse_interval: adaptive 모드의 성긴 탐색 간격 (초)
+            progress_callback: 진행 상황(단계, 처리/전체 프레임 수, 초당 프레임, 남은 시간, 브랜드별 중간 집계)을
+                받을 함수. 추론 스레드에서 progress_interval초에 한 번만 호출되므로 빨리 반환해야 합니다.
+            tiling_mode: "off", "all"(모든 프레임을 타일로도 탐지), "promising"(전체 프레임 탐지에 후보가 있는 프레임만)
+            max_tiles_per_frame: 프레임당 최대 타일 수 (기본값: logo_detection_service.max_tiles_per_frame)
+            track_stride: k > 1이면 k번째 샘플 프레임만 추론하고, 사이 프레임은 트랙 위치를 보간해 채웁니다.
+                탐지에는 항상 track_id가 붙어 요약 단계에서 노출 구간을 계산할 수 있습니다.
+            raw_results: 리스트를 주면 logo_detection_service.raw_confidence_floor로 추론하고, 그 원시 결과
+                (보간 프레임 제외)를 이 리스트에 담습니다. 반환값은 confidence_threshold로 거른 결과입니다.
+        """
+        try:
+            if sampling_mode not in ("uniform", "adaptive"):
+                raise Exception(f"지원하지 않는 샘플링 모드입니다: {sampling_mode}")
+            tiling = self.logo_detection_service.get_tiling_options(tiling_mode, max_tiles_per_frame)
+            if track_stride < 1:
+                raise Exception(f"추론 간격은 1 이상이어야 합니다: {track_stride}")
+            # 트래킹 보간을 사용하면 k배 간격으로만 추론합니다
+            inference_interval = frame_interval * track_stride
+            confidence = self.logo_detection_service.raw_confidence_floor if raw_results is not None else None
+            if tiling:
+                print(f"🧩 타일 추론: {tiling['mode']} 모드, 프레임당 최대 {tiling['max_tiles']}개 "
+                      f"({tiling['tile_size']}px, 겹침 {tiling['overlap']:.0%})")
+
+            loop = asyncio.get_event_loop()
+            # 분석이 끝날 때까지 탐지기 인스턴스 하나를 빌립니다 (모두 사용 중이면 여기서 대기)
+            checkout_started = time.perf_counter()
+            async with self.logo_detection_service.checkout() as detector:
+                checkout_wait = time.perf_counter() - checkout_started
+                if sampling_mode == "adaptive":
+                    results, stats = await loop.run_in_executor(
+                        None, self._run_adaptive_sync, video_path, inference_interval,
+                        skip_duplicates, duplicate_threshold, coarse_interval, progress_callback, detector, tiling,
+                        confidence
+                    )
+                else:
+                    results, stats = await loop.run_in_executor(
+                        None, lambda: self._run_sync(
+                            video_path, inference_interval, skip_duplicates, duplicate_threshold,
+                            progress_callback=progress_callback, detector=detector, tiling=tiling,
+                            confidence=confidence
+                        )
+                    )
+            stats["detector"] = {
+                "index": detector.index,
+                "model_version": detector.version,
+                "checkout_wait_seconds": round(checkout_wait, 3)
+            }
+            # 탐지를 노출 트랙으로 잇고, 건너뛴 프레임은 트랙 위치를 보간해 채웁니다
+            results, stats["tracking"] = await loop.run_in_executor(
+                None, self.tracking_service.track, results, frame_interval, track_stride
+            )
+            if raw_results is not None:
+                raw_results.extend(result for result in results if not result.get("propagated"))
+                results = self.logo_detection_service.filter_detections(
+                    results, self.logo_detection_service.confidence_threshold
+                )
+                stats["confidence_floor"] = confidence
+            return results, stats
+        except Exception as e:
+            raise Exception(f"분석 파이프라인 실패: {str(e)}")
+
+    def _run_adaptive_sync(self, video_path: str, frame_interval: float, skip_duplicates: bool = False,
+                           duplicate_threshold: float = None,
+                           coarse_interval: float = None,
+                           progress_callback: Optional[Callable[[Dict], None]] = None,
+                           detector=None, tiling: Dict = None,
+                           confidence: float = None) -> Tuple[List[Dict], Dict]:
+        """성긴 탐색 후 탐지 또는 장면 전환이 있던 구간만 촘촘히 다시 분석합니다."""
+        if coarse_interval is None:
+            coarse_interval = max(frame_interval * self.coarse_interval_multiplier, self.min_coarse_interval)
+        coarse_interval = max(coarse_interval, frame_interval)
+
+        print(f"🔭 1단계: {coarse_interval}초 간격으로 성긴 탐색")
+        signatures = []
+        coarse_results, coarse_stats = self._run_sync(
+            video_path, coarse_interval, skip_duplicates, duplicate_threshold, signatures=signatures,
+            progress_callback=progress_callback, stage="coarse_scan", detector=detector, tiling=tiling,
+            confidence=confidence
+        )
+
+        windows = self._find_refine_windows(coarse_results, signatures, coarse_interval)
+        refined_seconds = sum(end - start for start, end in windows)
+        print(f"🔬 2단계: {len(windows)}개 구간 ({refined_seconds:.1f}초)을 {frame_interval}초 간격으로 정밀 분석")
+
+        results = list(coarse_results)
+        fine_stats = None
+        if windows:
+            fine_results, fine_stats = self._run_sync(
+                video_path, frame_interval, skip_duplicates, duplicate_threshold, time_ranges=windows,
+                progress_callback=progress_callback, stage="refine", detector=detector, tiling=tiling,
+                confidence=confidence
+            )
+            # 성긴 탐색에서 이미 분석한 시각은 다시 넣지 않습니다
+            coarse_timestamps = [result["timestamp"] for result in coarse_results]
+            results.extend(
+                result for result in fine_results
+                if not self._is_near(coarse_timestamps, result["timestamp"], frame_interval / 2)
+            )
+            results.sort(key=lambda r: r["timestamp"])
+
+        duration = self.video_processing_service._get_video_info_sync(video_path).get("duration", 0)
+        dense_equivalent = int(duration / frame_interval) + 1 if duration else len(results)
+        passes = [coarse_stats] + ([fine_stats] if fine_stats else [])
+        frames_inferred = sum(stats["frames_inferred"] for stats in passes)
+
+        stats = {
+            "sampling_mode": "adaptive",
+            "coarse_interval": coarse_interval,
+            "refine_windows": [[round(start, 3), round(end, 3)] for start, end in windows],
+            "wall_seconds": round(sum(stats["wall_seconds"] for stats in passes), 3),
+            "frames_sampled": len(results),
+            "frames_inferred": frames_inferred,
+            "frames_skipped": sum(stats["frames_skipped"] for stats in passes),
+            "tiles_inferred": sum(stats["tiles_inferred"] for stats in passes),
+            "dense_equivalent_frames": dense_equivalent,
+            "inference_ratio": round(frames_inferred / dense_equivalent, 3) if dense_equivalent else 0,
+            "passes": {
+                "coarse": coarse_stats,
+                "fine": fine_stats or {}
+            }
+        }
+        print(f"📉 추론 프레임 {frames_inferred}개 (균일 샘플링 시 {dense_equivalent}개)")
+        return results, stats
+
+    @staticmethod
+    def _is_near(sorted_timestamps: List[float], timestamp: float, tolerance: float) -> bool:
+        """정렬된 시각 목록에 tolerance 이내의 시각이 있는지 확인합니다."""
+        index = bisect.bisect_left(sorted_timestamps, timestamp)
+        neighbors = sorted_timestamps[max(0, index - 1):index + 1]
+        return any(abs(timestamp - t) < tolerance for t in neighbors)
+
+    def _find_refine_windows(self, coarse_results: List[Dict], signatures: List[Tuple[float, np.ndarray]],
+                             coarse_interval: float) -> List[Tuple[float, float]]:
+        """성긴 탐색 결과에서 촘촘히 다시 볼 구간을 찾아 겹치는 구간끼리 합칩니다.
+
+        탐지가 있는 프레임은 앞뒤 성긴 간격만큼, 장면 전환은 두 프레임 사이 구간을 다시 봅니다.
+        """
+        windows = []
+        # 원시 탐지 저장을 위해 낮은 기준으로 추론했더라도 실제 기준을 넘은 탐지 주변만 다시 봅니다
+        threshold = self.logo_detection_service.confidence_threshold
+        for result in coarse_results:
+            if any(d["confidence"] >= threshold for d in result["detections"]):
+                t = result["timestamp"]
+                windows.append((max(0.0, t - coarse_interval), t + coarse_interval))
+
+        signatures = sorted(signatures, key=lambda item: item[0])
+        for (prev_t, prev_sig), (t, sig) in zip(signatures, signatures[1:]):
+            if self.video_processing_service.signature_difference(prev_sig, sig) >= self.scene_change_threshold:
+                windows.append((prev_t, t))
+
+        merged = []
+        for start, end in sorted(windows):
+            if merged and start <= merged[-1][1]:
+                merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+            else:
+                merged.append((start, end))
+        return merged
+
+    def _run_sync(self, video_path: str, frame_interval: float,
+                  skip_duplicates: bool = False, duplicate_threshold: float = None,
+                  time_ranges: List[Tuple[float, float]] = None,
+                  signatures: List = None,
+                  progress_callback: Optional[Callable[[Dict], None]] = None,
+                  stage: str = "inference", detector=None, tiling: Dict = None,
+                  confidence: float = None) -> Tuple[List[Dict], Dict]:
+        """동기적으로 파이프라인을 실행합니다.
+
+        time_ranges를 주면 해당 구간만 추출하고, signatures 리스트를 주면
+        추출한 모든 프레임의 (timestamp, 서명)을 그 리스트에 기록합니다.
+        stage는 진행 상황 이벤트에 표시할 단계 이름이고, detector는 풀에서 빌린 탐지기 인스턴스입니다.
+        letterbox_at_decode가 켜져 있으면 디코딩한 곳(병렬 디코딩이면 작업 프로세스)에서 프레임을
+        모델 입력 크기로 줄여 큐에 넣고, 탐지 결과의 박스는 원본 프레임 좌표로 되돌립니다. 타일 추론(tiling)은 원본 해상도가
+        필요하므로 이때는 레터박스하지 않습니다. confidence를 주면 그 기준으로 추론합니다 (원시 탐지 저장용).
+        """
+        frame_queue = queue.Queue(maxsize=self.queue_size)
+        stop_event = threading.Event()
+        errors = []
+        results = []
+        # 추론을 건너뛴 프레임의 (timestamp, 결과를 빌려올 프레임의 timestamp)
+        duplicates = []
+        if duplicate_threshold is None:
+            duplicate_threshold = self.video_processing_service.duplicate_threshold
+        results_lock = threading.Lock()
+        progress = {"next_report": 100, "last_emit": 0.0}
+        # 진행 상황 이벤트에 넣을 브랜드별 등장 프레임 수 (중간 집계)
+        brand_counts: Dict[str, int] = {}
+        expected_frames = self._expected_frame_count(video_path, frame_interval, time_ranges) \
+            if progress_callback else 0
+        workers = max(1, self.inference_workers)
+        batch_size = max(1, self.logo_detection_service.batch_size)
+        detect_batch = detector.detect_batch if detector else self.logo_detection_service._detect_batch_sync
+        detect_options = {"tiling": tiling} if tiling else {}
+        if confidence is not None:
+            detect_options["confidence"] = confidence
+        threshold = self.logo_detection_service.confidence_threshold
+        letterboxer = None
+        if self.letterbox_at_decode and not tiling:
+            image_size = getattr(detector, "image_size", None) or self.logo_detection_service.image_size
+            # 큐와 추론 중인 배치에 동시에 있을 수 있는 최대 프레임 수만큼 버퍼를 재사용합니다
+            letterboxer = FrameLetterboxer(image_size, self.queue_size + workers * batch_size + 1)
+
+        decode_stats = StageStats("decode")
+        inference_stats = StageStats("inference")
+
+        def put(item) -> bool:
+            # 다른 단계가 실패하면 더 이상 기다리지 않고 빠져나옵니다
+            while not stop_event.is_set():
+                try:
+                    frame_queue.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def decode():
+            frames = None
+            reference = None  # 마지막으로 추론에 보낸 프레임의 (timestamp, 서명)
+            try:
+                frames = self.video_processing_service.iter_frames(
+                    video_path, frame_interval, time_ranges=time_ranges, letterboxer=letterboxer
+                )
+                while not stop_event.is_set():
+                    started = time.perf_counter()
+                    item = next(frames, None)
+                    if item is None:
+                        decode_stats.add(busy=time.perf_counter() - started)
+                        break
+
+                    if skip_duplicates or signatures is not None:
+                        timestamp, frame = item[0], item[1]
+                        # 레터박스한 프레임은 여백을 뺀 부분으로 서명을 계산해 원본 프레임과 같은 기준으로 비교합니다
+                        if letterboxer is not None and item[2] is not None:
+                            frame = item[2].content(frame)
+                        signature = self.video_processing_service.compute_frame_signature(frame)
+                        if signatures is not None:
+                            signatures.append((timestamp, signature))
+                        if skip_duplicates and reference is not None and self.video_processing_service.signature_difference(
+                                signature, reference[1]) < duplicate_threshold:
+                            duplicates.append((timestamp, reference[0]))
+                            if letterboxer is not None:
+                                letterboxer.release(item[1])
+                            decode_stats.add(busy=time.perf_counter() - started)
+                            continue
+                        if skip_duplicates:
+                            reference = (timestamp, signature)
+                    decoded = time.perf_counter()
+
+                    put(item)
+                    decode_stats.add(frames=1, busy=decoded - started, blocked=time.perf_counter() - decoded)
+            except Exception as e:
+                errors.append(e)
+                stop_event.set()
+            finally:
+                if frames is not None:
+                    frames.close()
+                for _ in range(workers):
+                    put(_END_OF_FRAMES)
+
+        def infer():
+            finished = False
+            try:
+                while not finished and not stop_event.is_set():
+                    batch = []
+                    waited = 0.0
+                    while len(batch) < batch_size:
+                        started = time.perf_counter()
+                        try:
+                            item = frame_queue.get(timeout=0.1)
+                        except queue.Empty:
+                            waited += time.perf_counter() - started
+                            if stop_event.is_set():
+                                return
+                            continue
+                        waited += time.perf_counter() - started
+                        if item is _END_OF_FRAMES:
+                            finished = True
+                            break
+                        batch.append(item)
+
+                    if not batch:
+                        inference_stats.add(starved=waited)
+                        continue
+
+                    started = time.perf_counter()
+                    batch_results = detect_batch(batch, **detect_options)
+                    inference_stats.add(frames=len(batch), busy=time.perf_counter() - started, starved=waited)
+                    if letterboxer is not None:
+                        for item in batch:
+                            letterboxer.release(item[1])
+
+                    event = None
+                    with results_lock:
+                        results.extend(batch_results)
+                        processed = len(results)
+                        report = processed >= progress["next_report"]
+                        if report:
+                            progress["next_report"] += 100
+                        if progress_callback:
+                            for result in batch_results:
+                                for brand in {d["brand"] for d in result["detections"] if d["confidence"] >= threshold}:
+                                    brand_counts[brand] = brand_counts.get(brand, 0) + 1
+                            now = time.perf_counter()
+                            if now - progress["last_emit"] >= self.progress_interval:
+                                progress["last_emit"] = now
+                                event = self._progress_event(
+                                    stage, processed + len(duplicates), expected_frames,
+                                    now - wall_start, brand_counts
+                                )
+                    if report:
+                        print(f"⏳ 진행 중... {processed}개 프레임 처리")
+                    if event:
+                        self._emit_progress(progress_callback, event)
+            except Exception as e:
+                errors.append(e)
+                stop_event.set()
+
+        print(f"🚀 분석 파이프라인 시작 (큐: {self.queue_size}, 추론 워커: {workers}, 배치: {batch_size})")
+        wall_start = time.perf_counter()
+
+        threads = [threading.Thread(target=decode, name="pipeline-decoder", daemon=True)]
+        threads += [
+            threading.Thread(target=infer, name=f"pipeline-inference-{i}", daemon=True)
+            for i in range(workers)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        wall_seconds = time.perf_counter() - wall_start
+
+        if errors:
+            raise errors[0]
+
+        if duplicates:
+            results.extend(self._reuse_detections(results, duplicates))
+        results.sort(key=lambda r: r["timestamp"])
+
+        if progress_callback:
+            # 마지막 이벤트는 실제 처리한 프레임 수를 전체 수로 보고합니다
+            self._emit_progress(progress_callback, self._progress_event(
+                stage, len(results), len(results), wall_seconds, brand_counts
+            ))
+
+        stats = {
+            "sampling_mode": "uniform" if time_ranges is None else "ranges",
+            "wall_seconds": round(wall_seconds, 3),
+            "frames_per_second": round(len(results) / wall_seconds, 2) if wall_seconds > 0 else 0,
+            "queue_size": self.queue_size,
+            "letterbox_size": letterboxer.image_size if letterboxer else None,
+            "frames_sampled": decode_stats.frames + len(duplicates),
+            "frames_inferred": inference_stats.frames,
+            "frames_skipped": len(duplicates),
+            "tiling": {key: tiling[key] for key in ("mode", "max_tiles", "tile_size")} if tiling else None,
+            "tiles_inferred": sum(result.get("tiles", 0) for result in results),
+            "stages": {
+                "decode": decode_stats.to_dict(wall_seconds),
+                "inference": inference_stats.to_dict(wall_seconds, workers)
+            }
+        }
+
+        total_detections = sum(len(result['detections']) for result in results)
+        print(f"✅ 로고 탐지 완료: {len(results)}개 프레임, 총 {total_detections}개 탐지 ({wall_seconds:.2f}초)")
+        if skip_duplicates:
+            print(f"♻️ 유사 프레임 {len(duplicates)}개는 추론을 건너뛰고 결과를 재사용했습니다")
+        print(f"📊 디코딩 사용률 {stats['stages']['decode']['utilization']:.0%} "
+              f"(대기 {decode_stats.blocked_seconds:.2f}초), "
+              f"추론 사용률 {stats['stages']['inference']['utilization']:.0%} "
+              f"(입력 대기 {inference_stats.starved_seconds:.2f}초)")
+        return results, stats
+
+    def resummarize_sync(self, raw_results: List[Dict], frame_interval: float, track_stride: int = 1,
+                         confidence_threshold: float = None) -> Dict:
+        """저장된 원시 탐지로 run과 같은 순서(트래킹 → 기준 신뢰도로 거르기 → 요약)를 다시 적용해 brand_analysis를 만듭니다.
+
+        같은 기준으로 다시 요약하면 분석 당시와 같은 결과가 나오고, 기준을 바꿔도 추론은 다시 하지 않습니다.
+        """
+        if confidence_threshold is None:
+            confidence_threshold = self.logo_detection_service.confidence_threshold
+        results, _ = self.tracking_service.track(raw_results, frame_interval, track_stride)
+        results = self.logo_detection_service.filter_detections(results, confidence_threshold)
+        return self.logo_detection_service._summarize_timeline_sync(results, frame_interval)
+
+    def _expected_frame_count(self, video_path: str, frame_interval: float,
+                              time_ranges: List[Tuple[float, float]] = None) -> int:
+        """샘플링할 프레임 수를 추정합니다 (진행률과 남은 시간 계산용)."""
+        if time_ranges is None:
+            duration = self.video_processing_service._get_video_info_sync(video_path).get("duration", 0)
+            time_ranges = [(0.0, duration)] if duration else []
+        return sum(int((end - start) / frame_interval) + 1 for start, end in time_ranges)
+
+    @staticmethod
+    def _progress_event(stage: str, frames_done: int, frames_total: int,
+                        elapsed: float, brand_counts: Dict[str, int]) -> Dict:
+        frames_total = max(frames_total, frames_done)
+        fps = frames_done / elapsed if elapsed > 0 else 0
+        return {
+            "stage": stage,
+            "frames_done": frames_done,
+            "frames_total": frames_total,
+            "frames_per_second": round(fps, 2),
+            "eta_seconds": round((frames_total - frames_done) / fps, 1) if fps > 0 else None,
+            "brand_counts": dict(brand_counts)
+        }
+
+    @staticmethod
+    def _emit_progress(progress_callback: Callable[[Dict], None], event: Dict):
+        # 진행 상황 전달이 실패해도 분석은 계속합니다
+        try:
+            progress_callback(event)
+        except Exception as e:
+            print(f"⚠️ 진행 상황 전달 실패: {str(e)}")
+
+    def _reuse_detections(self, results: List[Dict], duplicates: List[Tuple[float, float]]) -> List[Dict]:
+        """건너뛴 프레임마다 기준 프레임의 탐지 결과를 자신의 timestamp로 복사합니다."""
+        by_timestamp = {result["timestamp"]: result for result in results}
+        reused = []
+        for timestamp, reference_timestamp in duplicates:
+            reference = by_timestamp.get(reference_timestamp)
+            # 기준 프레임의 탐지가 실패했다면 건너뛴 프레임도 결과에서 제외합니다
+            if reference is None:
+                continue
+            reused.append({
+                "timestamp": timestamp,
+                "detections": [dict(detection) for detection in reference["detections"]],
+                "reused_from": reference_timestamp
+            })
+        return reused
@@ -1,53 +1,194 @@
 import json
 import os
+import sqlite3
+import threading
 from datetime import datetime
 from typing import Dict, List, Optional
 import uuid
 
+from .timeline_encoding import compact_brand_analysis
+
+# 집계 범위: 전체 분석은 "*", 사용자별 분석은 "user:<사용자 id>"
+GLOBAL_SCOPE = "*"
+
 class AnalysisStorageService:
+    """분석 결과를 내장 SQLite 데이터베이스(WAL 모드)에 저장합니다.
+    
+    분석 하나가 행 하나이며, 전체 결과는 record 열에 JSON으로 보관합니다.
+    조회/삭제에 쓰는 id, username, timestamp, raw_detections_id는 별도 열과 인덱스로 두어
+    히스토리 크기와 관계없이 필요한 행만 읽고 씁니다.
+    
+    통계 요약에 쓰는 집계(분석 수, 분석 시간 합계, 브랜드별 등장 횟수/노출 시간)는
+    저장/삭제와 같은 트랜잭션에서 analysis_totals, brand_totals 테이블에 더하고 빼서 유지합니다.
+    """
+    
     def __init__(self):
         self.storage_dir = "analysis_results"
-        self.storage_file = os.path.join(self.storage_dir, "analysis_history.json")
+        self.database_file = os.path.join(self.storage_dir, "analysis_history.db")
+        # 이전 버전이 사용하던 JSON 저장 파일 (처음 실행할 때 한 번 DB로 가져옵니다)
+        self.legacy_file = os.path.join(self.storage_dir, "analysis_history.json")
+        # 쓰기 잠금을 기다리는 최대 시간 (초)
+        self.busy_timeout = 30.0
+        # sqlite3 연결은 스레드마다 따로 만듭니다
+        self._local = threading.local()
         self._ensure_storage_exists()
     
+    def _connect(self) -> sqlite3.Connection:
+        """현재 스레드의 DB 연결을 반환합니다."""
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.database_file, timeout=self.busy_timeout)
+            connection.row_factory = sqlite3.Row
+            # WAL 모드에서는 쓰는 동안에도 다른 연결이 읽을 수 있습니다
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+    
     def _ensure_storage_exists(self):
-        """저장 디렉토리와 파일이 존재하는지 확인하고 생성합니다."""
+        """저장 디렉토리와 테이블/인덱스를 만들고, 이전 JSON 히스토리가 있으면 가져옵니다."""
         os.makedirs(self.storage_dir, exist_ok=True)
         
-        if not os.path.exists(self.storage_file):
-            initial_data = {
-                "analyses": [],
-                "metadata": {
-                    "total_analyses": 0,
-                    "created_at": datetime.now().isoformat(),
-                    "last_updated": datetime.now().isoformat()
-                }
-            }
-            self._save_data(initial_data)
+        connection = self._connect()
+        with connection:
+            connection.executescript("""
+                CREATE TABLE IF NOT EXISTS analyses (
+                    id TEXT PRIMARY KEY,
+                    username TEXT,
+                    type TEXT,
+                    timestamp TEXT NOT NULL,
+                    raw_detections_id TEXT,
+                    record TEXT NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_analyses_username_timestamp ON analyses (username, timestamp);
+                CREATE INDEX IF NOT EXISTS idx_analyses_timestamp ON analyses (timestamp);
+                CREATE INDEX IF NOT EXISTS idx_analyses_raw_detections_id ON analyses (raw_detections_id);
+                CREATE TABLE IF NOT EXISTS metadata (
+                    key TEXT PRIMARY KEY,
+                    value TEXT
+                );
+                CREATE TABLE IF NOT EXISTS analysis_totals (
+                    scope TEXT PRIMARY KEY,
+                    analyses INTEGER NOT NULL,
+                    analysis_time REAL NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS brand_totals (
+                    scope TEXT NOT NULL,
+                    brand TEXT NOT NULL,
+                    analyses INTEGER NOT NULL,
+                    appearances INTEGER NOT NULL,
+                    total_seconds REAL NOT NULL,
+                    PRIMARY KEY (scope, brand)
+                );
+                -- 상위 브랜드 조회(ORDER BY appearances DESC, brand)를 정렬 없이 인덱스 순서대로 읽습니다.
+                -- appearances만 있는 이전 인덱스는 같은 순위의 브랜드를 따로 정렬해야 하므로 지웁니다
+                DROP INDEX IF EXISTS idx_brand_totals_scope_appearances;
+                CREATE INDEX IF NOT EXISTS idx_brand_totals_scope_ranking ON brand_totals (scope, appearances DESC, brand);
+            """)
+            now = datetime.now().isoformat()
+            connection.execute("INSERT OR IGNORE INTO metadata (key, value) VALUES ('created_at', ?)", (now,))
+            connection.execute("INSERT OR IGNORE INTO metadata (key, value) VALUES ('last_updated', ?)", (now,))
+        
+        self._migrate_legacy_json()
+        
+        # 집계 테이블이 생기기 전에 저장된 분석이 있으면 한 번 다시 계산합니다
+        connection = self._connect()
+        if connection.execute("SELECT value FROM metadata WHERE key = 'aggregates_built_at'").fetchone() is None:
+            self.rebuild_statistics()
     
-    def _load_data(self) -> Dict:
-        """저장된 데이터를 로드합니다."""
+    def _migrate_legacy_json(self):
+        """이전 analysis_history.json의 분석 결과를 DB로 옮깁니다. 한 번 옮긴 뒤에는 다시 읽지 않습니다."""
+        connection = self._connect()
+        migrated = connection.execute("SELECT value FROM metadata WHERE key = 'legacy_json_migrated_at'").fetchone()
+        if migrated or not os.path.exists(self.legacy_file):
+            return
+        
         try:
-            with open(self.storage_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            with open(self.legacy_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
         except Exception as e:
-            print(f"데이터 로드 오류: {str(e)}")
-            return {
-                "analyses": [],
-                "metadata": {
-                    "total_analyses": 0,
-                    "created_at": datetime.now().isoformat(),
-                    "last_updated": datetime.now().isoformat()
-                }
-            }
+            print(f"⚠️ 이전 히스토리 파일을 읽을 수 없어 가져오지 않습니다: {str(e)}")
+            return
+        
+        analyses = data.get("analyses", [])
+        with connection:
+            for analysis in analyses:
+                if self._insert(connection, analysis):
+                    self._apply_to_aggregates(connection, analysis, 1)
+            created_at = data.get("metadata", {}).get("created_at")
+            if created_at:
+                connection.execute("UPDATE metadata SET value = ? WHERE key = 'created_at'", (created_at,))
+            connection.execute(
+                "INSERT OR REPLACE INTO metadata (key, value) VALUES ('legacy_json_migrated_at', ?)",
+                (datetime.now().isoformat(),)
+            )
+        print(f"📦 이전 JSON 히스토리 {len(analyses)}개를 DB로 옮겼습니다: {self.database_file}")
     
-    def _save_data(self, data: Dict):
-        """데이터를 파일에 저장합니다."""
-        try:
-            with open(self.storage_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
-        except Exception as e:
-            print(f"데이터 저장 오류: {str(e)}")
+    @staticmethod
+    def _insert(connection: sqlite3.Connection, analysis_record: Dict) -> bool:
+        """분석 행을 추가합니다. 같은 id가 이미 있으면 추가하지 않고 False를 반환합니다."""
+        cursor = connection.execute(
+            "INSERT OR IGNORE INTO analyses (id, username, type, timestamp, raw_detections_id, record) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (
+                analysis_record["id"],
+                analysis_record.get("username"),
+                analysis_record.get("type"),
+                analysis_record.get("timestamp") or datetime.now().isoformat(),
+                (analysis_record.get("analysis_settings") or {}).get("raw_detections_id"),
+                json.dumps(analysis_record, ensure_ascii=False)
+            )
+        )
+        return cursor.rowcount == 1
+    
+    @staticmethod
+    def _scopes(username: Optional[str]) -> List[str]:
+        """분석 하나가 반영되는 집계 범위 목록 (전체 + 사용자)."""
+        return [GLOBAL_SCOPE, f"user:{username}"] if username else [GLOBAL_SCOPE]
+    
+    def _apply_to_aggregates(self, connection: sqlite3.Connection, analysis_record: Dict, sign: int):
+        """분석 하나를 집계에 더하거나(sign=1) 뺍니다(sign=-1). 분석 수가 0이 된 행은 지웁니다."""
+        analysis_time = analysis_record.get("total_analysis_time", 0) or 0
+        brand_analysis = analysis_record.get("brand_analysis") or {}
+        for scope in self._scopes(analysis_record.get("username")):
+            connection.execute(
+                "INSERT INTO analysis_totals (scope, analyses, analysis_time) VALUES (?, ?, ?) "
+                "ON CONFLICT (scope) DO UPDATE SET analyses = analyses + excluded.analyses, "
+                "analysis_time = analysis_time + excluded.analysis_time",
+                (scope, sign, sign * analysis_time)
+            )
+            connection.executemany(
+                "INSERT INTO brand_totals (scope, brand, analyses, appearances, total_seconds) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT (scope, brand) DO UPDATE SET analyses = analyses + excluded.analyses, "
+                "appearances = appearances + excluded.appearances, "
+                "total_seconds = total_seconds + excluded.total_seconds",
+                [
+                    (scope, brand, sign, sign * brand_data.get("appearances", 0),
+                     sign * (brand_data.get("total_seconds", 0) or 0))
+                    for brand, brand_data in brand_analysis.items()
+                ]
+            )
+        if sign < 0:
+            connection.execute("DELETE FROM analysis_totals WHERE analyses <= 0")
+            connection.execute("DELETE FROM brand_totals WHERE analyses <= 0")
+    
+    @staticmethod
+    def _touch(connection: sqlite3.Connection):
+        connection.execute(
+            "UPDATE metadata SET value = ? WHERE key = 'last_updated'", (datetime.now().isoformat(),)
+        )
+    
+    def _get_metadata(self) -> Dict:
+        connection = self._connect()
+        metadata = {row["key"]: row["value"] for row in connection.execute("SELECT key, value FROM metadata")}
+        totals = connection.execute(
+            "SELECT analyses FROM analysis_totals WHERE scope = ?", (GLOBAL_SCOPE,)
+        ).fetchone()
+        return {
+            "total_analyses": totals["analyses"] if totals else 0,
+            "created_at": metadata.get("created_at"),
+            "last_updated": metadata.get("last_updated")
+        }
     
     def save_analysis(self, analysis_data: Dict, analysis_type: str = "youtube", username: str = None) -> str:
         """분석 결과를 저장합니다.
@@ -58,38 +199,32 @@ class AnalysisStorageService:
             username: 사용자 id (이메일) - username 필드에 저장됨
         """
         try:
-            data = self._load_data()
-            
             # 고유 ID 생성
             analysis_id = str(uuid.uuid4())
             
-            # 분석 결과 데이터 구성
+            # 분석 결과 데이터 구성 (타임라인은 연속 구간으로 묶은 compact 형식으로 저장)
+            brand_analysis = analysis_data.get("brand_analysis", {})
+            analysis_settings = analysis_data.get("analysis_settings", {})
             analysis_record = {
                 "id": analysis_id,
                 "username": username,  # 사용자 id (이메일) 저장 - users.json의 id와 일치해야 함
                 "type": analysis_type,
                 "timestamp": datetime.now().isoformat(),
                 "video_info": analysis_data.get("video_info", {}),
-                "brand_analysis": analysis_data.get("brand_analysis", {}),
+                "brand_analysis": compact_brand_analysis(brand_analysis, analysis_settings.get("frame_interval")),
                 "total_analysis_time": analysis_data.get("total_analysis_time", 0),
-                "statistics": self._calculate_statistics(analysis_data.get("brand_analysis", {})),
-                "analysis_settings": analysis_data.get("analysis_settings", {})
+                "statistics": self.calculate_statistics(brand_analysis),
+                "analysis_settings": analysis_settings,
+                "model_version": analysis_settings.get("model_version"),
+                "processing_stats": analysis_data.get("processing_stats", {})
             }
             
-            # 새 분석 결과 추가
-            data["analyses"].append(analysis_record)
-            
-            # 메타데이터 업데이트
-            data["metadata"]["total_analyses"] = len(data["analyses"])
-            data["metadata"]["last_updated"] = datetime.now().isoformat()
-            
-            # 최근 100개만 유지 (용량 관리)
-            if len(data["analyses"]) > 100:
-                data["analyses"] = data["analyses"][-100:]
-                data["metadata"]["total_analyses"] = 100
-            
-            # 저장
-            self._save_data(data)
+            # 행 하나만 추가하므로 기존 히스토리를 읽거나 다시 쓰지 않습니다
+            connection = self._connect()
+            with connection:
+                self._insert(connection, analysis_record)
+                self._apply_to_aggregates(connection, analysis_record, 1)
+                self._touch(connection)
             
             print(f"💾 분석 결과 저장 완료: {analysis_id} (사용자: {username})")
             return analysis_id
@@ -98,7 +233,7 @@ class AnalysisStorageService:
             print(f"분석 결과 저장 오류: {str(e)}")
             return None
     
-    def _calculate_statistics(self, brand_analysis: Dict) -> Dict:
+    def calculate_statistics(self, brand_analysis: Dict) -> Dict:
         """브랜드 분석 결과의 통계를 계산합니다."""
         if not brand_analysis:
             return {}
@@ -110,12 +245,15 @@ class AnalysisStorageService:
         # 가장 많이 탐지된 브랜드
         most_detected = max(brand_analysis.items(), key=lambda x: x[1].get("appearances", 0)) if brand_analysis else None
         
-        # 평균 신뢰도
-        all_confidences = []
+        # 평균 신뢰도: 브랜드별 평균에 등장 횟수를 곱해 합치므로 신뢰도 목록을 다시 펼치지 않습니다
+        weighted_confidence = 0.0
         for brand_data in brand_analysis.values():
-            all_confidences.extend(brand_data.get("confidence_scores", []))
+            if "average_confidence" in brand_data:
+                weighted_confidence += brand_data["average_confidence"] * brand_data.get("appearances", 0)
+            else:
+                weighted_confidence += sum(brand_data.get("confidence_scores", []))
         
-        avg_confidence = sum(all_confidences) / len(all_confidences) if all_confidences else 0
+        avg_confidence = weighted_confidence / total_appearances if total_appearances else 0
         
         return {
             "total_brands_detected": total_brands,
@@ -136,16 +274,20 @@ class AnalysisStorageService:
             username: 사용자 id (이메일) - username 필드에 id가 저장되어 있음
         """
         try:
-            data = self._load_data()
-            analyses = data.get("analyses", [])
-            
-            # 사용자별 필터링 (username 필드에 실제로는 id가 저장됨)
+            connection = self._connect()
+            # 사용자별 필터링 (username 필드에 실제로는 id가 저장됨), (username, timestamp) 인덱스로 최신순 조회
             if username:
-                analyses = [analysis for analysis in analyses if analysis.get("username") == username]
-                print(f"📊 사용자 id '{username}'의 분석 결과: {len(analyses)}개")
+                rows = connection.execute(
+                    "SELECT record FROM analyses WHERE username = ? ORDER BY timestamp DESC LIMIT ?",
+                    (username, limit)
+                ).fetchall()
+                print(f"📊 사용자 id '{username}'의 분석 결과: {len(rows)}개")
+            else:
+                rows = connection.execute(
+                    "SELECT record FROM analyses ORDER BY timestamp DESC LIMIT ?", (limit,)
+                ).fetchall()
             
-            # 최신순으로 정렬하여 반환
-            return sorted(analyses, key=lambda x: x["timestamp"], reverse=True)[:limit]
+            return [json.loads(row["record"]) for row in rows]
             
         except Exception as e:
             print(f"히스토리 조회 오류: {str(e)}")
@@ -154,30 +296,35 @@ class AnalysisStorageService:
     def get_analysis_by_id(self, analysis_id: str, username: str = None) -> Optional[Dict]:
         """특정 ID의 분석 결과를 가져옵니다."""
         try:
-            data = self._load_data()
-            analyses = data.get("analyses", [])
+            row = self._connect().execute(
+                "SELECT username, record FROM analyses WHERE id = ?", (analysis_id,)
+            ).fetchone()
+            if row is None:
+                return None
             
-            for analysis in analyses:
-                if analysis["id"] == analysis_id:
-                    # 사용자 검증 (username이 제공된 경우)
-                    if username and analysis.get("username") != username:
-                        print(f"⚠️ 권한 없음: 사용자 '{username}'이 '{analysis_id}' 접근 시도")
-                        return None
-                    return analysis
-            
-            return None
+            # 사용자 검증 (username이 제공된 경우)
+            if username and row["username"] != username:
+                print(f"⚠️ 권한 없음: 사용자 '{username}'이 '{analysis_id}' 접근 시도")
+                return None
+            return json.loads(row["record"])
             
         except Exception as e:
             print(f"분석 결과 조회 오류: {str(e)}")
             return None
     
-    def get_statistics_summary(self) -> Dict:
-        """전체 분석 통계 요약을 가져옵니다."""
+    def get_statistics_summary(self, username: str = None, top_k: int = 10) -> Dict:
+        """전체(또는 사용자별) 분석 통계 요약을 가져옵니다.
+        
+        저장/삭제 때 유지한 집계 테이블에서 상위 top_k개 브랜드만 읽으므로 히스토리 크기와 관계없이 빠릅니다.
+        """
         try:
-            data = self._load_data()
-            analyses = data.get("analyses", [])
+            connection = self._connect()
+            scope = f"user:{username}" if username else GLOBAL_SCOPE
+            totals = connection.execute(
+                "SELECT analyses, analysis_time FROM analysis_totals WHERE scope = ?", (scope,)
+            ).fetchone()
             
-            if not analyses:
+            if not totals or not totals["analyses"]:
                 return {
                     "total_analyses": 0,
                     "total_videos_analyzed": 0,
@@ -186,66 +333,138 @@ class AnalysisStorageService:
                     "average_analysis_time": 0
                 }
             
-            # 브랜드별 통계
-            brand_counts = {}
-            total_analysis_time = 0
+            # 가장 많이 탐지된 브랜드 순으로 정렬 ((scope, appearances DESC, brand) 인덱스 순서 그대로 읽음)
+            most_common_brands = connection.execute(
+                "SELECT brand, appearances, total_seconds FROM brand_totals WHERE scope = ? "
+                "ORDER BY appearances DESC, brand LIMIT ?",
+                (scope, top_k)
+            ).fetchall()
+            total_brands = connection.execute(
+                "SELECT COUNT(*) FROM brand_totals WHERE scope = ?", (scope,)
+            ).fetchone()[0]
             
-            for analysis in analyses:
-                total_analysis_time += analysis.get("total_analysis_time", 0)
-                
-                for brand_name, brand_data in analysis.get("brand_analysis", {}).items():
-                    if brand_name not in brand_counts:
-                        brand_counts[brand_name] = 0
-                    brand_counts[brand_name] += brand_data.get("appearances", 0)
-            
-            # 가장 많이 탐지된 브랜드 순으로 정렬
-            most_common_brands = sorted(brand_counts.items(), key=lambda x: x[1], reverse=True)[:10]
-            
-            return {
-                "total_analyses": len(analyses),
-                "total_videos_analyzed": len(analyses),
-                "total_brands_detected": len(brand_counts),
-                "most_common_brands": [{"name": brand, "total_appearances": count} for brand, count in most_common_brands],
-                "average_analysis_time": round(total_analysis_time / len(analyses), 2) if analyses else 0,
-                "metadata": data.get("metadata", {})
+            summary = {
+                "total_analyses": totals["analyses"],
+                "total_videos_analyzed": totals["analyses"],
+                "total_brands_detected": total_brands,
+                "most_common_brands": [
+                    {
+                        "name": row["brand"],
+                        "total_appearances": row["appearances"],
+                        "total_seconds": round(row["total_seconds"], 3)
+                    }
+                    for row in most_common_brands
+                ],
+                "average_analysis_time": round(totals["analysis_time"] / totals["analyses"], 2),
+                "metadata": self._get_metadata()
             }
+            if username:
+                summary["username"] = username
+            return summary
             
         except Exception as e:
             print(f"통계 요약 조회 오류: {str(e)}")
             return {}
     
+    def rebuild_statistics(self) -> Dict:
+        """저장된 분석 전체로 집계를 다시 계산해 교체하고, 기존 집계와의 차이를 반환합니다 (일관성 점검)."""
+        connection = self._connect()
+        with connection:
+            # 점검하는 동안 다른 저장/삭제가 끼어들지 않도록 쓰기 잠금을 먼저 잡습니다
+            connection.execute("BEGIN IMMEDIATE")
+            first_build = connection.execute(
+                "SELECT value FROM metadata WHERE key = 'aggregates_built_at'"
+            ).fetchone() is None
+            current = self._read_aggregates(connection)
+            connection.execute("DELETE FROM analysis_totals")
+            connection.execute("DELETE FROM brand_totals")
+            analyses = 0
+            for row in connection.execute("SELECT record FROM analyses"):
+                self._apply_to_aggregates(connection, json.loads(row["record"]), 1)
+                analyses += 1
+            rebuilt = self._read_aggregates(connection)
+            connection.execute(
+                "INSERT OR REPLACE INTO metadata (key, value) VALUES ('aggregates_built_at', ?)",
+                (datetime.now().isoformat(),)
+            )
+        
+        # 처음 만드는 집계는 비교할 기존 값이 없습니다
+        differences = [] if first_build else self._compare_aggregates(current, rebuilt)
+        if first_build:
+            print(f"📊 통계 집계 생성 완료 (분석 {analyses}개)")
+        elif differences:
+            print(f"⚠️ 통계 집계 불일치 {len(differences)}건을 다시 계산해 바로잡았습니다 (분석 {analyses}개)")
+        else:
+            print(f"📊 통계 집계 점검 완료: 일치 (분석 {analyses}개)")
+        return {
+            "consistent": not differences,
+            "analyses_scanned": analyses,
+            "differences": differences[:50],
+            "difference_count": len(differences)
+        }
+    
+    @staticmethod
+    def _read_aggregates(connection: sqlite3.Connection) -> Dict:
+        aggregates = {}
+        for row in connection.execute("SELECT scope, analyses, analysis_time FROM analysis_totals"):
+            aggregates[(row["scope"], None)] = (row["analyses"], row["analysis_time"])
+        for row in connection.execute("SELECT scope, brand, analyses, appearances, total_seconds FROM brand_totals"):
+            aggregates[(row["scope"], row["brand"])] = (row["analyses"], row["appearances"], row["total_seconds"])
+        return aggregates
+    
+    @staticmethod
+    def _compare_aggregates(current: Dict, rebuilt: Dict) -> List[Dict]:
+        """두 집계의 차이를 항목별로 반환합니다. 실수 합계는 반올림 오차를 허용합니다."""
+        differences = []
+        for key in sorted(set(current) | set(rebuilt), key=lambda k: (k[0], k[1] or "")):
+            stored, expected = current.get(key), rebuilt.get(key)
+            if stored is not None and expected is not None and all(
+                abs(a - b) <= 1e-6 for a, b in zip(stored, expected)
+            ):
+                continue
+            differences.append({
+                "scope": key[0],
+                "brand": key[1],
+                "stored": list(stored) if stored else None,
+                "expected": list(expected) if expected else None
+            })
+        return differences
+    
+    def is_raw_detections_referenced(self, raw_detections_id: str) -> bool:
+        """저장된 분석 중 해당 원시 탐지 저장소를 사용하는 결과가 있는지 확인합니다."""
+        row = self._connect().execute(
+            "SELECT 1 FROM analyses WHERE raw_detections_id = ? LIMIT 1", (raw_detections_id,)
+        ).fetchone()
+        return row is not None
+    
     def delete_analysis(self, analysis_id: str, username: str = None) -> bool:
         """특정 분석 결과를 삭제합니다."""
         try:
-            data = self._load_data()
-            analyses = data.get("analyses", [])
-            
-            # 사용자 권한 검증
-            if username:
-                analysis_to_delete = None
-                for analysis in analyses:
-                    if analysis["id"] == analysis_id:
-                        analysis_to_delete = analysis
-                        break
+            connection = self._connect()
+            with connection:
+                connection.execute("BEGIN IMMEDIATE")
+                row = connection.execute(
+                    "SELECT username, record FROM analyses WHERE id = ?", (analysis_id,)
+                ).fetchone()
+                if row is None:
+                    print(f"❌ 분석 결과를 찾을 수 없음: {analysis_id}")
+                    return False
                 
-                if analysis_to_delete and analysis_to_delete.get("username") != username:
+                # 사용자 권한 검증
+                if username and row["username"] != username:
                     print(f"⚠️ 권한 없음: 사용자 '{username}'이 '{analysis_id}' 삭제 시도")
                     return False
+                
+                deleted = connection.execute("DELETE FROM analyses WHERE id = ?", (analysis_id,)).rowcount
+                if not deleted:
+                    print(f"❌ 분석 결과를 찾을 수 없음: {analysis_id}")
+                    return False
+                self._apply_to_aggregates(connection, json.loads(row["record"]), -1)
+                self._touch(connection)
             
-            # 해당 ID의 분석 결과 찾아서 제거
-            original_length = len(analyses)
-            data["analyses"] = [analysis for analysis in analyses if analysis["id"] != analysis_id]
-            
-            if len(data["analyses"]) < original_length:
-                data["metadata"]["total_analyses"] = len(data["analyses"])
-                data["metadata"]["last_updated"] = datetime.now().isoformat()
-                self._save_data(data)
-                print(f"🗑️ 분석 결과 삭제 완료: {analysis_id} (사용자: {username})")
-                return True
-            else:
-                print(f"❌ 분석 결과를 찾을 수 없음: {analysis_id}")
-                return False
+            print(f"🗑️ 분석 결과 삭제 완료: {analysis_id} (사용자: {username})")
+            return True
                 
         except Exception as e:
             print(f"분석 결과 삭제 오류: {str(e)}")
-            return False 
\ No newline at end of file
+            return False
\ No newline at end of file
@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import json
+import os
+import uuid
+from typing import Dict, Iterable, List, Optional
+
+from .lazy_modules import lazy_module
+
+np = lazy_module("numpy")
+
+
+class DetectionStoreService:
+    """분석별 원시 탐지 결과를 열(column) 단위 압축 바이너리(.npz)로 저장합니다.
+
+    추론은 낮은 기준 신뢰도(floor)로 한 번만 하고 그 결과를 모두 보관해 두면,
+    신뢰도 기준이나 요약 방식을 바꿔도 영상을 다시 추론하지 않고 이 저장소에서 다시 계산할 수 있습니다.
+
+    파일 하나에 들어가는 배열:
+      frame_timestamps (F,) float64  분석한 모든 프레임의 시각 (탐지가 없는 프레임 포함)
+      frame_index      (D,) int32    탐지가 속한 프레임 번호
+      brand_index      (D,) int16    brands 배열의 브랜드 번호
+      confidence       (D,) float64  모델이 반환한 값 그대로 (float32로 줄이면 기준값 근처의 탐지가 다르게 걸러집니다)
+      bbox             (D, 4) float64 xyxy
+      brands           (B,) str
+      metadata         JSON 문자열 (frame_interval, track_stride, confidence_floor 등)
+    """
+
+    def __init__(self):
+        self.storage_dir = os.path.join("analysis_results", "detections")
+        os.makedirs(self.storage_dir, exist_ok=True)
+
+    def _store_path(self, store_id: str) -> str:
+        # 경로 조작을 막기 위해 파일 이름에 쓸 수 없는 ID는 거부합니다
+        if not store_id or os.path.basename(store_id) != store_id:
+            raise Exception(f"잘못된 탐지 저장소 ID입니다: {store_id}")
+        return os.path.join(self.storage_dir, f"{store_id}.npz")
+
+    def save(self, frame_results: List[Dict], metadata: Dict) -> str:
+        """프레임별 탐지 결과를 저장하고 저장소 ID를 반환합니다. 보간으로 채운 프레임은 저장하지 않습니다."""
+        frames = sorted(
+            (result for result in frame_results if not result.get("propagated")),
+            key=lambda result: result["timestamp"]
+        )
+        brands = sorted({d["brand"] for result in frames for d in result["detections"]})
+        brand_numbers = {brand: index for index, brand in enumerate(brands)}
+
+        detections = [
+            (frame_number, detection)
+            for frame_number, result in enumerate(frames)
+            for detection in result["detections"]
+        ]
+        store_id = str(uuid.uuid4())
+        path = self._store_path(store_id)
+        with open(path, "wb") as f:
+            np.savez_compressed(
+                f,
+                frame_timestamps=np.array([result["timestamp"] for result in frames], dtype=np.float64),
+                frame_index=np.array([number for number, _ in detections], dtype=np.int32),
+                brand_index=np.array([brand_numbers[d["brand"]] for _, d in detections], dtype=np.int16),
+                confidence=np.array([d["confidence"] for _, d in detections], dtype=np.float64),
+                bbox=np.array([d["bbox"] for _, d in detections], dtype=np.float64).reshape(-1, 4),
+                brands=np.array(brands, dtype=str),
+                metadata=np.array(json.dumps(metadata, ensure_ascii=False))
+            )
+        print(f"💾 원시 탐지 저장 완료: {store_id} (프레임 {len(frames)}개, 탐지 {len(detections)}개, "
+              f"{os.path.getsize(path) / 1024:.1f}KB)")
+        return store_id
+
+    def load(self, store_id: str) -> Optional[Dict]:
+        """저장된 열 배열과 metadata를 반환합니다. 없으면 None을 반환합니다."""
+        path = self._store_path(store_id)
+        if not os.path.exists(path):
+            return None
+        with np.load(path, allow_pickle=False) as data:
+            columns = {name: data[name] for name in data.files}
+        columns["metadata"] = json.loads(str(columns["metadata"]))
+        return columns
+
+    def delete(self, store_id: str) -> bool:
+        try:
+            path = self._store_path(store_id)
+            if os.path.exists(path):
+                os.remove(path)
+                return True
+        except Exception as e:
+            print(f"원시 탐지 삭제 오류: {str(e)}")
+        return False
+
+    @staticmethod
+    def to_frame_results(columns: Dict, min_confidence: float = None,
+                         brands: Iterable[str] = None) -> List[Dict]:
+        """열 배열을 신뢰도/브랜드로 걸러 프레임별 탐지 결과({"timestamp", "detections"}) 목록으로 되돌립니다.
+
+        거르는 작업은 배열 단위로 한 번에 수행하고, 남은 탐지만 프레임별 dict로 만듭니다.
+        """
+        selected = np.ones(len(columns["confidence"]), dtype=bool)
+        if min_confidence is not None:
+            selected &= columns["confidence"] >= min_confidence
+        if brands is not None:
+            brands = set(brands)
+            wanted = [index for index, brand in enumerate(columns["brands"].tolist()) if brand in brands]
+            selected &= np.isin(columns["brand_index"], wanted)
+
+        frame_index = columns["frame_index"][selected]
+        brand_names = columns["brands"].tolist()
+        brand_index = columns["brand_index"][selected].tolist()
+        confidences = columns["confidence"][selected].tolist()
+        bboxes = columns["bbox"][selected].tolist()
+
+        frame_results = [{"timestamp": timestamp, "detections": []} for timestamp in columns["frame_timestamps"].tolist()]
+        for frame_number, brand_number, confidence, bbox in zip(frame_index.tolist(), brand_index, confidences, bboxes):
+            frame_results[frame_number]["detections"].append({
+                "brand": brand_names[brand_number],
+                "confidence": confidence,
+                "bbox": bbox
+            })
+        return frame_results
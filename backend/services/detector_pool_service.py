@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Tuple
+
+if TYPE_CHECKING:
+    import numpy as np
+
+
+class DetectorPoolRetiredError(Exception):
+    """기다리는 동안 풀이 새 모델 풀로 교체되었을 때 발생합니다."""
+
+
+def _configure_compute_threads(num_threads: int):
+    """연산 라이브러리(OpenCV, PyTorch)의 스레드 수를 설정합니다.
+
+    두 설정 모두 프로세스 전체에 적용되므로 탐지 스레드마다 설정하면 마지막 값만 남습니다.
+    풀을 만들 때 한 번, 모든 인스턴스가 함께 쓰는 전체 예산(인스턴스 수 × 인스턴스당 스레드 수)으로 설정합니다.
+    """
+    try:
+        import cv2
+        cv2.setNumThreads(num_threads)
+    except Exception:
+        pass
+    try:
+        import torch
+        torch.set_num_threads(num_threads)
+    except Exception:
+        pass
+
+
+class PooledDetector:
+    """모델 인스턴스 하나와 그 인스턴스만 사용하는 전용 스레드입니다."""
+
+    def __init__(self, index: int, model: Any, detect_fn: Callable, version: str = None,
+                 image_size: int = None):
+        self.index = index
+        self.model = model
+        self.version = version
+        # 모델 입력 크기 (디코딩 단계에서 이 크기로 레터박스합니다)
+        self.image_size = image_size
+        self._detect_fn = detect_fn
+        self._executor = ThreadPoolExecutor(
+            max_workers=1,
+            thread_name_prefix=f"detector-{index}"
+        )
+
+    def submit(self, batch: List[Tuple[float, np.ndarray]], **options) -> Future:
+        """배치를 전용 스레드에 넘기고 Future를 반환합니다. options는 탐지 함수에 그대로 전달됩니다."""
+        return self._executor.submit(self._detect_fn, batch, self.model, **options)
+
+    def detect_batch(self, batch: List[Tuple[float, np.ndarray]], **options) -> List[Dict]:
+        """배치를 전용 스레드에서 탐지하고 끝날 때까지 기다립니다 (다른 스레드에서 호출용)."""
+        return self.submit(batch, **options).result()
+
+    def close(self):
+        self._executor.shutdown(wait=False)
+
+
+class DetectorPool:
+    """모델 인스턴스 N개를 빌려주고 돌려받는 풀입니다.
+
+    분석 요청은 checkout으로 인스턴스 하나를 빌려 분석이 끝날 때까지 혼자 사용합니다.
+    모든 인스턴스가 사용 중이면 스레드를 점유하지 않고 이벤트 루프에서 기다립니다.
+    """
+
+    def __init__(self, models: List[Any], detect_fn: Callable, threads_per_detector: int,
+                 config: Dict = None):
+        self.threads_per_detector = threads_per_detector
+        # 이 풀의 모델 설정 (버전, 경로, 백엔드, 정밀도, 입력 크기)
+        self.config = config or {}
+        _configure_compute_threads(threads_per_detector * max(1, len(models)))
+        self.detectors = [
+            PooledDetector(index, model, detect_fn, self.config.get("version"), self.config.get("image_size"))
+            for index, model in enumerate(models)
+        ]
+        self._idle: asyncio.Queue = asyncio.Queue()
+        for detector in self.detectors:
+            self._idle.put_nowait(detector)
+        self._retired = False
+        self.busy = 0
+        self.waiting = 0
+        self.checkouts = 0
+        self.total_wait_seconds = 0.0
+
+    async def acquire(self, timeout: float = None) -> PooledDetector:
+        """사용 가능한 인스턴스를 빌립니다. timeout초 안에 빌리지 못하면 예외가 발생합니다."""
+        if self._retired:
+            raise DetectorPoolRetiredError("교체된 탐지기 풀입니다.")
+
+        started = time.perf_counter()
+        self.waiting += 1
+        try:
+            detector = await asyncio.wait_for(self._idle.get(), timeout)
+        except asyncio.TimeoutError:
+            raise Exception(f"사용 가능한 탐지기가 없습니다 ({timeout}초 대기)")
+        finally:
+            self.waiting -= 1
+
+        # retire가 대기자를 깨우려고 넣은 표식
+        if detector is None:
+            raise DetectorPoolRetiredError("교체된 탐지기 풀입니다.")
+
+        waited = time.perf_counter() - started
+        self.busy += 1
+        self.checkouts += 1
+        self.total_wait_seconds += waited
+        if waited > 1.0:
+            print(f"⏳ 탐지기 대기 {waited:.1f}초 후 #{detector.index} 사용")
+        return detector
+
+    def release(self, detector: PooledDetector):
+        """빌린 인스턴스를 반납합니다. 교체된 풀이면 인스턴스를 정리합니다."""
+        self.busy -= 1
+        if self._retired:
+            detector.close()
+        else:
+            self._idle.put_nowait(detector)
+
+    @asynccontextmanager
+    async def checkout(self, timeout: float = None):
+        detector = await self.acquire(timeout)
+        try:
+            yield detector
+        finally:
+            self.release(detector)
+
+    def retire(self):
+        """새 요청에는 더 이상 빌려주지 않고, 쉬고 있는 인스턴스부터 정리합니다.
+
+        사용 중인 인스턴스는 반납될 때 정리되므로 진행 중인 분석은 그대로 끝까지 실행됩니다.
+        인스턴스를 기다리던 요청은 깨워서 새 풀에서 다시 빌리도록 합니다.
+        """
+        self._retired = True
+        while not self._idle.empty():
+            detector = self._idle.get_nowait()
+            if detector is not None:
+                detector.close()
+        for _ in range(self.waiting):
+            self._idle.put_nowait(None)
+
+    def get_stats(self) -> Dict:
+        return {
+            "model_version": self.config.get("version"),
+            "size": len(self.detectors),
+            "threads_per_detector": self.threads_per_detector,
+            "busy": self.busy,
+            "waiting": self.waiting,
+            "checkouts": self.checkouts,
+            "average_wait_seconds": round(self.total_wait_seconds / self.checkouts, 3) if self.checkouts else 0
+        }
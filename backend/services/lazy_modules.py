@@ -0,0 +1,40 @@
+import importlib
+import threading
+
+
+class LazyModule:
+    """처음 속성에 접근할 때 실제 모듈을 import하는 대리 객체입니다.
+
+    cv2, numpy, ultralytics, yt_dlp처럼 import가 무거운 모듈을 모듈 최상단에서
+    `np = lazy_module("numpy")`처럼 선언해 두면, 인증/히스토리/알림 요청만 처리하는
+    프로세스는 이 모듈들을 한 번도 import하지 않습니다.
+    """
+
+    def __init__(self, name: str):
+        self.__dict__["_name"] = name
+        self.__dict__["_module"] = None
+        self.__dict__["_lock"] = threading.Lock()
+
+    def _load(self):
+        module = self.__dict__["_module"]
+        if module is None:
+            with self.__dict__["_lock"]:
+                module = self.__dict__["_module"]
+                if module is None:
+                    module = importlib.import_module(self.__dict__["_name"])
+                    self.__dict__["_module"] = module
+        return module
+
+    def __getattr__(self, attr: str):
+        return getattr(self._load(), attr)
+
+    def __setattr__(self, attr: str, value):
+        setattr(self._load(), attr, value)
+
+    def __repr__(self) -> str:
+        state = "loaded" if self.__dict__["_module"] is not None else "not loaded"
+        return f"<lazy module '{self.__dict__['_name']}' ({state})>"
+
+
+def lazy_module(name: str) -> LazyModule:
+    return LazyModule(name)
@@ -1,16 +1,67 @@
+from __future__ import annotations
+
 import asyncio
-import cv2
-import numpy as np
-from ultralytics import YOLO
 from typing import List, Dict, Tuple, Any
 import os
-from collections import defaultdict
+import functools
+import time
+from contextlib import asynccontextmanager
+
+from .detector_pool_service import DetectorPool, DetectorPoolRetiredError
+from .lazy_modules import lazy_module
+
+# 무거운 모듈은 모델을 처음 로드하거나 프레임을 다룰 때 import합니다
+np = lazy_module("numpy")
+
+# 지원하는 추론 백엔드 (pytorch: .pt 원본, onnx/openvino: setup_model.py export로 변환한 모델)
+SUPPORTED_BACKENDS = ("pytorch", "onnx", "openvino")
+SUPPORTED_PRECISIONS = ("fp32", "int8")
+# 타일 추론 모드 (off: 전체 프레임만, all: 모든 프레임을 타일로도 탐지, promising: 전체 프레임 탐지에 후보가 있는 프레임만)
+TILING_MODES = ("off", "all", "promising")
 
 class LogoDetectionService:
-    def __init__(self):
+    def __init__(self, model_registry=None, load_model: bool = True):
+        """load_model=False면 모델을 바로 로드하지 않습니다 (서버는 start_background_load 사용)."""
         self.model = None
-        self.model_path = "models/best_1280.pt"  # 1280 이미지 사이즈로 학습된 모델
+        # 모델 버전 레지스트리 (없으면 아래 환경 변수 설정만 사용)
+        self.model_registry = model_registry
+        # 현재 모델 버전 (레지스트리에 활성 버전이 없으면 "default")
+        self.model_version = "default"
+        # 1280 이미지 사이즈로 학습된 모델 (변환 모델 경로는 이 경로를 기준으로 찾습니다)
+        self.model_path = os.getenv("LOGO_MODEL_PATH", "models/best_1280.pt")
+        # 추론 백엔드와 정밀도 (GPU가 없는 노드에서는 onnx/openvino + int8이 빠릅니다)
+        self.inference_backend = os.getenv("LOGO_MODEL_BACKEND", "pytorch")
+        self.model_precision = os.getenv("LOGO_MODEL_PRECISION", "fp32")
+        # 추론 입력 크기 (변환 모델은 이 크기로 고정되어 있어야 합니다)
+        self.image_size = int(os.getenv("LOGO_MODEL_IMGSZ", "1280"))
         self.confidence_threshold = 0.5  
+        # 원시 탐지 저장용 추론 기준 신뢰도 (저장된 결과로 이 값 이상 어떤 기준으로도 다시 요약할 수 있습니다)
+        self.raw_confidence_floor = 0.1
+        # 한 번의 모델 호출에 묶어서 보낼 프레임 수
+        self.batch_size = 8
+        # 타일 추론: 타일 한 변 크기(px), 이웃 타일과 겹치는 비율, 프레임당 기본 최대 타일 수
+        self.tile_size = 640
+        self.tile_overlap = 0.2
+        self.max_tiles_per_frame = 6
+        # promising 모드에서 전체 프레임 탐지에 이 신뢰도 이상인 후보가 있어야 타일 추론을 합니다
+        self.tile_promising_confidence = 0.25
+        # 타일 경계의 중복 박스 병합 기준 (작은 박스 면적 대비 겹친 비율)
+        self.tile_nms_threshold = 0.5
+        # 동시에 분석할 수 있는 모델 인스턴스 수와 인스턴스별 연산 스레드 수
+        self.pool_size = int(os.getenv("DETECTOR_POOL_SIZE", "2"))
+        self.threads_per_detector = int(os.getenv(
+            "DETECTOR_THREADS", str(max(1, (os.cpu_count() or 1) // max(1, self.pool_size)))
+        ))
+        # 모든 인스턴스가 사용 중일 때 기다릴 최대 시간 (초, None이면 무제한)
+        self.checkout_timeout = None
+        self.pool = None
+        # 백그라운드에서 로드 중인 모델 버전과 마지막 교체 실패 사유
+        self.loading_version = None
+        self.last_load_error = None
+        # 모델 로드 상태: "pending" → "loading" → "ready" 또는 "failed"
+        self.load_state = "pending"
+        self.load_seconds = None
+        self._ready_event = asyncio.Event()
         self.brand_classes = {
             0: "coca-cola",
             1: "pepsi", 
@@ -23,107 +74,434 @@ class LogoDetectionService:
             8: "kfc",
             9: "starbucks"
         }
-        self._load_model()
+        active_version = model_registry.get_active() if model_registry else None
+        if active_version:
+            self._apply_config(active_version)
+        if load_model:
+            self._load_model()
+    
+    def _current_config(self) -> Dict:
+        """현재 모델 설정을 레지스트리 항목과 같은 형식으로 반환합니다."""
+        return {
+            "version": self.model_version,
+            "path": self.model_path,
+            "backend": self.inference_backend,
+            "precision": self.model_precision,
+            "image_size": self.image_size
+        }
+    
+    def _apply_config(self, config: Dict):
+        self.model_version = config["version"]
+        self.model_path = config["path"]
+        self.inference_backend = config.get("backend", "pytorch")
+        self.model_precision = config.get("precision", "fp32")
+        self.image_size = int(config.get("image_size", self.image_size))
+    
+    def get_backend_model_path(self, config: Dict = None) -> str:
+        """설정된 백엔드/정밀도에 맞는 모델 경로를 반환합니다.
+        
+        model_path가 이미 변환된 모델(.onnx, *_openvino_model)이면 그대로 사용하고,
+        .pt 경로면 setup_model.py export가 만드는 이름 규칙으로 변환 모델 경로를 만듭니다.
+          onnx:     models/best_1280.onnx, models/best_1280_int8.onnx
+          openvino: models/best_1280_openvino_model/, models/best_1280_int8_openvino_model/
+        """
+        config = config or self._current_config()
+        path = config["path"].rstrip("/\\")
+        backend = config.get("backend", "pytorch")
+        if path.endswith(".onnx") or path.endswith("_openvino_model") or backend == "pytorch":
+            return path
+        
+        stem = os.path.splitext(path)[0]
+        if config.get("precision") == "int8":
+            stem += "_int8"
+        if backend == "onnx":
+            return f"{stem}.onnx"
+        return f"{stem}_openvino_model"
     
     def _load_model(self):
-        """YOLO 모델을 로드합니다."""
+        """현재 설정으로 YOLO 모델을 로드해 바로 교체합니다.
+        
+        새 인스턴스를 모두 준비한 뒤 한 번에 교체하므로 진행 중인 분석이 반쯤 바뀐 모델을 보지 않습니다.
+        """
+        self.load_state = "loading"
+        started = time.perf_counter()
         try:
-            # 사전 훈련된 YOLO 모델 사용 (실제로는 로고 탐지용 커스텀 모델 필요)
-            if os.path.exists(self.model_path):
-                self.model = YOLO(self.model_path)
-                print(f"✅ 커스텀 모델 로드 성공: {self.model_path}")
-                
-                # 모델의 클래스 정보 출력
-                if hasattr(self.model, 'names'):
-                    print("📋 모델 클래스 정보:")
-                    for class_id, class_name in self.model.names.items():
-                        print(f"  {class_id}: {class_name}")
-                    
-                    # 클래스 매핑 자동 업데이트
-                    self.brand_classes = self.model.names
-                    print("🔄 클래스 매핑이 자동으로 업데이트되었습니다.")
-                else:
-                    print("⚠️ 모델에서 클래스 정보를 찾을 수 없습니다.")
-                    
-            else:
-                # 임시로 일반 객체 탐지 모델 사용
-                self.model = YOLO('yolov8n.pt')
-                print("경고: 로고 탐지용 커스텀 모델이 없어 일반 YOLO 모델을 사용합니다.")
-                print(f"찾는 모델 경로: {self.model_path}")
+            self._install_pool(self._prepare_pool(self._current_config()))
+            self.load_state = "ready"
         except Exception as e:
             print(f"모델 로드 실패: {str(e)}")
             self.model = None
+            self.load_state = "failed"
+            self.last_load_error = str(e)
+            if self.pool is not None:
+                self.pool.retire()
+                self.pool = None
+        finally:
+            self.load_seconds = round(time.perf_counter() - started, 3)
     
-    async def detect_logos_in_frames(self, frames: List[Tuple[float, np.ndarray]]) -> List[Dict]:
-        """프레임들에서 로고를 탐지합니다."""
-        try:
-            if not self.model:
-                raise Exception("YOLO 모델이 로드되지 않았습니다.")
+    def start_background_load(self) -> asyncio.Task:
+        """서버 시작 직후 호출합니다. 모델 로드와 예열을 백그라운드에서 진행하고 바로 반환합니다.
+        
+        로드가 끝나기 전에 들어온 분석 요청은 checkout에서 준비될 때까지 기다립니다.
+        """
+        self.load_state = "loading"
+        
+        async def load():
+            loop = asyncio.get_event_loop()
+            await loop.run_in_executor(None, self._load_model)
+            # 실패해도 기다리던 요청이 깨어나 오류를 받도록 이벤트를 설정합니다
+            self._ready_event.set()
+            print(f"🚦 모델 준비 상태: {self.load_state} ({self.load_seconds}초)")
+        
+        return asyncio.create_task(load())
+    
+    def is_ready(self) -> bool:
+        return self.load_state == "ready" and self.pool is not None
+    
+    def _create_model(self, config: Dict):
+        """주어진 설정으로 새 모델 인스턴스를 만듭니다."""
+        from ultralytics import YOLO
+        
+        model_path = self.get_backend_model_path(config)
+        if os.path.exists(model_path):
+            # 변환 모델은 메타데이터만으로 작업 종류를 알 수 없으므로 detect로 지정합니다
+            return YOLO(model_path, task="detect")
+        return YOLO('yolov8n.pt')
+    
+    def _prepare_pool(self, config: Dict) -> DetectorPool:
+        """설정대로 모델 인스턴스를 만들고 예열한 탐지기 풀을 반환합니다. 사용 중인 모델은 건드리지 않습니다."""
+        backend = config.get("backend", "pytorch")
+        precision = config.get("precision", "fp32")
+        if backend not in SUPPORTED_BACKENDS:
+            raise Exception(f"지원하지 않는 추론 백엔드입니다: {backend}")
+        if precision not in SUPPORTED_PRECISIONS:
+            raise Exception(f"지원하지 않는 정밀도입니다: {precision}")
+        
+        model_path = self.get_backend_model_path(config)
+        if backend != "pytorch" and not os.path.exists(model_path):
+            raise Exception(f"변환된 모델이 없습니다: {model_path} (setup_model.py export로 생성하세요)")
+        
+        # 사전 훈련된 YOLO 모델 사용 (실제로는 로고 탐지용 커스텀 모델 필요)
+        models = [self._create_model(config) for _ in range(max(1, self.pool_size))]
+        if os.path.exists(model_path):
+            print(f"✅ 커스텀 모델 로드 성공: {model_path} (버전 {config['version']}, {backend}, {precision})")
             
+            # 모델의 클래스 정보 출력
+            if hasattr(models[0], 'names'):
+                print("📋 모델 클래스 정보:")
+                for class_id, class_name in models[0].names.items():
+                    print(f"  {class_id}: {class_name}")
+            else:
+                print("⚠️ 모델에서 클래스 정보를 찾을 수 없습니다.")
+        else:
+            # 임시로 일반 객체 탐지 모델 사용
+            print("경고: 로고 탐지용 커스텀 모델이 없어 일반 YOLO 모델을 사용합니다.")
+            print(f"찾는 모델 경로: {config['path']}")
+        
+        self._warmup(models, int(config["image_size"]))
+        return DetectorPool(
+            models,
+            functools.partial(self._detect_batch_sync, image_size=int(config["image_size"])),
+            self.threads_per_detector,
+            config
+        )
+    
+    def _warmup(self, models: List[Any], image_size: int):
+        """빈 프레임으로 한 번씩 추론해 첫 요청이 그래프 초기화 비용을 내지 않게 합니다."""
+        dummy = np.zeros((image_size, image_size, 3), dtype=np.uint8)
+        for model in models:
+            model(dummy, conf=self.confidence_threshold, imgsz=image_size, verbose=False)
+        print(f"🔥 모델 예열 완료: 인스턴스 {len(models)}개 ({image_size}px)")
+    
+    def _install_pool(self, pool: DetectorPool):
+        """준비된 탐지기 풀로 한 번에 교체합니다.
+        
+        이전 풀에서 인스턴스를 빌려 간 분석은 이전 모델로 끝까지 실행되고, 반납될 때 정리됩니다.
+        """
+        self._apply_config(pool.config)
+        self.model = pool.detectors[0].model
+        if hasattr(self.model, 'names'):
+            # 클래스 매핑 자동 업데이트
+            self.brand_classes = self.model.names
+        previous_pool = self.pool
+        self.pool = pool
+        if previous_pool is not None:
+            previous_pool.retire()
+        print(f"🧩 탐지기 풀 준비: 버전 {self.model_version}, 인스턴스 {len(pool.detectors)}개, "
+              f"인스턴스당 스레드 {self.threads_per_detector}개")
+    
+    async def activate_version(self, version: str):
+        """레지스트리의 모델 버전을 백그라운드에서 로드/예열한 뒤 새 분석부터 사용하도록 교체합니다."""
+        if self.model_registry is None:
+            raise Exception("모델 레지스트리가 설정되지 않았습니다.")
+        config = self.model_registry.get(version)
+        if config is None:
+            raise Exception(f"등록되지 않은 모델 버전입니다: {version}")
+        
+        try:
+            await self._swap_model(config, f"모델 버전 {version}")
+            self.model_registry.set_active(version)
+            print(f"✅ 모델 버전 교체 완료: {version}")
+        except Exception as e:
+            raise Exception(f"모델 버전 교체 실패: {str(e)}")
+    
+    async def _swap_model(self, config: Dict, label: str):
+        """config대로 새 탐지기 풀을 서버 시작 로드와 같은 executor에서 로드/예열한 뒤 한 번에 교체합니다.
+        
+        로드하는 동안과 로드에 실패한 경우에는 기존 모델을 그대로 사용합니다.
+        """
+        if self.loading_version:
+            raise Exception(f"다른 모델 버전을 로드하는 중입니다: {self.loading_version}")
+        if self.load_state == "loading":
+            raise Exception("서버 시작 모델 로드가 아직 끝나지 않았습니다.")
+        
+        self.loading_version = config["version"]
+        self.last_load_error = None
+        try:
+            print(f"🔄 {label} 로드 시작 (현재 버전 {self.model_version}은 계속 사용)")
             loop = asyncio.get_event_loop()
-            results = await loop.run_in_executor(
-                None, self._detect_logos_sync, frames
-            )
-            return results
+            pool = await loop.run_in_executor(None, self._prepare_pool, config)
+            # 교체는 이벤트 루프에서 한 번에 수행하므로 checkout은 이전 풀이나 새 풀 중 하나만 봅니다
+            self._install_pool(pool)
+            self.load_state = "ready"
         except Exception as e:
-            raise Exception(f"로고 탐지 실패: {str(e)}")
-    
-    def _detect_logos_sync(self, frames: List[Tuple[float, np.ndarray]]) -> List[Dict]:
-        """동기적으로 로고를 탐지합니다."""
-        detection_results = []
-        total_frames = len(frames)
-        print(f"🔍 총 {total_frames}개 프레임에서 로고 탐지 시작...")
-        
-        for idx, (timestamp, frame) in enumerate(frames, 1):
-            # 10프레임마다 진행 상황 출력
-            if idx % 10 == 0:
-                print(f"⏳ 진행 중... {idx}/{total_frames} ({idx/total_frames*100:.1f}%)")
-            
+            self.last_load_error = str(e)
+            raise
+        finally:
+            self.loading_version = None
+    
+    @asynccontextmanager
+    async def checkout(self):
+        """탐지기 풀에서 모델 인스턴스 하나를 빌립니다.
+        
+        사용법: async with logo_detection_service.checkout() as detector: ...
+        기다리는 동안 모델 버전이 교체되면 새 풀에서 다시 빌립니다.
+        """
+        if self.pool is None and self.load_state == "loading":
+            await self._ready_event.wait()
+        while True:
+            pool = self.pool
+            if pool is None:
+                raise Exception("YOLO 모델이 로드되지 않았습니다.")
             try:
-                # YOLO 모델로 탐지 실행
-                results = self.model(frame, conf=self.confidence_threshold, verbose=False)
-                
-                frame_detections = {
-                    "timestamp": timestamp,
-                    "detections": []
-                }
-                
-                for result in results:
-                    boxes = result.boxes
-                    if boxes is not None:
-                        for box in boxes:
-                            # 클래스 ID와 신뢰도 추출
-                            class_id = int(box.cls[0])
-                            confidence = float(box.conf[0])
-                            
-                            # 바운딩 박스 좌표
-                            x1, y1, x2, y2 = box.xyxy[0].tolist()
-                            
-                            # 브랜드 이름 매핑 (실제로는 커스텀 모델에서 로고 클래스 사용)
-                            brand_name = self._map_class_to_brand(class_id)
-                            
-                            if brand_name:
-                                frame_detections["detections"].append({
-                                    "brand": brand_name,
-                                    "confidence": confidence,
-                                    "bbox": [x1, y1, x2, y2]
-                                })
-                
-                detection_results.append(frame_detections)
-                
-            except Exception as e:
-                print(f"프레임 {timestamp} 탐지 오류: {str(e)}")
+                detector = await pool.acquire(self.checkout_timeout)
+                break
+            except DetectorPoolRetiredError:
                 continue
+        try:
+            yield detector
+        finally:
+            pool.release(detector)
+    
+    def get_tiling_options(self, mode: str = "off", max_tiles_per_frame: int = None) -> Dict:
+        """요청별 타일 추론 설정을 만듭니다. mode가 "off"면 None을 반환합니다.
         
-        total_detections = sum(len(result['detections']) for result in detection_results)
-        print(f"✅ 로고 탐지 완료: 총 {total_detections}개 탐지")
-        return detection_results
+        max_tiles_per_frame은 프레임 하나에 쓸 수 있는 최대 타일 수(연산 예산)입니다.
+        """
+        if mode not in TILING_MODES:
+            raise Exception(f"지원하지 않는 타일 추론 모드입니다: {mode}")
+        if mode == "off":
+            return None
+        max_tiles = self.max_tiles_per_frame if max_tiles_per_frame is None else int(max_tiles_per_frame)
+        if max_tiles < 2:
+            raise Exception(f"프레임당 최대 타일 수는 2 이상이어야 합니다: {max_tiles}")
+        return {
+            "mode": mode,
+            "tile_size": self.tile_size,
+            "overlap": self.tile_overlap,
+            "max_tiles": max_tiles,
+            "promising_confidence": self.tile_promising_confidence,
+            "nms_threshold": self.tile_nms_threshold
+        }
     
-    def _map_class_to_brand(self, class_id: int) -> str:
-        """클래스 ID를 브랜드 이름으로 매핑합니다."""
+    def _detect_batch_sync(self, batch: List[Tuple[float, np.ndarray]], model=None,
+                           image_size: int = None, tiling: Dict = None, confidence: float = None) -> List[Dict]:
+        """여러 프레임을 한 번의 모델 호출로 탐지합니다.
+        
+        배치 호출이 실패하면 문제 프레임만 제외할 수 있도록 프레임별로 다시 시도합니다.
+        model/image_size를 주지 않으면 현재 모델과 설정을 사용합니다.
+        항목이 (timestamp, 이미지, 좌표 변환)이면 디코딩 단계에서 레터박스한 이미지로 보고
+        박스를 원본 프레임 좌표로 되돌립니다. tiling(get_tiling_options 결과)을 주면 타일 추론을 합니다.
+        confidence를 주면 confidence_threshold 대신 그 값 이상인 탐지를 모두 반환합니다 (원시 탐지 저장용).
+        """
+        model = model or self.model
+        image_size = image_size or self.image_size
+        confidence = confidence or self.confidence_threshold
+        images = [item[1] for item in batch]
+        try:
+            if tiling:
+                return self._detect_tiled_sync(batch, model, image_size, tiling, confidence)
+            results = model(images, conf=confidence, imgsz=image_size, verbose=False)
+        except Exception as e:
+            if len(batch) == 1:
+                print(f"프레임 {batch[0][0]} 탐지 오류: {str(e)}")
+                return []
+            print(f"⚠️ 배치 탐지 오류, 프레임별로 재시도합니다: {str(e)}")
+            return [
+                frame_detections
+                for item in batch
+                for frame_detections in self._detect_batch_sync([item], model, image_size, tiling, confidence)
+            ]
+        
+        return [
+            self._parse_result(item[0], result, model, item[2] if len(item) > 2 else None)
+            for item, result in zip(batch, results)
+        ]
+    
+    def _detect_tiled_sync(self, batch: List[Tuple[float, np.ndarray]], model, image_size: int,
+                           tiling: Dict, confidence: float) -> List[Dict]:
+        """전체 프레임 탐지에 더해 겹치는 타일로 나눠 다시 탐지하고 박스를 합칩니다.
+        
+        전체 프레임으로 줄이면 사라지는 작은 로고(옷, 배경 간판)를 타일 해상도에서 찾습니다.
+        배치의 모든 타일은 한 번의 모델 호출로 추론하며, promising 모드에서는 전체 프레임 탐지에
+        후보가 있는 프레임만 타일로 나눕니다.
+        """
+        promising = tiling["mode"] == "promising"
+        full_confidence = min(confidence, tiling["promising_confidence"]) if promising else confidence
+        full_results = model([item[1] for item in batch], conf=full_confidence, imgsz=image_size, verbose=False)
+        full_boxes = [self._result_arrays(result) for result in full_results]
+        
+        tiles = []  # (프레임 번호, x 오프셋, y 오프셋, 타일 이미지)
+        for index, (item, (_, confidences, _)) in enumerate(zip(batch, full_boxes)):
+            if promising and not (confidences >= tiling["promising_confidence"]).any():
+                continue
+            frame = item[1]
+            height, width = frame.shape[:2]
+            for x0, y0, x1, y1 in self._tile_grid(width, height, tiling["tile_size"],
+                                                  tiling["overlap"], tiling["max_tiles"]):
+                tiles.append((index, x0, y0, frame[y0:y1, x0:x1]))
+        
+        boxes_per_frame = [[arrays] for arrays in full_boxes]
+        tile_counts = [0] * len(batch)
+        if tiles:
+            tile_results = model([tile for *_, tile in tiles], conf=confidence,
+                                 imgsz=tiling["tile_size"], verbose=False)
+            for (index, x0, y0, _), result in zip(tiles, tile_results):
+                xyxy, confidences, class_ids = self._result_arrays(result)
+                boxes_per_frame[index].append((xyxy + np.array([x0, y0, x0, y0], dtype=xyxy.dtype),
+                                               confidences, class_ids))
+                tile_counts[index] += 1
+        
+        frame_results = []
+        for item, frame_boxes, tile_count in zip(batch, boxes_per_frame, tile_counts):
+            xyxy = np.concatenate([boxes[0] for boxes in frame_boxes])
+            confidences = np.concatenate([boxes[1] for boxes in frame_boxes])
+            class_ids = np.concatenate([boxes[2] for boxes in frame_boxes])
+            # 낮은 신뢰도로 뽑은 전체 프레임 후보는 병합 전에 원래 기준으로 거릅니다
+            selected = confidences >= confidence
+            xyxy, confidences, class_ids = xyxy[selected], confidences[selected], class_ids[selected]
+            keep = self._merge_boxes(xyxy, confidences, class_ids, tiling["nms_threshold"])
+            frame_result = self._build_frame_result(item[0], xyxy[keep], confidences[keep], class_ids[keep], model)
+            frame_result["tiles"] = tile_count
+            frame_results.append(frame_result)
+        return frame_results
+    
+    @staticmethod
+    def filter_detections(detection_results: List[Dict], min_confidence: float) -> List[Dict]:
+        """min_confidence 이상인 탐지만 남긴 새 프레임별 결과를 반환합니다 (원본은 바꾸지 않습니다)."""
+        return [
+            {**frame_result, "detections": [d for d in frame_result["detections"] if d["confidence"] >= min_confidence]}
+            for frame_result in detection_results
+        ]
+    
+    @staticmethod
+    def _tile_starts(length: int, tile_size: int, overlap: float) -> List[int]:
+        """한 축을 tile_size 타일로 겹치게 덮을 시작 위치들을 반환합니다 (양 끝 타일은 가장자리에 맞춤)."""
+        if length <= tile_size:
+            return [0]
+        step = tile_size * (1 - overlap)
+        count = int(np.ceil((length - tile_size) / step)) + 1
+        return np.linspace(0, length - tile_size, count).round().astype(int).tolist()
+    
+    def _tile_grid(self, width: int, height: int, tile_size: int, overlap: float,
+                   max_tiles: int) -> List[Tuple[int, int, int, int]]:
+        """프레임을 덮는 타일 (x0, y0, x1, y1) 목록을 반환합니다.
+        
+        타일 수가 max_tiles를 넘으면 프레임 전체를 덮을 수 있도록 타일을 키웁니다.
+        타일이 프레임만큼 커지면 전체 프레임 탐지와 같으므로 빈 목록을 반환합니다.
+        """
+        size = tile_size
+        while size < max(width, height):
+            xs = self._tile_starts(width, size, overlap)
+            ys = self._tile_starts(height, size, overlap)
+            if len(xs) * len(ys) <= max_tiles:
+                return [(x, y, min(x + size, width), min(y + size, height)) for y in ys for x in xs]
+            size = int(size * 1.25)
+        return []
+    
+    @staticmethod
+    def _merge_boxes(xyxy: np.ndarray, confidences: np.ndarray, class_ids: np.ndarray,
+                     threshold: float) -> np.ndarray:
+        """같은 클래스끼리 신뢰도 순으로 겹치는 박스를 제거하고 남길 인덱스를 반환합니다.
+        
+        타일 경계에서 잘린 박스는 전체 박스와의 IoU가 낮으므로 작은 박스 면적 대비 겹친 비율로 판단합니다.
+        """
+        areas = (xyxy[:, 2] - xyxy[:, 0]).clip(0) * (xyxy[:, 3] - xyxy[:, 1]).clip(0)
+        order = confidences.argsort()[::-1]
+        keep = []
+        while order.size:
+            best, rest = order[0], order[1:]
+            keep.append(best)
+            width = (np.minimum(xyxy[best, 2], xyxy[rest, 2]) - np.maximum(xyxy[best, 0], xyxy[rest, 0])).clip(0)
+            height = (np.minimum(xyxy[best, 3], xyxy[rest, 3]) - np.maximum(xyxy[best, 1], xyxy[rest, 1])).clip(0)
+            smaller = np.minimum(areas[best], areas[rest])
+            overlap = np.divide(width * height, smaller, out=np.zeros_like(smaller), where=smaller > 0)
+            order = rest[(overlap < threshold) | (class_ids[rest] != class_ids[best])]
+        return np.array(keep, dtype=int)
+    
+    @staticmethod
+    def _result_arrays(result) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """YOLO 결과 하나에서 (xyxy, 신뢰도, 클래스 ID) 배열을 꺼냅니다."""
+        boxes = result.boxes
+        if boxes is None or len(boxes) == 0:
+            return np.zeros((0, 4), dtype=np.float32), np.zeros(0, dtype=np.float32), np.zeros(0, dtype=int)
+        boxes = boxes.cpu().numpy()
+        return np.asarray(boxes.xyxy), np.asarray(boxes.conf), np.asarray(boxes.cls).astype(int)
+    
+    def _parse_result(self, timestamp: float, result, model=None, transform=None) -> Dict:
+        """YOLO 결과 하나를 프레임 탐지 결과로 변환합니다.
+        
+        박스 정보는 박스마다 텐서에 접근하지 않고 배열 단위로 한 번에 꺼냅니다.
+        transform(LetterboxTransform)을 주면 박스를 원본 프레임 좌표로 변환합니다.
+        """
+        xyxy, confidences, class_ids = self._result_arrays(result)
+        if transform is not None and len(xyxy):
+            xyxy = transform.to_original(xyxy)
+        return self._build_frame_result(timestamp, xyxy, confidences, class_ids, model)
+    
+    def _build_frame_result(self, timestamp: float, xyxy: np.ndarray, confidences: np.ndarray,
+                            class_ids: np.ndarray, model=None) -> Dict:
+        """박스 배열을 프레임 탐지 결과({"timestamp", "detections"})로 변환합니다."""
+        frame_detections = {
+            "timestamp": timestamp,
+            "detections": []
+        }
+        if len(class_ids) == 0:
+            return frame_detections
+        
+        confidences = confidences.tolist()
+        bboxes = xyxy.tolist()
+        
+        # 브랜드 이름 매핑은 등장한 클래스마다 한 번만 수행합니다
+        brand_names = {class_id: self._map_class_to_brand(class_id, model) for class_id in np.unique(class_ids).tolist()}
+        
+        for class_id, confidence, bbox in zip(class_ids.tolist(), confidences, bboxes):
+            brand_name = brand_names[class_id]
+            if brand_name:
+                frame_detections["detections"].append({
+                    "brand": brand_name,
+                    "confidence": confidence,
+                    "bbox": bbox
+                })
+        
+        return frame_detections
+    
+    def _map_class_to_brand(self, class_id: int, model=None) -> str:
+        """클래스 ID를 브랜드 이름으로 매핑합니다. model을 주면 그 모델의 클래스 정보를 사용합니다."""
+        model = model or self.model
         # 커스텀 모델이 로드된 경우 해당 모델의 클래스 사용
-        if hasattr(self.model, 'names') and class_id in self.model.names:
-            return self.model.names[class_id]
+        if hasattr(model, 'names') and class_id in model.names:
+            return model.names[class_id]
         
         # 기본 브랜드 클래스 매핑 사용
         if class_id in self.brand_classes:
@@ -137,69 +515,220 @@ class LogoDetectionService:
         }
         return demo_mapping.get(class_id, None)
     
-    async def summarize_timeline(self, detection_results: List[Dict]) -> Dict:
+    async def summarize_timeline(self, detection_results: List[Dict], frame_interval: float = None) -> Dict:
         """탐지 결과를 타임라인으로 요약합니다."""
         try:
             loop = asyncio.get_event_loop()
             summary = await loop.run_in_executor(
-                None, self._summarize_timeline_sync, detection_results
+                None, self._summarize_timeline_sync, detection_results, frame_interval
             )
             return summary
         except Exception as e:
             raise Exception(f"타임라인 요약 실패: {str(e)}")
     
-    def _summarize_timeline_sync(self, detection_results: List[Dict]) -> Dict:
-        """동기적으로 타임라인을 요약합니다."""
-        brand_timeline = defaultdict(lambda: {
-            "appearances": 0,
-            "total_seconds": 0,
-            "timestamps": [],
-            "confidence_scores": []
-        })
-        
-        for frame_result in detection_results:
-            timestamp = frame_result["timestamp"]
-            detections = frame_result["detections"]
-            
-            detected_brands = set()
-            
-            for detection in detections:
-                brand = detection["brand"]
-                confidence = detection["confidence"]
-                
-                if brand not in detected_brands:
-                    brand_timeline[brand]["appearances"] += 1
-                    brand_timeline[brand]["total_seconds"] += 1
-                    brand_timeline[brand]["timestamps"].append(timestamp)
-                    brand_timeline[brand]["confidence_scores"].append(confidence)
-                    detected_brands.add(brand)
-        
-        # 평균 신뢰도 계산
-        for brand in brand_timeline:
-            scores = brand_timeline[brand]["confidence_scores"]
-            brand_timeline[brand]["average_confidence"] = sum(scores) / len(scores) if scores else 0
-            brand_timeline[brand]["max_confidence"] = max(scores) if scores else 0
-        
-        return dict(brand_timeline)
+    def _summarize_timeline_sync(self, detection_results: List[Dict], frame_interval: float = None) -> Dict:
+        """동기적으로 타임라인을 요약합니다.
+        
+        appearances는 브랜드가 탐지된 프레임 수입니다. total_seconds는 노출 구간을 합친 실제 화면 노출 시간이며,
+        프레임 하나는 frame_interval초 동안 보인 것으로 봅니다. 탐지에 track_id(TrackingService)가 있으면
+        같은 트랙을 하나의 노출 구간(exposures)으로 묶고, 없으면 프레임마다 하나의 구간으로 계산합니다.
+        탐지는 한 번만 순회해 배열로 펼치고, 브랜드/트랙별 집계는 배열 연산으로 계산합니다.
+        """
+        if frame_interval is None:
+            frame_interval = self._estimate_frame_interval(detection_results)
+        return self._summarize_arrays(self._detections_to_arrays(detection_results), frame_interval)
+    
+    @staticmethod
+    def _detections_to_arrays(detection_results: List[Dict]) -> Dict:
+        """프레임별 탐지 결과를 열 배열로 펼칩니다. 브랜드 번호는 처음 등장한 순서대로 붙입니다."""
+        brand_codes: Dict[str, int] = {}
+        frame_index, brands, confidences, track_ids = [], [], [], []
+        for number, frame_result in enumerate(detection_results):
+            for detection in frame_result["detections"]:
+                frame_index.append(number)
+                brands.append(brand_codes.setdefault(detection["brand"], len(brand_codes)))
+                confidences.append(detection["confidence"])
+                track_ids.append(detection.get("track_id", -1))
+        return {
+            "timestamps": np.array([result["timestamp"] for result in detection_results], dtype=np.float64),
+            "frame_index": np.array(frame_index, dtype=np.int64),
+            "brand": np.array(brands, dtype=np.int64),
+            "confidence": np.array(confidences, dtype=np.float64),
+            "track_id": np.array(track_ids, dtype=np.int64),
+            "brand_names": list(brand_codes)
+        }
+    
+    @staticmethod
+    def _summarize_arrays(arrays: Dict, frame_interval: float) -> Dict:
+        """_detections_to_arrays 결과로 브랜드별 요약을 계산합니다."""
+        brand_names = arrays["brand_names"]
+        brand_count = len(brand_names)
+        if brand_count == 0:
+            return {}
+        frame_index, brand = arrays["frame_index"], arrays["brand"]
+        confidence, track_id = arrays["confidence"], arrays["track_id"]
+        detection_times = arrays["timestamps"][frame_index]
+        
+        # 프레임마다 브랜드별 첫 탐지만 등장 횟수/시각/신뢰도 목록에 넣습니다
+        frame_brand = frame_index * brand_count + brand
+        _, first = np.unique(frame_brand, return_index=True)
+        first.sort()
+        first_brand = brand[first]
+        appearances = np.bincount(first_brand, minlength=brand_count)
+        by_brand = first[np.argsort(first_brand, kind="stable")]
+        split_at = np.cumsum(appearances)[:-1]
+        brand_timestamps = np.split(detection_times[by_brand], split_at)
+        brand_scores = np.split(confidence[by_brand], split_at)
+        
+        # 노출 구간: 트랙별로 묶고, 트랙이 없는 탐지는 (프레임, 브랜드)마다 하나의 구간으로 봅니다
+        exposure_key = np.where(track_id >= 0, track_id, -(frame_brand + 1))
+        _, exposure_of = np.unique(exposure_key, return_inverse=True)
+        order = np.argsort(exposure_of, kind="stable")
+        bounds = np.flatnonzero(np.r_[True, np.diff(exposure_of[order]) != 0])
+        starts = np.minimum.reduceat(detection_times[order], bounds)
+        lasts = np.maximum.reduceat(detection_times[order], bounds)
+        frames = np.diff(np.r_[bounds, len(order)])
+        max_scores = np.maximum.reduceat(confidence[order], bounds)
+        # 구간을 처음 본 탐지 순서 (시작 시각이 같을 때 정렬 기준)
+        first_seen = order[bounds]
+        exposure_brand = brand[first_seen]
+        exposure_track = track_id[first_seen]
+        ends = lasts + frame_interval
+        
+        # 브랜드별 구간 합집합: 브랜드마다 시간축을 떼어 놓고 누적 최댓값으로 겹치는 구간을 합칩니다
+        rounded_starts = np.round(starts, 3)
+        sorted_exposures = np.lexsort((first_seen, rounded_starts, exposure_brand))
+        rounded_starts = rounded_starts[sorted_exposures]
+        rounded_ends = np.round(ends, 3)[sorted_exposures]
+        sorted_brands = exposure_brand[sorted_exposures]
+        offset = sorted_brands * (rounded_ends.max() - rounded_starts.min() + 1.0)
+        shifted_starts, shifted_ends = rounded_starts + offset, rounded_ends + offset
+        reach = np.maximum.accumulate(shifted_ends)
+        new_segment = np.r_[True, shifted_starts[1:] > reach[:-1]]
+        segment_starts = np.flatnonzero(new_segment)
+        segment_lengths = np.maximum.reduceat(shifted_ends, segment_starts) - shifted_starts[segment_starts]
+        exposure_seconds = np.bincount(sorted_brands[segment_starts], weights=segment_lengths, minlength=brand_count)
+        
+        exposure_lists: List[List[Dict]] = [[] for _ in range(brand_count)]
+        for code, start, end, duration, count, score, track in zip(
+                sorted_brands.tolist(), rounded_starts.tolist(), rounded_ends.tolist(),
+                np.round((ends - starts)[sorted_exposures], 3).tolist(), frames[sorted_exposures].tolist(),
+                max_scores[sorted_exposures].tolist(), exposure_track[sorted_exposures].tolist()):
+            exposure_lists[code].append({
+                "track_id": track if track >= 0 else None,
+                "start": start,
+                "end": end,
+                "duration": duration,
+                "frames": count,
+                "max_confidence": score
+            })
+        
+        score_sums = np.bincount(first_brand, weights=confidence[first], minlength=brand_count)
+        brand_timeline = {}
+        for code, brand_name in enumerate(brand_names):
+            scores = brand_scores[code]
+            brand_timeline[brand_name] = {
+                "appearances": int(appearances[code]),
+                "total_seconds": round(float(exposure_seconds[code]), 3),
+                "timestamps": brand_timestamps[code].tolist(),
+                "confidence_scores": scores.tolist(),
+                "average_confidence": float(score_sums[code] / appearances[code]),
+                "max_confidence": float(scores.max()),
+                "exposures": exposure_lists[code],
+                "exposure_count": len(exposure_lists[code])
+            }
+        return brand_timeline
+    
+    @staticmethod
+    def _estimate_frame_interval(detection_results: List[Dict]) -> float:
+        """프레임 간격을 모를 때 결과의 시각 간격 중앙값으로 추정합니다 (알 수 없으면 1초)."""
+        timestamps = np.unique([result["timestamp"] for result in detection_results])
+        gaps = np.diff(timestamps)
+        gaps = gaps[gaps > 0]
+        return float(np.median(gaps)) if len(gaps) else 1.0
     
     async def get_model_status(self) -> Dict:
         """모델 상태를 반환합니다."""
         return {
             "model_loaded": self.model is not None,
-            "model_path": self.model_path,
+            "load_state": self.load_state,
+            "load_seconds": self.load_seconds,
+            "model_version": self.model_version,
+            "loading_version": self.loading_version,
+            "last_load_error": self.last_load_error,
+            "model_path": self.get_backend_model_path(),
+            "inference_backend": self.inference_backend,
+            "model_precision": self.model_precision,
+            "image_size": self.image_size,
             "confidence_threshold": self.confidence_threshold,
-            "supported_brands": list(self.brand_classes.values())
+            "supported_brands": list(self.brand_classes.values()),
+            "detector_pool": self.pool.get_stats() if self.pool else None
         }
     
+    def get_model_identity(self) -> str:
+        """캐시 키 등에 사용할 모델 식별 문자열 (버전, 경로, 크기, 수정 시각, 입력 크기)을 반환합니다."""
+        model_path = self.get_backend_model_path()
+        if os.path.exists(model_path):
+            stat = os.stat(model_path)
+            return f"{self.model_version}:{model_path}:{stat.st_size}:{int(stat.st_mtime)}:{self.image_size}"
+        return f"{self.model_version}:yolov8n.pt:{self.image_size}"
+    
     def set_confidence_threshold(self, threshold: float):
         """신뢰도 임계값을 설정합니다."""
         self.confidence_threshold = max(0.1, min(1.0, threshold))
     
-    def set_model_path(self, model_path: str):
-        """모델 경로를 설정하고 모델을 다시 로드합니다."""
-        self.model_path = model_path
-        self._load_model()
-        print(f"🔄 모델 경로가 변경되었습니다: {model_path}")
+    def set_batch_size(self, batch_size: int):
+        """한 번의 모델 호출에 묶어서 보낼 프레임 수를 설정합니다."""
+        self.batch_size = max(1, int(batch_size))
+    
+    async def set_inference_backend(self, backend: str, precision: str = "fp32"):
+        """추론 백엔드(pytorch/onnx/openvino)와 정밀도(fp32/int8)를 바꿉니다.
+        
+        새 모델은 백그라운드에서 로드/예열하고, 준비가 끝나면 교체합니다 (그동안은 기존 모델 사용).
+        """
+        if backend not in SUPPORTED_BACKENDS:
+            raise Exception(f"지원하지 않는 추론 백엔드입니다: {backend}")
+        if precision not in SUPPORTED_PRECISIONS:
+            raise Exception(f"지원하지 않는 정밀도입니다: {precision}")
+        config = self._resolve_config(self.model_path, backend, precision)
+        await self._swap_to_config(config, f"추론 백엔드 {backend} ({precision})")
+        print(f"🔄 추론 백엔드가 변경되었습니다: {backend} ({precision}, 버전 {config['version']})")
+    
+    async def set_model_path(self, model_path: str):
+        """모델 경로를 바꿉니다. 새 모델은 백그라운드에서 로드/예열하고, 준비가 끝나면 교체합니다."""
+        config = self._resolve_config(model_path, self.inference_backend, self.model_precision)
+        await self._swap_to_config(config, f"모델 {model_path}")
+        print(f"🔄 모델 경로가 변경되었습니다: {model_path} (버전 {config['version']})")
+    
+    def _resolve_config(self, model_path: str, backend: str, precision: str) -> Dict:
+        """경로/백엔드/정밀도에 맞는 레지스트리 버전을 찾습니다.
+        
+        등록된 버전이 없으면 모델 파일 이름, 백엔드, 정밀도, 입력 크기, 수정 시각으로 새 버전 이름을 만듭니다
+        (예: best_1280-onnx-int8-1280-1718000000). 이전 버전 이름을 그대로 쓰면 다른 모델의 결과가 같은 버전으로 기록됩니다.
+        """
+        config = {"path": model_path, "backend": backend, "precision": precision, "image_size": self.image_size}
+        entry = self.model_registry.find(model_path, backend, precision, self.image_size) if self.model_registry else None
+        if entry:
+            return entry
+        
+        stem = os.path.splitext(os.path.basename(model_path.rstrip("/\\")))[0]
+        version = f"{stem}-{backend}-{precision}-{self.image_size}"
+        backend_model_path = self.get_backend_model_path({**config, "version": version})
+        if os.path.exists(backend_model_path):
+            version += f"-{int(os.stat(backend_model_path).st_mtime)}"
+        return {**config, "version": version}
+    
+    async def _swap_to_config(self, config: Dict, label: str):
+        """config로 모델을 교체하고, 레지스트리가 있으면 해당 버전을 (없으면 등록한 뒤) 사용 중인 버전으로 기록합니다."""
+        await self._swap_model(config, label)
+        if self.model_registry is None:
+            return
+        if self.model_registry.get(config["version"]) is None:
+            self.model_registry.register(
+                config["path"], config["version"], config["backend"],
+                config["precision"], config["image_size"], label
+            )
+        self.model_registry.set_active(config["version"])
     
     def get_available_models(self) -> List[str]:
         """models 디렉토리에서 사용 가능한 모델 파일들을 반환합니다."""
@@ -209,7 +738,7 @@ class LogoDetectionService:
         
         model_files = []
         for file in os.listdir(models_dir):
-            if file.endswith('.pt'):
+            if file.endswith(('.pt', '.onnx', '_openvino_model')):
                 model_files.append(os.path.join(models_dir, file))
         
         return model_files 
\ No newline at end of file
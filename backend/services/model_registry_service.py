@@ -0,0 +1,103 @@
+import json
+import os
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from .logo_detection_service import SUPPORTED_BACKENDS, SUPPORTED_PRECISIONS
+
+REGISTRY_FILE = os.path.join("models", "model_registry.json")
+
+
+class ModelRegistryService:
+    """탐지 모델 버전 목록과 현재 사용 중인 버전을 models/model_registry.json에 관리합니다.
+
+    버전마다 모델 경로, 추론 백엔드, 정밀도, 입력 크기를 기록하며,
+    분석 결과에는 결과를 만든 모델의 버전 이름이 함께 저장됩니다.
+    """
+
+    def __init__(self):
+        self.registry_file = REGISTRY_FILE
+        self._lock = threading.Lock()
+
+    def _load(self) -> Dict:
+        try:
+            if os.path.exists(self.registry_file):
+                with open(self.registry_file, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+        except Exception as e:
+            print(f"모델 레지스트리 로드 오류: {str(e)}")
+        return {"active_version": None, "versions": {}}
+
+    def _save(self, data: Dict):
+        os.makedirs(os.path.dirname(self.registry_file), exist_ok=True)
+        temp_path = f"{self.registry_file}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+        os.replace(temp_path, self.registry_file)
+
+    def register(self, model_path: str, version: str = None, backend: str = "pytorch",
+                 precision: str = "fp32", image_size: int = 1280, description: str = "") -> Dict:
+        """새 모델 버전을 등록합니다. version을 생략하면 v1, v2, ... 순서로 이름을 붙입니다."""
+        if backend not in SUPPORTED_BACKENDS:
+            raise Exception(f"지원하지 않는 추론 백엔드입니다: {backend} (지원: {', '.join(SUPPORTED_BACKENDS)})")
+        if precision not in SUPPORTED_PRECISIONS:
+            raise Exception(f"지원하지 않는 정밀도입니다: {precision} (지원: {', '.join(SUPPORTED_PRECISIONS)})")
+        with self._lock:
+            data = self._load()
+            versions = data["versions"]
+            if version is None:
+                version = f"v{len(versions) + 1}"
+                while version in versions:
+                    version = f"v{int(version[1:]) + 1}"
+            if version in versions:
+                raise Exception(f"이미 등록된 모델 버전입니다: {version}")
+
+            entry = {
+                "version": version,
+                "path": model_path,
+                "backend": backend,
+                "precision": precision,
+                "image_size": int(image_size),
+                "description": description,
+                "registered_at": datetime.now().isoformat()
+            }
+            versions[version] = entry
+            self._save(data)
+            print(f"📦 모델 버전 등록: {version} ({model_path}, {backend}, {precision})")
+            return entry
+
+    def get(self, version: str) -> Optional[Dict]:
+        return self._load()["versions"].get(version)
+
+    def find(self, model_path: str, backend: str, precision: str, image_size: int) -> Optional[Dict]:
+        """같은 모델 경로, 백엔드, 정밀도, 입력 크기로 등록된 버전을 찾습니다. 없으면 None을 반환합니다."""
+        for entry in self._load()["versions"].values():
+            if (os.path.normpath(entry["path"]) == os.path.normpath(model_path)
+                    and entry.get("backend", "pytorch") == backend
+                    and entry.get("precision", "fp32") == precision
+                    and int(entry.get("image_size", image_size)) == int(image_size)):
+                return entry
+        return None
+
+    def get_active(self) -> Optional[Dict]:
+        """현재 사용 중인 버전 정보를 반환합니다. 등록된 버전이 없으면 None을 반환합니다."""
+        data = self._load()
+        return data["versions"].get(data.get("active_version"))
+
+    def set_active(self, version: str):
+        """사용 중인 버전을 기록합니다. 실제 모델 교체는 LogoDetectionService가 담당합니다."""
+        with self._lock:
+            data = self._load()
+            if version not in data["versions"]:
+                raise Exception(f"등록되지 않은 모델 버전입니다: {version}")
+            data["active_version"] = version
+            self._save(data)
+
+    def list_versions(self) -> List[Dict]:
+        data = self._load()
+        active_version = data.get("active_version")
+        return [
+            {**entry, "active": version == active_version}
+            for version, entry in sorted(data["versions"].items(), key=lambda item: item[1].get("registered_at", ""))
+        ]
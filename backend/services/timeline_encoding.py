@@ -0,0 +1,111 @@
+from typing import Dict, List, Optional, Tuple
+
+# brand_analysis 타임라인 표현 방식
+#   expanded: 브랜드마다 등장한 프레임별 timestamps / confidence_scores 목록
+#   compact:  연속으로 등장한 프레임을 [시작, 끝, 프레임 수, 평균 신뢰도] 구간(intervals)으로 묶은 목록
+TIMELINE_FORMATS = ("expanded", "compact")
+
+# 연속 구간 안의 프레임 간격 차이 허용치 (초, 시각을 소수점 3자리로 반올림하며 생기는 오차)
+STEP_TOLERANCE = 0.0015
+
+
+def encode_intervals(timestamps: List[float], confidence_scores: List[float],
+                     frame_interval: Optional[float] = None) -> List[List]:
+    """프레임별 등장 시각/신뢰도를 [시작, 끝, 프레임 수, 평균 신뢰도] 구간 목록으로 묶습니다.
+
+    간격이 일정하게 이어지는 프레임만 한 구간으로 묶으므로, 구간의 시작/끝/프레임 수로
+    원래 시각을 (반올림 오차 안에서) 다시 계산할 수 있습니다. frame_interval의 1.5배보다
+    멀리 떨어진 프레임은 새 구간으로 시작합니다.
+    """
+    if frame_interval is None:
+        frame_interval = _estimate_step(timestamps)
+    max_gap = frame_interval * 1.5
+
+    intervals = []
+    run_start = 0
+    for index in range(1, len(timestamps) + 1):
+        if index < len(timestamps):
+            gap = timestamps[index] - timestamps[index - 1]
+            step = timestamps[run_start + 1] - timestamps[run_start] if index - run_start > 1 else gap
+            if 0 < gap <= max_gap and abs(gap - step) <= STEP_TOLERANCE:
+                continue
+        scores = confidence_scores[run_start:index]
+        intervals.append([
+            round(timestamps[run_start], 3),
+            round(timestamps[index - 1], 3),
+            index - run_start,
+            round(sum(scores) / len(scores), 4) if scores else 0
+        ])
+        run_start = index
+    return intervals
+
+
+def decode_intervals(intervals: List[List]) -> Tuple[List[float], List[float]]:
+    """구간 목록을 프레임별 시각/신뢰도 목록으로 펼칩니다. 구간 안의 신뢰도는 구간 평균으로 채웁니다."""
+    timestamps, confidence_scores = [], []
+    for start, end, frame_count, mean_confidence in intervals:
+        step = (end - start) / (frame_count - 1) if frame_count > 1 else 0
+        timestamps.extend(round(start + step * index, 3) for index in range(frame_count))
+        confidence_scores.extend([mean_confidence] * frame_count)
+    return timestamps, confidence_scores
+
+
+def compact_brand_analysis(brand_analysis: Dict, frame_interval: Optional[float] = None) -> Dict:
+    """brand_analysis의 timestamps / confidence_scores를 intervals로 바꿉니다.
+
+    appearances, total_seconds, average_confidence 등 요약 값과 exposures는 그대로 둡니다.
+    이미 compact 형식인 브랜드는 그대로 반환합니다.
+    """
+    compacted = {}
+    for brand, brand_data in (brand_analysis or {}).items():
+        if "timestamps" not in brand_data:
+            compacted[brand] = brand_data
+            continue
+        brand_data = dict(brand_data)
+        timestamps = brand_data.pop("timestamps")
+        confidence_scores = brand_data.pop("confidence_scores", [])
+        brand_data["intervals"] = encode_intervals(timestamps, confidence_scores, frame_interval)
+        compacted[brand] = brand_data
+    return compacted
+
+
+def expand_brand_analysis(brand_analysis: Dict) -> Dict:
+    """compact 형식의 intervals를 timestamps / confidence_scores로 되돌립니다."""
+    expanded = {}
+    for brand, brand_data in (brand_analysis or {}).items():
+        if "intervals" not in brand_data:
+            expanded[brand] = brand_data
+            continue
+        brand_data = dict(brand_data)
+        timestamps, confidence_scores = decode_intervals(brand_data.pop("intervals"))
+        brand_data["timestamps"] = timestamps
+        brand_data["confidence_scores"] = confidence_scores
+        expanded[brand] = brand_data
+    return expanded
+
+
+def format_brand_analysis(brand_analysis: Dict, timeline_format: str,
+                          frame_interval: Optional[float] = None) -> Dict:
+    """요청한 표현 방식(TIMELINE_FORMATS)으로 brand_analysis를 변환합니다."""
+    if timeline_format == "compact":
+        return compact_brand_analysis(brand_analysis, frame_interval)
+    if timeline_format == "expanded":
+        return expand_brand_analysis(brand_analysis)
+    raise ValueError(f"지원하지 않는 타임라인 형식입니다: {timeline_format} (가능한 값: {', '.join(TIMELINE_FORMATS)})")
+
+
+def format_analysis(analysis: Dict, timeline_format: str) -> Dict:
+    """분석 결과(brand_analysis, analysis_settings 포함)의 타임라인 표현 방식을 바꾼 사본을 반환합니다."""
+    if not analysis or "brand_analysis" not in analysis:
+        return analysis
+    frame_interval = (analysis.get("analysis_settings") or {}).get("frame_interval")
+    return {
+        **analysis,
+        "brand_analysis": format_brand_analysis(analysis["brand_analysis"], timeline_format, frame_interval)
+    }
+
+
+def _estimate_step(timestamps: List[float]) -> float:
+    """프레임 간격을 모를 때 가장 작은 양수 간격을 사용합니다 (알 수 없으면 1초)."""
+    gaps = [b - a for a, b in zip(timestamps, timestamps[1:]) if b - a > 0]
+    return min(gaps) if gaps else 1.0
@@ -0,0 +1,224 @@
+from __future__ import annotations
+
+from typing import Dict, List, Tuple
+
+from .lazy_modules import lazy_module
+
+np = lazy_module("numpy")
+
+
+class Track:
+    """같은 로고가 연속해서 화면에 나온 하나의 노출 구간입니다."""
+
+    def __init__(self, track_id: int, brand: str, timestamp: float, bbox: List[float]):
+        self.track_id = track_id
+        self.brand = brand
+        self.start = timestamp
+        self.last_seen = timestamp
+        self.bbox = list(bbox)
+        # 초당 박스 좌표 변화량 (다음 프레임 위치 예측용)
+        self.velocity = [0.0, 0.0, 0.0, 0.0]
+        self.frames = 1
+
+    def predict(self, timestamp: float) -> List[float]:
+        """timestamp 시각의 박스 위치를 등속 운동으로 예측합니다."""
+        elapsed = timestamp - self.last_seen
+        return [value + speed * elapsed for value, speed in zip(self.bbox, self.velocity)]
+
+    def update(self, timestamp: float, bbox: List[float]):
+        elapsed = timestamp - self.last_seen
+        if elapsed > 0:
+            speed = [(new - old) / elapsed for new, old in zip(bbox, self.bbox)]
+            # 탐지 박스가 흔들려도 예측이 튀지 않도록 이전 속도와 섞습니다
+            self.velocity = [(old + new) / 2 for old, new in zip(self.velocity, speed)]
+        self.bbox = list(bbox)
+        self.last_seen = timestamp
+        self.frames += 1
+
+
+class ByteTracker:
+    """ByteTrack 방식으로 프레임 사이의 탐지를 트랙으로 잇습니다.
+
+    1차로 신뢰도가 높은 탐지를 모든 트랙(놓친 트랙 포함)과 IoU로 짝짓고,
+    2차로 남은 낮은 신뢰도 탐지를 직전 프레임에 보였던 트랙과 다시 짝지어
+    가려지거나 흐려져 점수가 떨어진 로고도 같은 트랙으로 이어 붙입니다.
+    """
+
+    def __init__(self, high_confidence: float, match_iou: float, low_match_iou: float,
+                 max_lost_seconds: float, new_track_confidence: float = 0.0):
+        self.high_confidence = high_confidence
+        self.match_iou = match_iou
+        self.low_match_iou = low_match_iou
+        self.max_lost_seconds = max_lost_seconds
+        self.new_track_confidence = new_track_confidence
+        self.active: List[Track] = []
+        self.finished: List[Track] = []
+        self._next_id = 1
+        self._previous_timestamp = None
+
+    def update(self, timestamp: float, detections: List[Dict]):
+        """한 프레임의 탐지를 트랙에 연결하고 각 탐지에 track_id를 기록합니다."""
+        for detection in detections:
+            detection.pop("track_id", None)
+        alive = []
+        for track in self.active:
+            if timestamp - track.last_seen > self.max_lost_seconds:
+                self.finished.append(track)
+            else:
+                alive.append(track)
+        self.active = alive
+
+        high = [d for d in detections if d["confidence"] >= self.high_confidence]
+        low = [d for d in detections if d["confidence"] < self.high_confidence]
+
+        unmatched_tracks, unmatched_high = self._associate(self.active, high, timestamp, self.match_iou)
+        recent = [track for track in unmatched_tracks if track.last_seen == self._previous_timestamp]
+        self._associate(recent, low, timestamp, self.low_match_iou)
+
+        for detection in unmatched_high + [d for d in low if "track_id" not in d]:
+            if detection["confidence"] < self.new_track_confidence:
+                continue
+            track = Track(self._next_id, detection["brand"], timestamp, detection["bbox"])
+            self._next_id += 1
+            self.active.append(track)
+            detection["track_id"] = track.track_id
+
+        self._previous_timestamp = timestamp
+
+    def finish(self) -> List[Track]:
+        """남은 트랙을 모두 종료하고 시작 시각 순으로 반환합니다."""
+        self.finished.extend(self.active)
+        self.active = []
+        return sorted(self.finished, key=lambda track: (track.start, track.track_id))
+
+    @staticmethod
+    def _associate(tracks: List[Track], detections: List[Dict], timestamp: float,
+                   min_iou: float) -> Tuple[List[Track], List[Dict]]:
+        """같은 브랜드끼리 IoU가 큰 쌍부터 짝짓고 (짝 없는 트랙, 짝 없는 탐지)를 반환합니다."""
+        if not tracks or not detections:
+            return list(tracks), list(detections)
+
+        predicted = np.array([track.predict(timestamp) for track in tracks], dtype=float)
+        boxes = np.array([detection["bbox"] for detection in detections], dtype=float)
+        iou = box_iou_matrix(predicted, boxes)
+        same_brand = np.array([[track.brand == d["brand"] for d in detections] for track in tracks])
+        iou[~same_brand] = 0.0
+
+        matched_tracks, matched_detections = set(), set()
+        for flat_index in np.argsort(iou, axis=None)[::-1]:
+            track_index, detection_index = np.unravel_index(flat_index, iou.shape)
+            if iou[track_index, detection_index] < min_iou:
+                break
+            if track_index in matched_tracks or detection_index in matched_detections:
+                continue
+            matched_tracks.add(track_index)
+            matched_detections.add(detection_index)
+            tracks[track_index].update(timestamp, detections[detection_index]["bbox"])
+            detections[detection_index]["track_id"] = tracks[track_index].track_id
+
+        return (
+            [track for index, track in enumerate(tracks) if index not in matched_tracks],
+            [detection for index, detection in enumerate(detections) if index not in matched_detections]
+        )
+
+
+def box_iou_matrix(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """(N, 4)와 (M, 4) xyxy 박스 사이의 (N, M) IoU 행렬을 계산합니다."""
+    x1 = np.maximum(a[:, None, 0], b[None, :, 0])
+    y1 = np.maximum(a[:, None, 1], b[None, :, 1])
+    x2 = np.minimum(a[:, None, 2], b[None, :, 2])
+    y2 = np.minimum(a[:, None, 3], b[None, :, 3])
+    intersection = (x2 - x1).clip(0) * (y2 - y1).clip(0)
+    area_a = (a[:, 2] - a[:, 0]).clip(0) * (a[:, 3] - a[:, 1]).clip(0)
+    area_b = (b[:, 2] - b[:, 0]).clip(0) * (b[:, 3] - b[:, 1]).clip(0)
+    union = area_a[:, None] + area_b[None, :] - intersection
+    return np.divide(intersection, union, out=np.zeros_like(intersection), where=union > 0)
+
+
+class TrackingService:
+    """프레임별 탐지 결과를 로고 노출 트랙으로 묶습니다.
+
+    각 탐지에 track_id를 붙여 두면 요약 단계에서 트랙별 시작/끝/노출 시간을 계산할 수 있습니다.
+    stride > 1로 분석한 결과(k번째 프레임만 추론)는 양쪽 추론 프레임에서 같은 트랙으로 이어진
+    로고의 위치를 선형 보간해 건너뛴 프레임을 채웁니다.
+    """
+
+    def __init__(self):
+        # 이 신뢰도 이상인 탐지로 1차 연결, 나머지는 직전 프레임 트랙과만 2차 연결
+        self.high_confidence = 0.6
+        # 1차/2차 연결에 필요한 최소 IoU (예측 위치 기준)
+        self.match_iou = 0.3
+        self.low_match_iou = 0.5
+        # 트랙을 놓친 뒤 다시 이어 붙일 수 있는 최대 시간 (초, 최소 2개 추론 간격)
+        self.max_lost_seconds = 1.0
+        # 이 신뢰도 이상인 미연결 탐지만 새 트랙을 시작합니다 (기본값: 모델 기준을 통과한 모든 탐지)
+        self.new_track_confidence = 0.0
+
+    def create_tracker(self, sample_interval: float) -> ByteTracker:
+        return ByteTracker(
+            self.high_confidence,
+            self.match_iou,
+            self.low_match_iou,
+            max(self.max_lost_seconds, sample_interval * 2),
+            self.new_track_confidence
+        )
+
+    def track(self, detection_results: List[Dict], frame_interval: float,
+              stride: int = 1) -> Tuple[List[Dict], Dict]:
+        """탐지 결과에 track_id를 붙이고, stride > 1이면 건너뛴 프레임을 보간해 채웁니다.
+
+        Returns:
+            (시각 순으로 정렬된 프레임별 결과, 트래킹 통계)
+        """
+        stride = max(1, int(stride))
+        sample_interval = frame_interval * stride
+        results = sorted(detection_results, key=lambda r: r["timestamp"])
+
+        tracker = self.create_tracker(sample_interval)
+        for frame_result in results:
+            tracker.update(frame_result["timestamp"], frame_result["detections"])
+        tracks = tracker.finish()
+
+        propagated = self._interpolate(results, frame_interval, sample_interval) if stride > 1 else []
+        if propagated:
+            results = sorted(results + propagated, key=lambda r: r["timestamp"])
+
+        stats = {
+            "stride": stride,
+            "tracks": len(tracks),
+            "frames_propagated": len(propagated)
+        }
+        print(f"🧵 트래킹 완료: 트랙 {len(tracks)}개" +
+              (f", 보간 프레임 {len(propagated)}개 (추론 간격 {stride}프레임)" if stride > 1 else ""))
+        return results, stats
+
+    def _interpolate(self, results: List[Dict], frame_interval: float, sample_interval: float) -> List[Dict]:
+        """이웃한 추론 프레임 사이의 건너뛴 시각에 두 프레임 모두에 있는 트랙의 박스를 보간해 넣습니다."""
+        propagated = []
+        for previous, following in zip(results, results[1:]):
+            gap = following["timestamp"] - previous["timestamp"]
+            # 성긴 탐색 구간처럼 추론 간격보다 멀리 떨어진 프레임 사이는 채우지 않습니다
+            if gap <= frame_interval * 1.5 or gap > sample_interval * 1.5:
+                continue
+
+            start_boxes = {d["track_id"]: d for d in previous["detections"] if "track_id" in d}
+            end_boxes = {d["track_id"]: d for d in following["detections"] if "track_id" in d}
+            shared = [track_id for track_id in start_boxes if track_id in end_boxes]
+
+            step = 1
+            while previous["timestamp"] + step * frame_interval < following["timestamp"] - frame_interval / 2:
+                timestamp = previous["timestamp"] + step * frame_interval
+                ratio = (timestamp - previous["timestamp"]) / gap
+                detections = []
+                for track_id in shared:
+                    start, end = start_boxes[track_id], end_boxes[track_id]
+                    detections.append({
+                        "brand": start["brand"],
+                        "confidence": min(start["confidence"], end["confidence"]),
+                        "bbox": [a + (b - a) * ratio for a, b in zip(start["bbox"], end["bbox"])],
+                        "track_id": track_id,
+                        "propagated": True
+                    })
+                propagated.append({"timestamp": round(timestamp, 3), "detections": detections, "propagated": True})
+                step += 1
+        return propagated
@@ -1,12 +1,175 @@
-import cv2
+from __future__ import annotations
+
 import asyncio
-import numpy as np
-from typing import List, Tuple, Dict
+import collections
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Tuple, Dict, Iterator, Optional
 import os
 
+from .lazy_modules import lazy_module
+
+# 무거운 모듈은 영상을 처음 열 때 import합니다
+cv2 = lazy_module("cv2")
+np = lazy_module("numpy")
+
+
+def _decode_chunk_worker(settings: Dict, video_path: str, frame_interval: float, strategy: str,
+                         start: float, end: float, letterbox_size: int = None) -> List[Tuple]:
+    """별도 프로세스에서 부모 서비스와 같은 설정으로 [start, end] 구간의 프레임을 추출해 반환합니다.
+    
+    letterbox_size를 주면 원본 대신 모델 입력 크기로 줄인 (timestamp, 이미지, 좌표 변환)을 반환해
+    프로세스 사이로 복사하는 양을 줄입니다. 여백은 받는 쪽(FrameLetterboxer.place)에서 채웁니다.
+    """
+    service = VideoProcessingService()
+    service.__dict__.update(settings)
+    frames = service.iter_frames(video_path, frame_interval, strategy=strategy, time_ranges=[(start, end)])
+    if not letterbox_size:
+        return list(frames)
+    letterboxer = FrameLetterboxer(letterbox_size, 0)
+    return [(timestamp, *letterboxer.shrink(frame)) for timestamp, frame in frames]
+
+
+class LetterboxTransform:
+    """레터박스 이미지 좌표를 원본 프레임 좌표로 되돌리는 데 필요한 값입니다."""
+
+    def __init__(self, scale: float, pad_x: int, pad_y: int, width: int, height: int):
+        self.scale = scale
+        self.pad_x = pad_x
+        self.pad_y = pad_y
+        # 원본 프레임 크기
+        self.width = width
+        self.height = height
+
+    def to_original(self, xyxy: np.ndarray) -> np.ndarray:
+        """(N, 4) xyxy 박스 배열을 원본 프레임 좌표로 변환합니다."""
+        boxes = (xyxy - np.array([self.pad_x, self.pad_y, self.pad_x, self.pad_y], dtype=xyxy.dtype)) / self.scale
+        boxes[:, [0, 2]] = boxes[:, [0, 2]].clip(0, self.width)
+        boxes[:, [1, 3]] = boxes[:, [1, 3]].clip(0, self.height)
+        return boxes
+
+    def content_size(self) -> Tuple[int, int]:
+        """레터박스 이미지 안에서 프레임이 차지하는 (너비, 높이)."""
+        return int(round(self.width * self.scale)), int(round(self.height * self.scale))
+
+    def content(self, image: np.ndarray) -> np.ndarray:
+        """레터박스 이미지에서 여백을 뺀 프레임 부분을 반환합니다."""
+        width, height = self.content_size()
+        return image[self.pad_y:self.pad_y + height, self.pad_x:self.pad_x + width]
+
+
+class FrameLetterboxer:
+    """디코딩 직후 프레임을 모델 입력 크기(image_size × image_size)로 한 번만 줄이고 여백을 채웁니다.
+
+    결과는 재사용하는 버퍼에 쓰므로 큐에 쌓인 프레임마다 원본 크기 배열을 들고 있지 않고,
+    모델 호출 안에서 다시 크기를 조정하지도 않습니다. 이미 입력 크기 안에 들어가는 작은
+    프레임은 메모리가 오히려 늘어나므로 그대로 둡니다 (모델이 기존처럼 처리).
+
+    추론이 끝난 프레임은 release로 버퍼를 돌려줘야 다음 프레임이 재사용합니다.
+    버퍼가 capacity개를 넘게 필요하면 기다리지 않고 임시 버퍼를 만듭니다.
+    """
+
+    # Ultralytics 레터박스와 같은 여백 색
+    pad_value = 114
+
+    def __init__(self, image_size: int, capacity: int):
+        self.image_size = image_size
+        self.capacity = capacity
+        self._free = []
+        self._owned = set()
+        self._lock = threading.Lock()
+
+    def _transform(self, frame: np.ndarray) -> Optional[LetterboxTransform]:
+        """Ultralytics LetterBox와 같은 방식으로 크기와 여백을 계산합니다. 이미 입력 크기 안이면 None입니다."""
+        height, width = frame.shape[:2]
+        size = self.image_size
+        if width <= size and height <= size:
+            return None
+        scale = min(size / height, size / width)
+        new_width, new_height = int(round(width * scale)), int(round(height * scale))
+        left = int(round((size - new_width) / 2 - 0.1))
+        top = int(round((size - new_height) / 2 - 0.1))
+        return LetterboxTransform(scale, left, top, width, height)
+
+    def letterbox(self, frame: np.ndarray) -> Tuple[np.ndarray, LetterboxTransform]:
+        """(레터박스 이미지, 좌표 변환)을 반환합니다. 크기를 바꾸지 않은 프레임은 변환이 None입니다."""
+        transform = self._transform(frame)
+        if transform is None:
+            return frame, None
+        buffer = self._acquire(frame.dtype, frame.shape[2:])
+        cv2.resize(frame, transform.content_size(), dst=self._fill_padding(buffer, transform),
+                   interpolation=cv2.INTER_LINEAR)
+        return buffer, transform
+
+    def shrink(self, frame: np.ndarray) -> Tuple[np.ndarray, Optional[LetterboxTransform]]:
+        """letterbox와 같은 크기로 줄이되 여백 없이 새 배열로 반환합니다 (다른 프로세스로 보낼 때 사용)."""
+        transform = self._transform(frame)
+        if transform is None:
+            return frame, None
+        return cv2.resize(frame, transform.content_size(), interpolation=cv2.INTER_LINEAR), transform
+
+    def place(self, image: np.ndarray, transform: Optional[LetterboxTransform]) -> np.ndarray:
+        """shrink로 줄인 이미지를 재사용 버퍼에 옮기고 여백을 채워 letterbox와 같은 결과를 만듭니다."""
+        if transform is None:
+            return image
+        buffer = self._acquire(image.dtype, image.shape[2:])
+        self._fill_padding(buffer, transform)[...] = image
+        return buffer
+
+    def _fill_padding(self, buffer: np.ndarray, transform: LetterboxTransform) -> np.ndarray:
+        """버퍼의 여백 부분만 다시 채우고 (이전 프레임과 배치가 다를 수 있음) 프레임이 들어갈 부분을 반환합니다."""
+        content = transform.content(buffer)
+        top, left = transform.pad_y, transform.pad_x
+        bottom, right = top + content.shape[0], left + content.shape[1]
+        buffer[:top] = self.pad_value
+        buffer[bottom:] = self.pad_value
+        buffer[top:bottom, :left] = self.pad_value
+        buffer[top:bottom, right:] = self.pad_value
+        return content
+
+    def release(self, image: np.ndarray):
+        """추론이 끝난 이미지의 버퍼를 돌려줍니다. 이 객체가 만든 버퍼가 아니면 무시합니다."""
+        with self._lock:
+            if id(image) in self._owned:
+                self._free.append(image)
+
+    def _acquire(self, dtype, channels: Tuple[int, ...]) -> np.ndarray:
+        shape = (self.image_size, self.image_size) + tuple(channels)
+        with self._lock:
+            while self._free:
+                buffer = self._free.pop()
+                if buffer.shape == shape and buffer.dtype == dtype:
+                    return buffer
+                self._owned.discard(id(buffer))
+            buffer = np.empty(shape, dtype=dtype)
+            if len(self._owned) < self.capacity:
+                self._owned.add(id(buffer))
+            return buffer
+
+
 class VideoProcessingService:
     def __init__(self):
-        pass
+        # 프레임 샘플링 방식: "grab"(건너뛸 프레임은 grab만), "seek"(시간 위치로 탐색), "auto"(자동 선택)
+        self.sampling_strategy = "auto"
+        # 추출 간격이 키프레임 간격의 이 배수 이상이면 seek 방식이 유리하다고 판단합니다
+        self.seek_keyframe_ratio = 1.0
+        # 키프레임 간격을 측정하지 못했을 때 사용할 기본값 (초)
+        self.default_keyframe_interval = 2.0
+        # 키프레임 간격 측정에 사용할 최대 프레임 수
+        self.keyframe_probe_frames = 300
+        # 영상 길이가 이 값(초) 이상이면 짧은 시간 조각으로 나눠 여러 프로세스에서 동시에 디코딩합니다
+        self.parallel_decode_min_duration = float(os.getenv("PARALLEL_DECODE_MIN_DURATION", "600"))
+        # 병렬 디코딩 프로세스 수 (1이면 사용하지 않음). 효과는 benchmark_frame_sampling.py --processes로 확인합니다
+        self.decode_processes = int(os.getenv("DECODE_PROCESSES", str(os.cpu_count() or 1)))
+        # 프로세스 하나가 한 번에 디코딩하는 시간 조각 길이 (초)
+        self.decode_chunk_seconds = 10.0
+        # 프로세스당 미리 디코딩해 둘 수 있는 조각 수 (소비가 느릴 때의 메모리 상한)
+        self.decode_chunks_per_process = 2
+        # 유사 프레임 판정에 사용할 축소 이미지 한 변의 크기 (픽셀)
+        self.signature_size = 32
+        # 축소 이미지의 평균 밝기 차이(0~1)가 이 값보다 작으면 거의 같은 프레임으로 봅니다
+        self.duplicate_threshold = 0.02
     
     async def get_video_info(self, video_path: str) -> Dict:
         """영상 파일의 정보를 추출합니다."""
@@ -62,34 +225,275 @@ class VideoProcessingService:
     
     def _extract_frames_sync(self, video_path: str, frame_interval: float) -> List[Tuple[float, np.ndarray]]:
         """동기적으로 프레임을 추출합니다."""
+        return list(self.iter_frames(video_path, frame_interval))
+    
+    def iter_frames(self, video_path: str, frame_interval: float = 0.5, strategy: str = None,
+                    time_ranges: List[Tuple[float, float]] = None,
+                    letterboxer: FrameLetterboxer = None) -> Iterator[Tuple]:
+        """프레임을 디코딩되는 대로 하나씩 (timestamp, frame) 형태로 생성합니다.
+        
+        전체 프레임을 리스트로 모으지 않으므로 영상 길이와 무관하게 메모리 사용량이 일정합니다.
+        timestamp는 프레임 번호가 아닌 실제 재생 시각이므로 가변 프레임레이트 영상에도 정확합니다.
+        
+        Args:
+            video_path: 영상 파일 경로
+            frame_interval: 추출 간격 (초)
+            strategy: "grab", "seek", "auto" 중 하나 (기본값: self.sampling_strategy)
+            time_ranges: 지정하면 [(시작, 끝), ...] 구간 안에서만 추출합니다 (초 단위)
+            letterboxer: 지정하면 디코딩한 곳에서 바로 레터박스해 (timestamp, 이미지, 좌표 변환)을 생성합니다
+                (병렬 디코딩이면 작업 프로세스에서 줄인 뒤 전달하므로 원본 크기 프레임을 복사하지 않습니다)
+        """
+        strategy = strategy or self.sampling_strategy
+        # 키프레임 간격은 방식 선택과 grab의 구간 사이 탐색 판단에 함께 쓰므로 한 번만 추정합니다
+        keyframe_interval = None
+        if strategy == "auto" or (strategy == "grab" and time_ranges):
+            keyframe_interval = self.estimate_keyframe_interval(video_path)
+        if strategy == "auto":
+            strategy = self.choose_sampling_strategy(video_path, frame_interval, keyframe_interval)
+        
+        if time_ranges is None and self.decode_processes > 1:
+            duration = self._get_video_info_sync(video_path)["duration"]
+            if duration >= self.parallel_decode_min_duration:
+                return self._iter_frames_parallel(video_path, frame_interval, strategy, duration, letterboxer)
+        
+        if strategy == "seek":
+            frames = self._iter_frames_seek(video_path, frame_interval, time_ranges)
+        elif strategy == "grab":
+            frames = self._iter_frames_grab(video_path, frame_interval, time_ranges, keyframe_interval)
+        else:
+            raise Exception(f"지원하지 않는 샘플링 방식입니다: {strategy}")
+        if letterboxer is not None:
+            return self._letterbox_frames(frames, letterboxer)
+        return frames
+    
+    @staticmethod
+    def _letterbox_frames(frames: Iterator[Tuple[float, np.ndarray]],
+                          letterboxer: FrameLetterboxer) -> Iterator[Tuple]:
+        try:
+            for timestamp, frame in frames:
+                yield (timestamp, *letterboxer.letterbox(frame))
+        finally:
+            frames.close()
+    
+    def choose_sampling_strategy(self, video_path: str, frame_interval: float,
+                                 keyframe_interval: float = None) -> str:
+        """추출 간격과 코덱의 키프레임 간격을 비교하여 샘플링 방식을 고릅니다.
+        
+        seek는 매번 직전 키프레임부터 다시 디코딩하므로 추출 간격이 키프레임 간격보다
+        충분히 클 때만 grab으로 모든 프레임을 디코딩하는 것보다 빠릅니다.
+        keyframe_interval을 생략하면 영상에서 추정합니다.
+        """
+        keyframe_interval = keyframe_interval or self.estimate_keyframe_interval(video_path)
+        if frame_interval >= keyframe_interval * self.seek_keyframe_ratio:
+            return "seek"
+        return "grab"
+    
+    def estimate_keyframe_interval(self, video_path: str) -> float:
+        """영상 앞부분의 압축 패킷을 읽어 평균 키프레임 간격(초)을 추정합니다."""
+        if not hasattr(cv2, "CAP_PROP_LRF_HAS_KEY_FRAME"):
+            return self.default_keyframe_interval
+        
+        # CAP_PROP_FORMAT=-1: 디코딩 없이 압축 패킷만 읽습니다
+        cap = cv2.VideoCapture(video_path, cv2.CAP_FFMPEG, [cv2.CAP_PROP_FORMAT, -1])
         try:
-            cap = cv2.VideoCapture(video_path)
-            
             if not cap.isOpened():
-                raise Exception("영상 파일을 열 수 없습니다.")
+                return self.default_keyframe_interval
             
-            fps = cap.get(cv2.CAP_PROP_FPS)
-            frames = []
-            frame_number = 0
+            keyframe_times = []
+            for _ in range(self.keyframe_probe_frames):
+                if not cap.grab():
+                    break
+                if cap.get(cv2.CAP_PROP_LRF_HAS_KEY_FRAME):
+                    keyframe_times.append(cap.get(cv2.CAP_PROP_POS_MSEC) / 1000)
+            
+            if len(keyframe_times) < 2:
+                return self.default_keyframe_interval
             
+            gaps = np.diff(keyframe_times)
+            gaps = gaps[gaps > 0]
+            return float(np.median(gaps)) if len(gaps) else self.default_keyframe_interval
+        except Exception:
+            return self.default_keyframe_interval
+        finally:
+            cap.release()
+    
+    def _open_capture(self, video_path: str) -> Tuple[cv2.VideoCapture, float]:
+        """영상을 열고 (capture, fps)를 반환합니다."""
+        cap = cv2.VideoCapture(video_path)
+        if not cap.isOpened():
+            raise Exception("영상 파일을 열 수 없습니다.")
+        return cap, cap.get(cv2.CAP_PROP_FPS)
+    
+    def _frame_timestamp(self, cap: cv2.VideoCapture, fps: float) -> float:
+        """방금 읽은 프레임의 재생 시각(초)을 반환합니다."""
+        pos_msec = cap.get(cv2.CAP_PROP_POS_MSEC)
+        frame_number = cap.get(cv2.CAP_PROP_POS_FRAMES) - 1
+        if pos_msec > 0 or frame_number <= 0:
+            return pos_msec / 1000
+        # 일부 백엔드는 재생 시각을 제공하지 않으므로 프레임 번호로 대체합니다
+        return frame_number / fps if fps > 0 else 0.0
+    
+    def _sample_targets(self, frame_interval: float,
+                        time_ranges: List[Tuple[float, float]] = None) -> Iterator[float]:
+        """추출할 시각을 frame_interval 격자 위에서 차례로 생성합니다."""
+        if not time_ranges:
+            index = 0
             while True:
-                ret, frame = cap.read()
-                if not ret:
+                yield index * frame_interval
+                index += 1
+        
+        last_target = -1.0
+        for range_start, range_end in sorted(time_ranges):
+            index = int(np.ceil(max(range_start, 0.0) / frame_interval - 1e-9))
+            while index * frame_interval <= range_end:
+                target = index * frame_interval
+                # 겹치는 구간에서 같은 시각을 두 번 내보내지 않습니다
+                if target > last_target:
+                    yield target
+                    last_target = target
+                index += 1
+    
+    def _iter_frames_grab(self, video_path: str, frame_interval: float,
+                          time_ranges: List[Tuple[float, float]] = None,
+                          keyframe_interval: float = None) -> Iterator[Tuple[float, np.ndarray]]:
+        """건너뛸 프레임은 grab()만 하고 사용할 프레임만 retrieve()로 색 변환합니다.
+        
+        구간 사이 간격이 키프레임 간격(keyframe_interval, 생략하면 영상에서 추정)보다 크면 다음 구간 시작으로 탐색합니다.
+        """
+        if time_ranges and keyframe_interval is None:
+            keyframe_interval = self.estimate_keyframe_interval(video_path)
+        cap, fps = self._open_capture(video_path)
+        try:
+            # 반 프레임 이하의 오차는 허용합니다
+            tolerance = 0.5 / fps if fps > 0 else 0.0
+            targets = self._sample_targets(frame_interval, time_ranges)
+            next_timestamp = next(targets, None)
+            timestamp = 0.0
+            # 탐색은 목표보다 앞에 도착할 수 있으므로 같은 목표로는 한 번만 탐색하고 나머지는 grab으로 따라갑니다
+            sought_timestamp = None
+            
+            while next_timestamp is not None:
+                if (time_ranges and next_timestamp != sought_timestamp
+                        and next_timestamp - timestamp > keyframe_interval):
+                    # 반 프레임 허용 기준으로 고를 프레임을 지나치지 않도록 한 프레임 앞으로 이동합니다
+                    cap.set(cv2.CAP_PROP_POS_MSEC, max(0.0, next_timestamp - 3 * tolerance) * 1000)
+                    sought_timestamp = next_timestamp
+                
+                if not cap.grab():
                     break
+                timestamp = self._frame_timestamp(cap, fps)
                 
-                # 지정된 간격마다 프레임 저장
-                if frame_number % (int(fps * frame_interval)) == 0:
-                    timestamp = frame_number / fps
-                    frames.append((timestamp, frame))
+                if timestamp + tolerance < next_timestamp:
+                    continue
                 
-                frame_number += 1
-            
+                ret, frame = cap.retrieve()
+                if not ret:
+                    break
+                yield timestamp, frame
+                
+                while next_timestamp is not None and next_timestamp <= timestamp + tolerance:
+                    next_timestamp = next(targets, None)
+        except Exception as e:
+            raise Exception(f"프레임 추출 오류: {str(e)}")
+        finally:
             cap.release()
+    
+    def _iter_frames_seek(self, video_path: str, frame_interval: float,
+                          time_ranges: List[Tuple[float, float]] = None) -> Iterator[Tuple[float, np.ndarray]]:
+        """CAP_PROP_POS_MSEC로 다음 추출 시각 바로 앞까지 이동하여 중간 프레임 디코딩을 건너뜁니다.
+        
+        탐색은 목표보다 앞선 프레임에 도착할 수 있으므로, 도착한 뒤에는 grab()으로 앞으로 읽으며
+        grab 방식과 같은 기준(반 프레임 이하 오차 허용)으로 프레임을 고릅니다. 따라서 두 방식은 같은 프레임을 반환합니다.
+        """
+        cap, fps = self._open_capture(video_path)
+        try:
+            frame_duration = 1.0 / fps if fps > 0 else 0.0
+            tolerance = frame_duration / 2
+            targets = self._sample_targets(frame_interval, time_ranges)
+            target = next(targets, None)
+            timestamp = 0.0
+            last_timestamp = None
+            seeked_target = None
             
-            return frames
-            
+            while target is not None:
+                # 목표가 몇 프레임 이상 앞에 있을 때만, 목표마다 한 번씩 탐색합니다.
+                # 탐색 위치는 grab이 고를 프레임보다 한 프레임 앞으로 잡아 지나치지 않게 합니다.
+                if seeked_target != target and target - timestamp > 2 * frame_duration + tolerance:
+                    cap.set(cv2.CAP_PROP_POS_MSEC, max(0.0, target - tolerance - frame_duration) * 1000)
+                    seeked_target = target
+                
+                # 영상 끝(읽기 실패)에서만 종료합니다
+                if not cap.grab():
+                    break
+                timestamp = self._frame_timestamp(cap, fps)
+                
+                # 목표 전의 프레임이나 이미 내보낸 시각으로 되돌아간 프레임은 건너뛰고 계속 읽습니다
+                if timestamp + tolerance < target or (last_timestamp is not None and timestamp <= last_timestamp):
+                    continue
+                
+                ret, frame = cap.retrieve()
+                if not ret:
+                    break
+                yield timestamp, frame
+                last_timestamp = timestamp
+                while target is not None and target <= timestamp + tolerance:
+                    target = next(targets, None)
         except Exception as e:
             raise Exception(f"프레임 추출 오류: {str(e)}")
+        finally:
+            cap.release()
+    
+    def _iter_frames_parallel(self, video_path: str, frame_interval: float, strategy: str,
+                              duration: float, letterboxer: FrameLetterboxer = None) -> Iterator[Tuple]:
+        """영상을 짧은 시간 조각으로 나눠 프로세스 풀에서 디코딩하고 시간 순서대로 전달합니다.
+        
+        조각 수가 프로세스 수보다 훨씬 많으므로 모든 프로세스가 끝까지 번갈아 일합니다.
+        결과는 조각 순서대로 받고, 아직 전달하지 않은 조각은 decode_processes * decode_chunks_per_process개까지만 맡깁니다.
+        """
+        # 조각 경계를 추출 격자에 맞춰 조각 사이에 빠지거나 겹치는 시각이 없게 합니다
+        steps_per_chunk = max(1, int(round(self.decode_chunk_seconds / frame_interval)))
+        chunk_length = steps_per_chunk * frame_interval
+        chunk_count = max(1, int(np.ceil(duration / chunk_length)))
+        window = self.decode_processes * max(1, self.decode_chunks_per_process)
+        settings = dict(vars(self))
+        letterbox_size = letterboxer.image_size if letterboxer is not None else None
+        
+        def chunk_range(index: int) -> Tuple[float, float]:
+            start = index * chunk_length
+            # 마지막 조각은 메타데이터의 길이가 부정확해도 끝까지 읽도록 열어 둡니다
+            end = float("inf") if index == chunk_count - 1 else start + chunk_length - frame_interval / 2
+            return start, end
+        
+        print(f"⚡ {self.decode_processes}개 프로세스로 병렬 디코딩 ({chunk_count}개 조각, {chunk_length:.1f}초씩)")
+        executor = ProcessPoolExecutor(self.decode_processes, mp_context=multiprocessing.get_context("spawn"))
+        try:
+            pending = collections.deque()
+            next_chunk = 0
+            last_timestamp = None
+            while pending or next_chunk < chunk_count:
+                while next_chunk < chunk_count and len(pending) < window:
+                    pending.append(executor.submit(
+                        _decode_chunk_worker, settings, video_path, frame_interval, strategy,
+                        *chunk_range(next_chunk), letterbox_size
+                    ))
+                    next_chunk += 1
+                
+                try:
+                    frames = pending.popleft().result()
+                except Exception as e:
+                    raise Exception(f"구간 디코딩 오류: {str(e)}")
+                for item in frames:
+                    timestamp = item[0]
+                    # 조각 경계에서 같은 프레임을 두 번 내보내지 않습니다
+                    if last_timestamp is not None and timestamp <= last_timestamp:
+                        continue
+                    last_timestamp = timestamp
+                    if letterbox_size:
+                        _, image, transform = item
+                        item = (timestamp, letterboxer.place(image, transform), transform)
+                    yield item
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
     
     async def extract_frame_at_time(self, video_path: str, timestamp: float) -> np.ndarray:
         """특정 시간의 프레임을 추출합니다."""
@@ -153,6 +557,17 @@ class VideoProcessingService:
         except Exception as e:
             raise Exception(f"프레임 크기 조정 오류: {str(e)}")
     
+    def compute_frame_signature(self, frame: np.ndarray) -> np.ndarray:
+        """프레임 비교용 축소 흑백 이미지를 계산합니다."""
+        small = cv2.resize(frame, (self.signature_size, self.signature_size), interpolation=cv2.INTER_AREA)
+        if small.ndim == 3:
+            small = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+        return small
+    
+    def signature_difference(self, signature_a: np.ndarray, signature_b: np.ndarray) -> float:
+        """두 프레임 서명의 평균 밝기 차이를 0~1 범위로 반환합니다."""
+        return float(cv2.absdiff(signature_a, signature_b).mean()) / 255
+    
     def save_frame(self, frame: np.ndarray, output_path: str) -> bool:
         """프레임을 이미지 파일로 저장합니다."""
         try:
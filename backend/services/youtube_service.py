@@ -1,28 +1,135 @@
 import os
+import re
+import time
 import asyncio
-import yt_dlp
-from typing import Optional
+import threading
+from typing import Optional, Dict, Tuple
 import uuid
 import json
 
+# watch?v=, youtu.be/, shorts/, embed/, live/ 형태의 URL에서 11자리 영상 ID를 찾습니다
+VIDEO_ID_PATTERN = re.compile(r'(?:v=|youtu\.be/|shorts/|embed/|live/)([A-Za-z0-9_-]{11})')
+
+# 정보 추출과 다운로드에 공통으로 쓰는 클라이언트 설정
+# iOS와 Android 클라이언트는 SABR 제한이 없어서 안정적이므로 여러 클라이언트를 폴백으로 시도
+EXTRACTOR_ARGS = {
+    'youtube': {
+        'player_client': ['android', 'ios', 'web'],
+        'player_skip': ['webpage'],
+    }
+}
+
 class YouTubeService:
-    def __init__(self):
+    def __init__(self, ydl_factory=None):
         self.download_dir = "temp_downloads"
         os.makedirs(self.download_dir, exist_ok=True)
+        # yt_dlp.YoutubeDL과 같은 인터페이스의 객체를 만드는 함수 (테스트에서는 로컬 스텁으로 교체)
+        # 기본값(None)이면 처음 사용할 때 yt_dlp를 import합니다
+        self.ydl_factory = ydl_factory
+        # 영상 ID별 추출 정보 캐시 유효 시간 (초)
+        # 추출 정보에 들어있는 스트림 URL이 몇 시간 뒤 만료되므로 너무 길게 잡지 않습니다
+        self.info_cache_ttl = 1800
+        self.info_cache_max_entries = 256
+        self._info_cache: Dict[str, Tuple[float, dict]] = {}
+        self._info_cache_lock = threading.Lock()
+        # (영상 ID, 해상도)별 진행 중이거나 사용 중인 다운로드: {"future", "refs"}
+        # 이벤트 루프에서만 접근하므로 별도 잠금이 필요 없습니다
+        self._downloads: Dict[Tuple[str, str], Dict] = {}
+    
+    def _create_ydl(self, ydl_opts: dict):
+        """yt_dlp.YoutubeDL(또는 ydl_factory로 지정한 객체)을 만듭니다."""
+        if self.ydl_factory is None:
+            import yt_dlp
+            self.ydl_factory = yt_dlp.YoutubeDL
+        return self.ydl_factory(ydl_opts)
+    
+    @staticmethod
+    def extract_video_id(url: str) -> Optional[str]:
+        """유튜브 URL에서 영상 ID를 추출합니다. 찾지 못하면 None을 반환합니다."""
+        match = VIDEO_ID_PATTERN.search(url)
+        return match.group(1) if match else None
+    
+    async def acquire_video(self, url: str, resolution: str = "360p", info: dict = None) -> str:
+        """영상 파일을 가져옵니다. 같은 영상/해상도의 다운로드가 진행 중이면 그 결과를 공유합니다.
+        
+        파일 사용이 끝나면 반드시 release_video를 호출해야 하며, 마지막 사용자가 반환할 때 파일이 삭제됩니다.
+        """
+        key = (self.extract_video_id(url) or url, resolution)
+        entry = self._downloads.get(key)
+        if entry is None:
+            entry = {
+                "future": asyncio.ensure_future(self.download_video(url, resolution, info)),
+                "refs": 0
+            }
+            self._downloads[key] = entry
+            entry["future"].add_done_callback(lambda future: self._on_download_done(key, entry))
+        else:
+            print(f"🤝 진행 중인 다운로드를 공유합니다: {key[0]} ({resolution})")
+        
+        entry["refs"] += 1
+        try:
+            # 기다리던 요청 하나가 취소되어도 다른 요청을 위한 다운로드는 계속됩니다
+            return await asyncio.shield(entry["future"])
+        except BaseException:
+            self._release_entry(key, entry)
+            raise
+    
+    def release_video(self, video_path: str):
+        """acquire_video로 받은 파일 사용을 마칩니다. 더 이상 사용하는 요청이 없으면 파일을 삭제합니다."""
+        for key, entry in list(self._downloads.items()):
+            future = entry["future"]
+            if future.done() and not future.cancelled() and future.exception() is None \
+                    and future.result() == video_path:
+                self._release_entry(key, entry)
+                return
+        # 공유 다운로드로 관리되지 않는 파일은 바로 삭제합니다
+        self._remove_file(video_path)
+    
+    def _on_download_done(self, key: Tuple[str, str], entry: Dict):
+        """다운로드가 실패하면 이후 요청이 다시 시도할 수 있도록 항목을 지웁니다."""
+        future = entry["future"]
+        if (future.cancelled() or future.exception() is not None) and self._downloads.get(key) is entry:
+            del self._downloads[key]
+    
+    def _release_entry(self, key: Tuple[str, str], entry: Dict):
+        entry["refs"] -= 1
+        if entry["refs"] > 0:
+            return
+        
+        if self._downloads.get(key) is entry:
+            del self._downloads[key]
+        
+        future = entry["future"]
+        if not future.done():
+            # 아무도 기다리지 않는 다운로드는 끝나는 대로 파일을 지웁니다
+            future.add_done_callback(lambda f: self._remove_file(f.result()) if not f.cancelled() and f.exception() is None else None)
+        elif not future.cancelled() and future.exception() is None:
+            self._remove_file(future.result())
+    
+    def _remove_file(self, video_path: str):
+        if video_path and os.path.exists(video_path):
+            try:
+                os.remove(video_path)
+                print("🗑️ 임시 파일 정리 완료")
+            except Exception as cleanup_error:
+                print(f"⚠️ 임시 파일 정리 실패: {cleanup_error}")
     
-    async def download_video(self, url: str, resolution: str = "360p") -> str:
-        """유튜브 영상을 다운로드합니다."""
+    async def download_video(self, url: str, resolution: str = "360p", info: dict = None) -> str:
+        """유튜브 영상을 다운로드합니다.
+        
+        extract_info로 미리 가져온 info를 넘기면 정보를 다시 추출하지 않고 바로 다운로드합니다.
+        """
         try:
             # 비동기 실행을 위해 executor 사용
             loop = asyncio.get_event_loop()
             video_path = await loop.run_in_executor(
-                None, self._download_sync, url, resolution
+                None, self._download_sync, url, resolution, info
             )
             return video_path
         except Exception as e:
             raise Exception(f"유튜브 영상 다운로드 실패: {str(e)}")
     
-    def _download_sync(self, url: str, resolution: str) -> str:
+    def _download_sync(self, url: str, resolution: str, info: dict = None) -> str:
         """동기적으로 유튜브 영상을 다운로드합니다."""
         try:
             # 고유한 파일명 생성
@@ -30,9 +137,6 @@ class YouTubeService:
             filename = f"video_{file_id}.%(ext)s"
             filepath = os.path.join(self.download_dir, filename)
             
-            # SABR 스트리밍 문제 회피: 여러 클라이언트 시도
-            # iOS와 Android 클라이언트는 SABR 제한이 없어서 안정적
-            
             # 해상도별 높이 매핑
             resolution_heights = {
                 '360p': 360,
@@ -60,12 +164,7 @@ class YouTubeService:
                 'no_warnings': False,
                 'socket_timeout': 60,  # 60초 타임아웃
                 # 여러 클라이언트를 폴백으로 시도
-                'extractor_args': {
-                    'youtube': {
-                        'player_client': ['android', 'ios', 'web'],
-                        'player_skip': ['webpage'],
-                    }
-                },
+                'extractor_args': EXTRACTOR_ARGS,
                 # Fragmented 다운로드 방지
                 'noprogress': False,  # 진행률 표시
                 'fragment_retries': 10,
@@ -80,8 +179,21 @@ class YouTubeService:
             print("📥 yt-dlp 다운로드 시작...")
             
             # 다운로드 실행
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                ydl.download([url])
+            with self._create_ydl(ydl_opts) as ydl:
+                if info is not None:
+                    # 이미 추출한 정보로 포맷 선택과 다운로드만 수행합니다
+                    # 캐시된 추출 정보가 바뀌지 않도록 sanitize_info로 만든 사본을 넘깁니다.
+                    # sanitize_info는 ydl_factory로 만든 객체의 것을 쓰고, 지역 우회 IP(__x_forwarded_for_ip) 같은
+                    # 비공개 키는 다운로드에도 필요하므로 지우지 않습니다
+                    try:
+                        ydl.process_ie_result(ydl.sanitize_info(dict(info)), download=True)
+                    except Exception as e:
+                        # 스트림 URL이 만료된 경우 등에는 처음부터 다시 추출합니다
+                        print(f"⚠️ 추출 정보로 다운로드 실패, URL로 다시 시도합니다: {str(e)}")
+                        self._forget_info(url)
+                        ydl.download([url])
+                else:
+                    ydl.download([url])
             
             print("🔍 다운로드된 파일 찾는 중...")
             # 실제 다운로드된 파일 경로 찾기 (.part 파일 제외)
@@ -114,17 +226,41 @@ class YouTubeService:
     
     async def get_video_info(self, url: str) -> dict:
         """유튜브 영상 정보를 가져옵니다."""
+        try:
+            info = await self.extract_info(url)
+            return self.summarize_info(info)
+        except Exception as e:
+            raise Exception(f"영상 정보 가져오기 실패: {str(e)}")
+    
+    async def extract_info(self, url: str) -> dict:
+        """yt-dlp 추출 정보를 가져옵니다. 유효 시간 안에 같은 영상을 다시 요청하면 캐시를 사용합니다.
+        
+        반환된 정보는 download_video(info=...)에 넘겨 재추출 없이 다운로드할 수 있습니다.
+        """
         try:
             loop = asyncio.get_event_loop()
-            info = await loop.run_in_executor(
-                None, self._get_video_info_sync, url
+            return await loop.run_in_executor(
+                None, self._extract_info_sync, url
             )
-            return info
         except Exception as e:
             raise Exception(f"영상 정보 가져오기 실패: {str(e)}")
     
-    def _get_video_info_sync(self, url: str) -> dict:
-        """동기적으로 유튜브 영상 정보를 가져옵니다."""
+    def _info_cache_key(self, url: str) -> str:
+        return self.extract_video_id(url) or url
+    
+    def _forget_info(self, url: str):
+        with self._info_cache_lock:
+            self._info_cache.pop(self._info_cache_key(url), None)
+    
+    def _extract_info_sync(self, url: str) -> dict:
+        """동기적으로 유튜브 영상 정보를 추출합니다."""
+        cache_key = self._info_cache_key(url)
+        with self._info_cache_lock:
+            cached = self._info_cache.get(cache_key)
+            if cached and cached[0] > time.time():
+                print(f"⚡ 캐시된 유튜브 정보 사용: {cache_key}")
+                return cached[1]
+        
         try:
             print(f"🔍 유튜브 정보 추출 시작: {url}")
             ydl_opts = {
@@ -133,30 +269,37 @@ class YouTubeService:
                 'socket_timeout': 30,  # 30초 타임아웃
                 'noplaylist': True,  # 재생목록 무시, 단일 영상만
                 # 여러 클라이언트를 폴백으로 시도
-                'extractor_args': {
-                    'youtube': {
-                        'player_client': ['android', 'ios', 'web'],
-                        'player_skip': ['webpage'],
-                    }
-                },
+                'extractor_args': EXTRACTOR_ARGS,
             }
             
             print("📡 유튜브 메타데이터 가져오는 중...")
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+            with self._create_ydl(ydl_opts) as ydl:
                 info = ydl.extract_info(url, download=False)
             print("✅ 유튜브 정보 추출 완료")
-            
-            return {
-                "title": info.get('title', '제목 없음'),
-                "author": info.get('uploader', '채널 없음'),
-                "length": info.get('duration', 0),
-                "views": info.get('view_count', 0),
-                "description": (info.get('description', '')[:200] + "...") if len(info.get('description', '')) > 200 else info.get('description', ''),
-                "thumbnail_url": info.get('thumbnail', ''),
-                "publish_date": info.get('upload_date', None)
-            }
         except Exception as e:
             raise Exception(f"영상 정보 추출 오류: {str(e)}")
+        
+        with self._info_cache_lock:
+            self._info_cache[cache_key] = (time.time() + self.info_cache_ttl, info)
+            # 가장 먼저 만료될 항목부터 지워 캐시 크기를 제한합니다
+            while len(self._info_cache) > self.info_cache_max_entries:
+                oldest = min(self._info_cache, key=lambda key: self._info_cache[key][0])
+                del self._info_cache[oldest]
+        return info
+    
+    @staticmethod
+    def summarize_info(info: dict) -> dict:
+        """yt-dlp 추출 정보에서 화면에 보여줄 영상 정보만 골라냅니다."""
+        description = info.get('description') or ''
+        return {
+            "title": info.get('title', '제목 없음'),
+            "author": info.get('uploader', '채널 없음'),
+            "length": info.get('duration', 0),
+            "views": info.get('view_count', 0),
+            "description": (description[:200] + "...") if len(description) > 200 else description,
+            "thumbnail_url": info.get('thumbnail', ''),
+            "publish_date": info.get('upload_date', None)
+        }
     
     def cleanup_temp_files(self):
         """임시 다운로드 파일들을 정리합니다."""
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+배치 추론 처리량 벤치마크
+배치 크기별로 초당 처리 프레임 수와 탐지 결과 변환 오버헤드를 측정합니다.
+
+사용법:
+  python benchmarks/benchmark_batch_inference.py <영상_파일_경로> [--frames 64] [--batch-sizes 1 2 4 8 16]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.services.logo_detection_service import LogoDetectionService
+from backend.services.video_processing_service import VideoProcessingService
+
+
+def load_frames(video_path: str, frame_count: int, frame_interval: float):
+    """벤치마크에 사용할 프레임을 미리 메모리에 읽어 둡니다 (디코딩 시간 제외)."""
+    frames = []
+    for item in VideoProcessingService().iter_frames(video_path, frame_interval):
+        frames.append(item)
+        if len(frames) >= frame_count:
+            break
+    return frames
+
+
+def run(video_path: str, frame_count: int, frame_interval: float, batch_sizes, repeats: int):
+    detector = LogoDetectionService()
+    if not detector.model:
+        print("❌ 모델을 로드할 수 없습니다.")
+        return
+
+    frames = load_frames(video_path, frame_count, frame_interval)
+    if not frames:
+        print("❌ 프레임을 추출할 수 없습니다.")
+        return
+
+    # 첫 호출의 초기화 비용이 결과에 섞이지 않도록 예열합니다
+    detector._detect_batch_sync(frames[:1])
+
+    print(f"🎬 영상: {video_path} ({len(frames)}개 프레임, 반복 {repeats}회)")
+    print()
+    print(f"{'배치':>5} {'FPS':>8} {'프레임당(ms)':>12} {'탐지 수':>8} {'탐지당 변환(µs)':>15}")
+    print("-" * 55)
+
+    for batch_size in batch_sizes:
+        detector.set_batch_size(batch_size)
+        best_elapsed = None
+        parse_elapsed = 0.0
+        total_detections = 0
+
+        for _ in range(repeats):
+            start = time.perf_counter()
+            parse_time = 0.0
+            detections = 0
+            for i in range(0, len(frames), batch_size):
+                batch = frames[i:i + batch_size]
+                results = detector.model([frame for _, frame in batch],
+                                         conf=detector.confidence_threshold, verbose=False)
+                parse_start = time.perf_counter()
+                for (timestamp, _), result in zip(batch, results):
+                    detections += len(detector._parse_result(timestamp, result)["detections"])
+                parse_time += time.perf_counter() - parse_start
+            elapsed = time.perf_counter() - start
+
+            if best_elapsed is None or elapsed < best_elapsed:
+                best_elapsed = elapsed
+                parse_elapsed = parse_time
+                total_detections = detections
+
+        fps = len(frames) / best_elapsed
+        per_frame_ms = best_elapsed / len(frames) * 1000
+        per_detection_us = parse_elapsed / total_detections * 1e6 if total_detections else 0
+        print(f"{batch_size:>5} {fps:>8.2f} {per_frame_ms:>12.1f} {total_detections:>8} {per_detection_us:>15.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="배치 추론 처리량 벤치마크")
+    parser.add_argument("video_path", help="벤치마크할 영상 파일 경로")
+    parser.add_argument("--frames", type=int, default=64, help="사용할 프레임 수")
+    parser.add_argument("--interval", type=float, default=0.5, help="프레임 추출 간격 (초)")
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 2, 4, 8, 16],
+                        help="비교할 배치 크기")
+    parser.add_argument("--repeats", type=int, default=3, help="배치 크기별 반복 횟수 (최솟값 사용)")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.video_path):
+        print(f"❌ 파일을 찾을 수 없습니다: {args.video_path}")
+        sys.exit(1)
+
+    run(args.video_path, args.frames, args.interval, args.batch_sizes, args.repeats)
+
+
+if __name__ == "__main__":
+    main()
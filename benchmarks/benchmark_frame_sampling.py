@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+프레임 샘플링 방식 벤치마크
+read(기존 방식) / grab / seek 방식별로 영상 1분당 디코딩 시간을 비교합니다.
+--processes를 주면 auto 방식을 여러 프로세스로 병렬 디코딩한 시간도 함께 측정합니다 (parallel 행).
+병렬 디코딩은 분석 파이프라인처럼 작업 프로세스에서 --image-size로 레터박스한 프레임을 받습니다.
+
+사용법:
+  python benchmarks/benchmark_frame_sampling.py <영상_파일_경로> [--intervals 0.5 2 5] [--processes 4] [--image-size 1280]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import cv2
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.services.video_processing_service import FrameLetterboxer, VideoProcessingService
+
+
+def iter_frames_read(video_path: str, frame_interval: float):
+    """기존 방식: 모든 프레임을 read()로 디코딩하고 간격에 맞는 프레임만 사용합니다."""
+    cap = cv2.VideoCapture(video_path)
+    fps = cap.get(cv2.CAP_PROP_FPS)
+    step = max(1, int(fps * frame_interval))
+    frame_number = 0
+    while True:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        if frame_number % step == 0:
+            yield frame_number / fps, frame
+        frame_number += 1
+    cap.release()
+
+
+def run(video_path: str, intervals, processes: int = 1, image_size: int = 1280):
+    service = VideoProcessingService()
+    # read/grab/seek 행은 한 프로세스에서 측정합니다
+    service.decode_processes = 1
+    parallel_service = VideoProcessingService()
+    parallel_service.decode_processes = processes
+    # 짧은 영상으로도 비교할 수 있도록 길이 조건 없이 병렬 디코딩합니다
+    parallel_service.parallel_decode_min_duration = 0
+    info = service._get_video_info_sync(video_path)
+    minutes = info["duration"] / 60 if info["duration"] else 0
+    keyframe_interval = service.estimate_keyframe_interval(video_path)
+
+    print(f"🎬 영상: {video_path}")
+    print(f"  길이: {info['duration']:.1f}초, FPS: {info['fps']:.2f}, 해상도: {info['width']}x{info['height']}")
+    print(f"  추정 키프레임 간격: {keyframe_interval:.2f}초")
+    print()
+    print(f"{'간격(초)':>8} {'방식':>8} {'프레임':>7} {'총 시간(초)':>11} {'초/영상 1분':>11}")
+    print("-" * 52)
+
+    for interval in intervals:
+        strategies = {
+            "read": lambda: iter_frames_read(video_path, interval),
+            "grab": lambda: service.iter_frames(video_path, interval, strategy="grab"),
+            "seek": lambda: service.iter_frames(video_path, interval, strategy="seek"),
+        }
+        if processes > 1:
+            strategies["parallel"] = lambda: parallel_service.iter_frames(
+                video_path, interval, letterboxer=FrameLetterboxer(image_size, 1)
+            )
+        for name, make_iter in strategies.items():
+            start = time.perf_counter()
+            count = sum(1 for _ in make_iter())
+            elapsed = time.perf_counter() - start
+            per_minute = elapsed / minutes if minutes else 0
+            print(f"{interval:>8.1f} {name:>8} {count:>7} {elapsed:>11.2f} {per_minute:>11.2f}")
+        print(f"{'':>8} {'auto':>8} → {service.choose_sampling_strategy(video_path, interval)}")
+        print()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="프레임 샘플링 방식 벤치마크")
+    parser.add_argument("video_path", help="벤치마크할 영상 파일 경로")
+    parser.add_argument("--intervals", type=float, nargs="+", default=[0.5, 2.0, 5.0],
+                        help="비교할 프레임 추출 간격 (초)")
+    parser.add_argument("--processes", type=int, default=1,
+                        help="병렬 디코딩 프로세스 수 (2 이상이면 parallel 행을 함께 측정)")
+    parser.add_argument("--image-size", type=int, default=1280,
+                        help="병렬 디코딩에서 레터박스할 모델 입력 크기")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.video_path):
+        print(f"❌ 파일을 찾을 수 없습니다: {args.video_path}")
+        sys.exit(1)
+
+    run(args.video_path, args.intervals, args.processes, args.image_size)
+
+
+if __name__ == "__main__":
+    main()
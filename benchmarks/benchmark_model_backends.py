@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+추론 백엔드 비교 벤치마크
+.pt(PyTorch) 기준 모델과 ONNX/OpenVINO(FP32/INT8) 변환 모델의 지연 시간, 처리량,
+탐지 결과 일치도를 같은 영상 프레임으로 비교합니다.
+
+변환 모델은 먼저 setup_model.py export로 만들어 두어야 합니다.
+
+사용법:
+  python benchmarks/benchmark_model_backends.py <영상_파일_경로> [--configs pytorch:fp32 onnx:fp32 openvino:int8]
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.services.logo_detection_service import LogoDetectionService
+from backend.services.video_processing_service import VideoProcessingService
+
+
+def load_frames(video_path: str, frame_count: int, frame_interval: float):
+    """벤치마크에 사용할 프레임을 미리 메모리에 읽어 둡니다 (디코딩 시간 제외)."""
+    frames = []
+    for item in VideoProcessingService().iter_frames(video_path, frame_interval):
+        frames.append(item)
+        if len(frames) >= frame_count:
+            break
+    return frames
+
+
+def box_iou(a, b) -> float:
+    x1, y1 = max(a[0], b[0]), max(a[1], b[1])
+    x2, y2 = min(a[2], b[2]), min(a[3], b[3])
+    intersection = max(0.0, x2 - x1) * max(0.0, y2 - y1)
+    union = (a[2] - a[0]) * (a[3] - a[1]) + (b[2] - b[0]) * (b[3] - b[1]) - intersection
+    return intersection / union if union > 0 else 0.0
+
+
+def agreement(baseline, candidate, iou_threshold: float):
+    """프레임별로 같은 브랜드이면서 IoU가 기준 이상인 박스를 짝지어 (정밀도, 재현율)을 계산합니다."""
+    matched = baseline_total = candidate_total = 0
+    for base_frame, cand_frame in zip(baseline, candidate):
+        base_boxes = base_frame["detections"]
+        cand_boxes = list(cand_frame["detections"])
+        baseline_total += len(base_boxes)
+        candidate_total += len(cand_boxes)
+        for base in base_boxes:
+            best_index, best_iou = None, iou_threshold
+            for index, cand in enumerate(cand_boxes):
+                if cand["brand"] != base["brand"]:
+                    continue
+                iou = box_iou(base["bbox"], cand["bbox"])
+                if iou >= best_iou:
+                    best_index, best_iou = index, iou
+            if best_index is not None:
+                cand_boxes.pop(best_index)
+                matched += 1
+
+    precision = matched / candidate_total if candidate_total else 1.0
+    recall = matched / baseline_total if baseline_total else 1.0
+    return precision, recall
+
+
+def measure(detector: LogoDetectionService, frames, batch_size: int, repeats: int):
+    """프레임 1장 지연 시간 목록, 배치 처리량(FPS), 탐지 결과를 반환합니다."""
+    # 첫 호출의 초기화 비용이 결과에 섞이지 않도록 예열합니다
+    detector._detect_batch_sync(frames[:1])
+
+    latencies = []
+    for item in frames:
+        start = time.perf_counter()
+        detector._detect_batch_sync([item])
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    detector.set_batch_size(batch_size)
+    best_elapsed = None
+    detections = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        results = []
+        for i in range(0, len(frames), batch_size):
+            results.extend(detector._detect_batch_sync(frames[i:i + batch_size]))
+        elapsed = time.perf_counter() - start
+        if best_elapsed is None or elapsed < best_elapsed:
+            best_elapsed = elapsed
+            detections = results
+
+    return latencies, len(frames) / best_elapsed, detections
+
+
+def run(video_path: str, configs, frame_count: int, frame_interval: float,
+        batch_size: int, repeats: int, iou_threshold: float):
+    frames = load_frames(video_path, frame_count, frame_interval)
+    if not frames:
+        print("❌ 프레임을 추출할 수 없습니다.")
+        return
+
+    print(f"🎬 영상: {video_path} ({len(frames)}개 프레임, 배치 {batch_size}, 반복 {repeats}회)")
+    print()
+    print(f"{'백엔드':>16} {'지연 p50(ms)':>12} {'p95(ms)':>9} {'FPS':>8} {'탐지 수':>7} {'정밀도':>7} {'재현율':>7}")
+    print("-" * 75)
+
+    baseline = None
+    for config in configs:
+        backend, _, precision = config.partition(":")
+        # 기본 모델을 먼저 로드하지 않고 측정할 백엔드 모델만 로드합니다
+        detector = LogoDetectionService(load_model=False)
+        try:
+            asyncio.run(detector.set_inference_backend(backend, precision or "fp32"))
+        except Exception as e:
+            print(f"{config:>16} ⚠️ {str(e)}")
+            continue
+        if not detector.model:
+            print(f"{config:>16} ⚠️ 모델을 로드할 수 없습니다: {detector.get_backend_model_path()}")
+            continue
+
+        latencies, fps, detections = measure(detector, frames, batch_size, repeats)
+        if baseline is None:
+            # 처음 성공한 설정(기본값: pytorch:fp32)을 일치도 기준으로 사용합니다
+            baseline = detections
+
+        precision_score, recall_score = agreement(baseline, detections, iou_threshold)
+        total_detections = sum(len(result["detections"]) for result in detections)
+        p95 = float(np.percentile(latencies, 95))
+        print(f"{config:>16} {statistics.median(latencies):>12.1f} {p95:>9.1f} {fps:>8.2f} "
+              f"{total_detections:>7} {precision_score:>7.3f} {recall_score:>7.3f}")
+
+    print()
+    print(f"정밀도/재현율: 첫 번째 설정의 탐지 결과를 기준으로 같은 브랜드, IoU {iou_threshold} 이상인 박스의 일치 비율")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="추론 백엔드 비교 벤치마크")
+    parser.add_argument("video_path", help="벤치마크할 영상 파일 경로")
+    parser.add_argument("--configs", nargs="+",
+                        default=["pytorch:fp32", "onnx:fp32", "onnx:int8", "openvino:fp32", "openvino:int8"],
+                        help="비교할 백엔드:정밀도 목록 (첫 번째가 일치도 기준)")
+    parser.add_argument("--frames", type=int, default=32, help="사용할 프레임 수")
+    parser.add_argument("--interval", type=float, default=0.5, help="프레임 추출 간격 (초)")
+    parser.add_argument("--batch-size", type=int, default=8, help="처리량 측정 배치 크기")
+    parser.add_argument("--repeats", type=int, default=3, help="처리량 측정 반복 횟수 (최솟값 사용)")
+    parser.add_argument("--iou", type=float, default=0.5, help="일치도 판정 IoU 기준")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.video_path):
+        print(f"❌ 파일을 찾을 수 없습니다: {args.video_path}")
+        sys.exit(1)
+
+    run(args.video_path, args.configs, args.frames, args.interval, args.batch_size, args.repeats, args.iou)
+
+
+if __name__ == "__main__":
+    main()
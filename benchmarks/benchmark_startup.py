@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+서버 시작 시간 벤치마크
+모듈별 import 시간(새 프로세스에서 측정)과 uvicorn 실행부터 첫 /health 응답까지의 시간을 측정합니다.
+--wait-ready를 주면 /ready가 200을 반환할 때까지(모델 로드/예열 완료)의 시간도 함께 측정합니다.
+
+사용법:
+  python benchmarks/benchmark_startup.py [--repeats 3] [--max-health-seconds 1.0] [--wait-ready]
+"""
+
+import argparse
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.request
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 각각 새 프로세스에서 import 시간을 잽니다 (앞 모듈이 이미 import한 의존성의 영향을 받지 않도록)
+MODULES = [
+    "backend.services.analysis_storage_service",
+    "backend.services.notification_service",
+    "backend.services.youtube_service",
+    "backend.services.video_processing_service",
+    "backend.services.logo_detection_service",
+    "backend.services.analysis_pipeline_service",
+    "backend.main",
+]
+
+# API 전용 프로세스에서는 import되지 않아야 하는 무거운 모듈
+HEAVY_MODULES = ["cv2", "numpy", "ultralytics", "torch", "yt_dlp"]
+
+
+def measure_import(module: str):
+    """새 파이썬 프로세스에서 모듈 import 시간(초)과 함께 로드된 무거운 모듈 목록을 반환합니다."""
+    code = (
+        "import sys, time\n"
+        "start = time.perf_counter()\n"
+        f"import {module}\n"
+        "elapsed = time.perf_counter() - start\n"
+        f"heavy = [name for name in {HEAVY_MODULES!r} if name in sys.modules]\n"
+        "print('RESULT', elapsed, ','.join(heavy))\n"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", code], cwd=REPO_ROOT, capture_output=True, text=True, check=True
+    ).stdout
+    # import 중 서비스가 출력하는 로그와 구분하기 위해 마지막 RESULT 줄만 사용합니다
+    result_line = [line for line in output.splitlines() if line.startswith("RESULT ")][-1]
+    _, elapsed, *heavy = result_line.split(" ")
+    heavy = [name for name in "".join(heavy).split(",") if name]
+    return float(elapsed), heavy
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_for(url: str, deadline: float) -> bool:
+    while time.perf_counter() < deadline:
+        try:
+            with urllib.request.urlopen(url, timeout=1) as response:
+                if response.status == 200:
+                    return True
+        except Exception:
+            pass
+        time.sleep(0.01)
+    return False
+
+
+def measure_server(wait_ready: bool, timeout: float):
+    """uvicorn을 띄워 첫 /health 응답 시간과 (선택) /ready 200 응답 시간을 반환합니다."""
+    port = free_port()
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "backend.main:app", "--host", "127.0.0.1", "--port", str(port)],
+        cwd=REPO_ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        deadline = start + timeout
+        health = time.perf_counter() - start if wait_for(f"http://127.0.0.1:{port}/health", deadline) else None
+        ready = None
+        if wait_ready and health is not None:
+            ready = time.perf_counter() - start if wait_for(f"http://127.0.0.1:{port}/ready", deadline) else None
+        return health, ready
+    finally:
+        process.terminate()
+        process.wait(timeout=10)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="서버 시작 시간 벤치마크")
+    parser.add_argument("--repeats", type=int, default=3, help="측정 반복 횟수 (중앙값 사용)")
+    parser.add_argument("--wait-ready", action="store_true", help="/ready가 200을 반환할 때까지의 시간도 측정")
+    parser.add_argument("--timeout", type=float, default=120.0, help="서버 응답 대기 최대 시간 (초)")
+    parser.add_argument("--max-health-seconds", type=float, default=None,
+                        help="첫 /health 응답이 이 시간을 넘으면 종료 코드 1로 끝냅니다 (회귀 확인용)")
+    args = parser.parse_args()
+
+    print(f"📦 모듈별 import 시간 (새 프로세스, {args.repeats}회 중앙값)")
+    print(f"{'모듈':<48} {'시간(ms)':>9}  무거운 모듈")
+    print("-" * 80)
+    for module in MODULES:
+        samples = []
+        heavy = []
+        for _ in range(args.repeats):
+            elapsed, heavy = measure_import(module)
+            samples.append(elapsed)
+        print(f"{module:<48} {statistics.median(samples) * 1000:>9.1f}  {', '.join(heavy) or '-'}")
+
+    print()
+    print(f"🚀 uvicorn 실행 → 첫 응답 ({args.repeats}회 중앙값)")
+    health_samples, ready_samples = [], []
+    for _ in range(args.repeats):
+        health, ready = measure_server(args.wait_ready, args.timeout)
+        if health is None:
+            print("❌ 제한 시간 안에 /health 응답이 없습니다.")
+            sys.exit(1)
+        health_samples.append(health)
+        if ready is not None:
+            ready_samples.append(ready)
+
+    health_median = statistics.median(health_samples)
+    print(f"  첫 /health 응답: {health_median:.3f}초")
+    if args.wait_ready:
+        if ready_samples:
+            print(f"  /ready 200 응답: {statistics.median(ready_samples):.3f}초")
+        else:
+            print("  ⚠️ 제한 시간 안에 /ready가 200을 반환하지 않았습니다.")
+
+    if args.max_health_seconds is not None and health_median > args.max_health_seconds:
+        print(f"❌ 첫 /health 응답이 기준({args.max_health_seconds}초)보다 느립니다.")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
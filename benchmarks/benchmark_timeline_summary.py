@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+타임라인 요약 벤치마크
+합성 탐지 결과로 기존 파이썬 루프 요약과 배열 연산 요약(LogoDetectionService._summarize_timeline_sync)의
+실행 시간을 비교하고, 두 결과가 같은지 확인합니다.
+
+사용법:
+  python benchmarks/benchmark_timeline_summary.py [--detections 10000 100000 300000] [--brands 20] [--repeats 3]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from collections import defaultdict
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.services.logo_detection_service import LogoDetectionService
+
+
+def legacy_summarize(detection_results, frame_interval):
+    """배열 연산으로 바꾸기 전의 요약 구현입니다 (비교 기준)."""
+    brand_timeline = defaultdict(lambda: {
+        "appearances": 0,
+        "total_seconds": 0,
+        "timestamps": [],
+        "confidence_scores": []
+    })
+    exposures = {}
+
+    for frame_result in detection_results:
+        timestamp = frame_result["timestamp"]
+        detected_brands = set()
+        for detection in frame_result["detections"]:
+            brand = detection["brand"]
+            confidence = detection["confidence"]
+            if brand not in detected_brands:
+                brand_timeline[brand]["appearances"] += 1
+                brand_timeline[brand]["timestamps"].append(timestamp)
+                brand_timeline[brand]["confidence_scores"].append(confidence)
+                detected_brands.add(brand)
+
+            key = (brand, detection.get("track_id", f"frame-{timestamp}"))
+            exposure = exposures.get(key)
+            if exposure is None:
+                exposures[key] = [timestamp, timestamp, 1, confidence]
+            else:
+                exposure[0] = min(exposure[0], timestamp)
+                exposure[1] = max(exposure[1], timestamp)
+                exposure[2] += 1
+                exposure[3] = max(exposure[3], confidence)
+
+    brand_exposures = defaultdict(list)
+    for (brand, track_id), (start, last, frames, max_confidence) in exposures.items():
+        brand_exposures[brand].append({
+            "track_id": track_id if isinstance(track_id, int) else None,
+            "start": round(start, 3),
+            "end": round(last + frame_interval, 3),
+            "duration": round(last + frame_interval - start, 3),
+            "frames": frames,
+            "max_confidence": max_confidence
+        })
+
+    for brand in brand_timeline:
+        scores = brand_timeline[brand]["confidence_scores"]
+        brand_timeline[brand]["average_confidence"] = sum(scores) / len(scores) if scores else 0
+        brand_timeline[brand]["max_confidence"] = max(scores) if scores else 0
+        brand_intervals = sorted(brand_exposures[brand], key=lambda e: e["start"])
+        brand_timeline[brand]["exposures"] = brand_intervals
+        brand_timeline[brand]["exposure_count"] = len(brand_intervals)
+        brand_timeline[brand]["total_seconds"] = round(
+            union_length([(e["start"], e["end"]) for e in brand_intervals]), 3
+        )
+
+    return dict(brand_timeline)
+
+
+def union_length(intervals):
+    total = 0.0
+    current_start = current_end = None
+    for start, end in intervals:
+        if current_end is None or start > current_end:
+            if current_end is not None:
+                total += current_end - current_start
+            current_start, current_end = start, end
+        else:
+            current_end = max(current_end, end)
+    if current_end is not None:
+        total += current_end - current_start
+    return total
+
+
+def make_results(detection_count: int, brand_count: int, frame_interval: float, seed: int):
+    """트랙이 있는 탐지와 없는 탐지가 섞인 프레임별 탐지 결과를 만듭니다."""
+    rng = random.Random(seed)
+    brands = [f"brand_{index}" for index in range(brand_count)]
+    results = []
+    # 진행 중인 트랙: [track_id, brand, 남은 프레임 수]
+    active = []
+    next_track = 1
+    frame = 0
+    produced = 0
+    while produced < detection_count:
+        timestamp = round(frame * frame_interval, 3)
+        detections = []
+        while len(active) < 4 and rng.random() < 0.3:
+            active.append([next_track, rng.choice(brands), rng.randint(1, 40)])
+            next_track += 1
+        for track in active:
+            # 트랙이 가끔 한 프레임씩 끊겨도 같은 노출로 이어지도록 둡니다
+            if rng.random() < 0.9:
+                detections.append({"brand": track[1], "confidence": rng.uniform(0.3, 1.0), "track_id": track[0]})
+            track[2] -= 1
+        active = [track for track in active if track[2] > 0]
+        # 트래킹을 거치지 않은 탐지 (같은 프레임에 같은 브랜드가 여러 번 나올 수 있음)
+        for _ in range(rng.randint(0, 3)):
+            detections.append({"brand": rng.choice(brands), "confidence": rng.uniform(0.3, 1.0)})
+        results.append({"timestamp": timestamp, "detections": detections})
+        produced += len(detections)
+        frame += 1
+    return results
+
+
+def compare(expected, actual):
+    """두 요약 결과의 차이를 설명하는 문자열 목록을 반환합니다 (같으면 빈 목록)."""
+    problems = []
+    if list(expected) != list(actual):
+        return [f"브랜드 순서가 다릅니다: {list(expected)[:5]} / {list(actual)[:5]}"]
+    for brand, old in expected.items():
+        new = actual[brand]
+        if list(old) != list(new):
+            problems.append(f"{brand}: 키 순서가 다릅니다")
+        for key in ("appearances", "exposure_count", "timestamps", "confidence_scores", "exposures"):
+            if old[key] != new[key]:
+                problems.append(f"{brand}: {key} 값이 다릅니다")
+        for key, tolerance in (("average_confidence", 1e-9), ("max_confidence", 0), ("total_seconds", 1e-3)):
+            if abs(old[key] - new[key]) > tolerance:
+                problems.append(f"{brand}: {key} {old[key]} != {new[key]}")
+    return problems
+
+
+def best_time(function, repeats: int):
+    best = None
+    result = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = function()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="타임라인 요약 벤치마크")
+    parser.add_argument("--detections", type=int, nargs="+", default=[10000, 100000, 300000],
+                        help="합성할 탐지 수 목록")
+    parser.add_argument("--brands", type=int, default=20, help="브랜드 수")
+    parser.add_argument("--frame-interval", type=float, default=0.5, help="프레임 간격 (초)")
+    parser.add_argument("--repeats", type=int, default=3, help="측정 반복 횟수 (최솟값 사용)")
+    parser.add_argument("--seed", type=int, default=0, help="난수 시드")
+    args = parser.parse_args()
+
+    # 모델은 필요 없으므로 초기화(모델 로드) 없이 요약 메서드만 사용합니다
+    service = LogoDetectionService.__new__(LogoDetectionService)
+    # numpy 지연 import가 첫 측정에 섞이지 않도록 예열합니다
+    service._summarize_timeline_sync(make_results(100, args.brands, args.frame_interval, args.seed), args.frame_interval)
+
+    print(f"📊 타임라인 요약 (브랜드 {args.brands}개, 프레임 간격 {args.frame_interval}초, {args.repeats}회 중 최솟값)")
+    print(f"{'탐지 수':>9} {'프레임 수':>9} {'기존(ms)':>10} {'배열(ms)':>10} {'배속':>7}  결과")
+    print("-" * 62)
+
+    failed = False
+    for detection_count in args.detections:
+        results = make_results(detection_count, args.brands, args.frame_interval, args.seed)
+        legacy_elapsed, expected = best_time(lambda: legacy_summarize(results, args.frame_interval), args.repeats)
+        new_elapsed, actual = best_time(
+            lambda: service._summarize_timeline_sync(results, args.frame_interval), args.repeats
+        )
+        problems = compare(expected, actual)
+        failed = failed or bool(problems)
+        print(f"{detection_count:>9} {len(results):>9} {legacy_elapsed * 1000:>10.1f} {new_elapsed * 1000:>10.1f} "
+              f"{legacy_elapsed / new_elapsed:>6.1f}x  {'일치' if not problems else '불일치'}")
+        for problem in problems[:5]:
+            print(f"    ⚠️ {problem}")
+
+    if failed:
+        print("❌ 기존 구현과 결과가 다릅니다.")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -119,31 +119,63 @@ def analyze_youtube_video(url):
             "frame_interval": st.session_state.get("frame_interval", 0.5)
         }
         
-        status_text.text("📥 유튜브 영상을 다운로드 중...")
-        progress_bar.progress(30)
-        
-        # API 호출
+        # 분석 작업 등록 (작업 ID를 바로 돌려받음)
         response = requests.post(
-            f"{API_BASE_URL}/analyze/youtube",
+            f"{API_BASE_URL}/jobs/youtube",
             json=request_data,
-            timeout=300  # 5분 타임아웃
+            timeout=30
         )
         
-        progress_bar.progress(60)
-        status_text.text("🔍 로고 탐지 중...")
+        if response.status_code != 200:
+            st.error(f"분석 요청 실패: {response.text}")
+            return
         
-        if response.status_code == 200:
-            progress_bar.progress(100)
-            status_text.text("✅ 분석 완료!")
+        job_id = response.json()["data"]["id"]
+        progress_bar.progress(20)
+        
+        # 작업이 끝날 때까지 상태 조회
+        status_messages = {
+            "queued": "⏳ 분석 대기 중...",
+            "running": "🔍 영상 다운로드 및 로고 탐지 중..."
+        }
+        while True:
+            # 타임라인은 연속 구간(compact)으로 받아 응답 크기를 줄입니다
+            job_response = requests.get(
+                f"{API_BASE_URL}/jobs/{job_id}", params={"timeline_format": "compact"}, timeout=30
+            )
+            if job_response.status_code != 200:
+                st.error(f"작업 조회 실패: {job_response.text}")
+                return
             
-            result = response.json()
-            display_analysis_results(result)
+            job = job_response.json()["data"]
+            if job["status"] == "completed":
+                progress_bar.progress(100)
+                status_text.text("✅ 분석 완료!")
+                display_analysis_results(job["result"])
+                break
+            if job["status"] == "failed":
+                st.error(f"분석 실패: {job.get('error')}")
+                break
             
-        else:
-            st.error(f"분석 실패: {response.text}")
+            message = status_messages.get(job["status"], "🔄 분석 중...")
+            if job.get("queue_position"):
+                message += f" (대기 순번: {job['queue_position']})"
+            
+            # 프레임 단위 진행 상황이 있으면 실제 진행률과 남은 시간을 표시
+            job_progress = job.get("progress") or {}
+            percent = 20
+            if job_progress.get("frames_total"):
+                ratio = job_progress["frames_done"] / job_progress["frames_total"]
+                percent = 20 + int(ratio * 75)
+                message = f"🔍 로고 탐지 중... {job_progress['frames_done']}/{job_progress['frames_total']} 프레임"
+                if job_progress.get("eta_seconds") is not None:
+                    message += f" (약 {int(job_progress['eta_seconds'])}초 남음)"
+            elif job_progress.get("message"):
+                message = f"🔄 {job_progress['message']}"
+            status_text.text(message)
+            progress_bar.progress(min(percent, 95))
+            time.sleep(2)
             
-    except requests.exceptions.Timeout:
-        st.error("⏰ 분석 시간이 초과되었습니다. 더 짧은 영상을 시도해보세요.")
     except Exception as e:
         st.error(f"❌ 오류가 발생했습니다: {str(e)}")
     finally:
@@ -168,6 +200,7 @@ def analyze_uploaded_file(uploaded_file):
         
         response = requests.post(
             f"{API_BASE_URL}/analyze/upload",
+            params={"timeline_format": "compact"},
             files={"file": (uploaded_file.name, uploaded_file.getvalue(), uploaded_file.type)},
             timeout=300
         )
@@ -321,35 +354,42 @@ def display_timeline(brand_analysis):
     
     st.subheader("⏰ 브랜드 등장 타임라인")
     
-    # 타임라인 데이터 준비
+    # 타임라인 데이터 준비 (compact 형식은 연속 구간, expanded 형식은 프레임마다 한 구간)
     timeline_data = []
     for brand, data in brand_analysis.items():
-        for timestamp in data["timestamps"]:
+        intervals = data.get("intervals") or [
+            [timestamp, timestamp, 1, confidence]
+            for timestamp, confidence in zip(data.get("timestamps", []), data.get("confidence_scores", []))
+        ]
+        for start, end, frame_count, mean_confidence in intervals:
             timeline_data.append({
                 "브랜드": brand.upper(),
-                "시간": timestamp,
-                "등장": 1
+                "시작": start,
+                "끝": end,
+                "프레임 수": frame_count,
+                "평균 신뢰도": mean_confidence
             })
     
     if timeline_data:
         df_timeline = pd.DataFrame(timeline_data)
         
-        # 타임라인 차트
+        # 타임라인 차트 (점 크기는 구간에 포함된 프레임 수)
         fig_timeline = px.scatter(
             df_timeline,
-            x="시간",
+            x="시작",
             y="브랜드",
             color="브랜드",
+            size="프레임 수",
+            hover_data=["끝", "평균 신뢰도"],
             title="브랜드 등장 타임라인",
-            labels={"시간": "시간 (초)"},
-            size_max=10
+            labels={"시작": "시간 (초)"},
+            size_max=24
         )
-        fig_timeline.update_traces(marker=dict(size=12))
         st.plotly_chart(fig_timeline, use_container_width=True)
         
         # 상세 타임라인 테이블
         with st.expander("상세 타임라인 보기"):
-            st.dataframe(df_timeline.sort_values("시간"), use_container_width=True)
+            st.dataframe(df_timeline.sort_values("시작"), use_container_width=True)
 
 def check_model_status():
     """모델 상태를 확인합니다."""
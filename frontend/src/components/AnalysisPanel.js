@@ -2,6 +2,7 @@ import React, { useState } from 'react';
 import { motion, AnimatePresence } from 'framer-motion';
 import { Upload, Youtube, Play, Settings, ArrowLeft } from 'lucide-react';
 import { useAuth } from '../contexts/AuthContext';
+import { useWebSocket } from '../contexts/WebSocketContext';
 import './AnalysisPanel.css';
 
 // 백엔드 API URL
@@ -9,6 +10,7 @@ const API_BASE_URL = 'http://localhost:8000';
 
 const AnalysisPanel = ({ onAnalysisComplete, onAnalysisStart, isAnalyzing, onBackToDashboard }) => {
   const { user } = useAuth();
+  const { analysisProgress, clearAnalysisProgress } = useWebSocket();
   const [activeTab, setActiveTab] = useState('youtube');
   const [youtubeUrl, setYoutubeUrl] = useState('');
   const [file, setFile] = useState(null);
@@ -25,6 +27,7 @@ const AnalysisPanel = ({ onAnalysisComplete, onAnalysisStart, isAnalyzing, onBac
     }
 
     onAnalysisStart();
+    clearAnalysisProgress();
     setIsLoadingModalOpen(true);
 
     try {
@@ -81,6 +84,7 @@ const AnalysisPanel = ({ onAnalysisComplete, onAnalysisStart, isAnalyzing, onBac
     }
 
     onAnalysisStart();
+    clearAnalysisProgress();
     setIsLoadingModalOpen(true);
 
     try {
@@ -116,6 +120,47 @@ const AnalysisPanel = ({ onAnalysisComplete, onAnalysisStart, isAnalyzing, onBac
     }
   };
 
+  // 서버에서 받은 진행 상황을 모달에 표시할 문구로 변환
+  const stageLabels = {
+    downloading: '영상 다운로드 중...',
+    analyzing: '분석 준비 중...',
+    coarse_scan: '영상 훑어보는 중...',
+    refine: '브랜드 구간 정밀 분석 중...',
+    inference: '브랜드 로고 탐지 중...',
+    summarizing: '결과 요약 중...',
+    completed: '분석 완료',
+    failed: '분석 실패'
+  };
+
+  const renderProgress = () => {
+    if (!analysisProgress) {
+      return <p>분석 중...</p>;
+    }
+
+    const { stage, frames_done, frames_total, frames_per_second, eta_seconds, brand_counts } = analysisProgress;
+    const percent = frames_total ? Math.round((frames_done / frames_total) * 100) : null;
+    const topBrands = Object.entries(brand_counts || {})
+      .sort((a, b) => b[1] - a[1])
+      .slice(0, 3);
+
+    return (
+      <>
+        <p>{stageLabels[stage] || '분석 중...'}</p>
+        {percent !== null && (
+          <p className="analysis-progress-detail">
+            {frames_done} / {frames_total} 프레임 ({percent}%) · {frames_per_second} fps
+            {eta_seconds !== null && eta_seconds !== undefined && ` · 약 ${Math.ceil(eta_seconds)}초 남음`}
+          </p>
+        )}
+        {topBrands.length > 0 && (
+          <p className="analysis-progress-detail">
+            {topBrands.map(([brand, count]) => `${brand} ${count}`).join(', ')}
+          </p>
+        )}
+      </>
+    );
+  };
+
   const handleFileSelect = (event) => {
     const selectedFile = event.target.files[0];
     if (selectedFile) {
@@ -305,7 +350,7 @@ const AnalysisPanel = ({ onAnalysisComplete, onAnalysisStart, isAnalyzing, onBac
             >
               <div className="analysis-loading-content">
                 <div className="loading-spinner"></div>
-                <p>분석 중...</p>
+                {renderProgress()}
               </div>
             </motion.div>
           </motion.div>
@@ -15,6 +15,7 @@ export const WebSocketProvider = ({ children }) => {
   const { user } = useAuth();
   const [notifications, setNotifications] = useState([]);
   const [unreadCount, setUnreadCount] = useState(0);
+  const [analysisProgress, setAnalysisProgress] = useState(null);
   const wsRef = useRef(null);
   const reconnectTimeoutRef = useRef(null);
 
@@ -53,6 +54,13 @@ export const WebSocketProvider = ({ children }) => {
         ws.onmessage = (event) => {
           try {
             const notification = JSON.parse(event.data);
+            
+            // 분석 진행 상황은 알림 목록에 넣지 않고 별도로 보관
+            if (notification.type === 'analysis_progress') {
+              setAnalysisProgress(notification);
+              return;
+            }
+            
             console.log('📬 새 알림 수신:', notification);
             
             // 알림 목록 업데이트 (최신이 먼저)
@@ -99,6 +107,7 @@ export const WebSocketProvider = ({ children }) => {
       }
       setNotifications([]);
       setUnreadCount(0);
+      setAnalysisProgress(null);
     }
 
     return () => {
@@ -192,7 +201,9 @@ export const WebSocketProvider = ({ children }) => {
     markAsRead,
     markAllAsRead,
     deleteNotification,
-    refreshNotifications: loadNotifications
+    refreshNotifications: loadNotifications,
+    analysisProgress,
+    clearAnalysisProgress: () => setAnalysisProgress(null)
   };
 
   return (
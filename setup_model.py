@@ -59,6 +59,72 @@ def setup_model(source_model_path: str, target_name: str = "logo_detection.pt"):
     
     return True
 
+def export_model(source_model_path: str, export_format: str = "onnx", int8: bool = False,
+                 imgsz: int = 1280, data: str = None):
+    """
+    .pt 모델을 CPU 추론용 ONNX 또는 OpenVINO 모델로 변환합니다.
+    
+    결과는 models 디렉토리에 백엔드가 찾는 이름 규칙으로 저장됩니다.
+      onnx:     models/<이름>.onnx, models/<이름>_int8.onnx
+      openvino: models/<이름>_openvino_model/, models/<이름>_int8_openvino_model/
+    
+    Args:
+        source_model_path: 변환할 .pt 모델 경로
+        export_format: "onnx" 또는 "openvino"
+        int8: INT8 양자화 여부
+        imgsz: 고정 입력 크기 (학습 크기와 같게 유지)
+        data: OpenVINO INT8 보정에 사용할 데이터셋 yaml (없으면 Ultralytics 기본값)
+    """
+    if export_format not in ("onnx", "openvino"):
+        print(f"❌ 지원하지 않는 형식입니다: {export_format}")
+        return None
+    
+    if not os.path.exists(source_model_path):
+        print(f"❌ 모델 파일을 찾을 수 없습니다: {source_model_path}")
+        return None
+    
+    models_dir = "models"
+    os.makedirs(models_dir, exist_ok=True)
+    stem = os.path.splitext(os.path.basename(source_model_path))[0]
+    
+    try:
+        model = YOLO(source_model_path)
+        print(f"🔄 {export_format} 변환 중... (입력 크기: {imgsz}, INT8: {int8})")
+        
+        if export_format == "openvino":
+            export_args = {"format": "openvino", "imgsz": imgsz, "int8": int8}
+            if int8 and data:
+                export_args["data"] = data
+            exported_path = model.export(**export_args)
+            target_path = os.path.join(models_dir, f"{stem}_int8_openvino_model" if int8 else f"{stem}_openvino_model")
+        else:
+            # ONNX는 FP32로 변환한 뒤 필요하면 onnxruntime으로 가중치를 INT8 양자화합니다
+            exported_path = model.export(format="onnx", imgsz=imgsz, simplify=True)
+            target_path = os.path.join(models_dir, f"{stem}.onnx")
+            if int8:
+                from onnxruntime.quantization import QuantType, quantize_dynamic
+                
+                int8_path = os.path.join(models_dir, f"{stem}_int8.onnx")
+                quantize_dynamic(str(exported_path), int8_path, weight_type=QuantType.QUInt8)
+                print(f"✅ INT8 양자화 완료: {int8_path}")
+        
+        # Ultralytics는 원본 모델 옆에 결과를 만들므로 models 디렉토리로 옮깁니다
+        exported_path = str(exported_path).rstrip("/\\")
+        if os.path.abspath(exported_path) != os.path.abspath(target_path):
+            if os.path.isdir(target_path):
+                shutil.rmtree(target_path)
+            shutil.move(exported_path, target_path)
+        
+        result_path = os.path.join(models_dir, f"{stem}_int8.onnx") if export_format == "onnx" and int8 else target_path
+        print(f"✅ 모델 변환 완료: {result_path}")
+        print("\n백엔드에서 사용하려면 환경 변수를 설정하세요:")
+        print(f"  LOGO_MODEL_BACKEND={export_format} LOGO_MODEL_PRECISION={'int8' if int8 else 'fp32'} LOGO_MODEL_IMGSZ={imgsz}")
+        return result_path
+    
+    except Exception as e:
+        print(f"❌ 모델 변환 실패: {e}")
+        return None
+
 def list_available_models():
     """사용 가능한 모델 목록을 표시합니다."""
     models_dir = "models"
@@ -67,17 +133,23 @@ def list_available_models():
         print("📁 models 디렉토리가 없습니다.")
         return
     
-    model_files = [f for f in os.listdir(models_dir) if f.endswith('.pt')]
+    model_files = [f for f in os.listdir(models_dir) if f.endswith(('.pt', '.onnx', '_openvino_model'))]
     
     if not model_files:
-        print("📁 models 디렉토리에 .pt 파일이 없습니다.")
+        print("📁 models 디렉토리에 모델 파일이 없습니다.")
         return
     
     print("📋 사용 가능한 모델:")
     for i, model_file in enumerate(model_files, 1):
         model_path = os.path.join(models_dir, model_file)
-        size_mb = os.path.getsize(model_path) / (1024*1024)
-        print(f"  {i}. {model_file} ({size_mb:.1f} MB)")
+        if os.path.isdir(model_path):
+            size = sum(
+                os.path.getsize(os.path.join(root, name))
+                for root, _, names in os.walk(model_path) for name in names
+            )
+        else:
+            size = os.path.getsize(model_path)
+        print(f"  {i}. {model_file} ({size / (1024*1024):.1f} MB)")
 
 def main():
     print("🎯 YOLO 모델 설정 유틸리티")
@@ -87,15 +159,26 @@ def main():
         print("사용법:")
         print("  python setup_model.py <모델_파일_경로>")
         print("  python setup_model.py list  # 사용 가능한 모델 목록")
+        print("  python setup_model.py export <모델_파일_경로> [onnx|openvino] [--int8] [--imgsz 1280] [--data 데이터셋.yaml]")
         print("\n예시:")
         print("  python setup_model.py /path/to/your/trained_model.pt")
         print("  python setup_model.py ../my_models/logo_detection_v2.pt")
+        print("  python setup_model.py export models/best_1280.pt openvino --int8")
         return
     
     command = sys.argv[1]
     
     if command == "list":
         list_available_models()
+    elif command == "export":
+        if len(sys.argv) < 3:
+            print("❌ 변환할 모델 파일 경로를 입력하세요.")
+            return
+        args = sys.argv[3:]
+        export_format = args[0] if args and not args[0].startswith("--") else "onnx"
+        imgsz = int(args[args.index("--imgsz") + 1]) if "--imgsz" in args else 1280
+        data = args[args.index("--data") + 1] if "--data" in args else None
+        export_model(sys.argv[2], export_format, "--int8" in args, imgsz, data)
     elif os.path.exists(command):
         # 모델 파일 경로가 주어진 경우
         setup_model(command)
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# 저장소 루트에서 backend 패키지를 import할 수 있게 합니다 (benchmarks/와 같은 방식)
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,24 @@
+import pytest
+
+from backend.services.analysis_cache_service import AnalysisCacheService
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    return AnalysisCacheService()
+
+
+def test_invalidate_matching_removes_entries_pointing_at_raw_detections(cache):
+    cache.put("a", {"analysis_settings": {"raw_detections_id": "raw-1"}})
+    cache.put("b", {"analysis_settings": {"raw_detections_id": "raw-2"}})
+    cache.put("c", {"analysis_settings": {}})
+
+    removed = cache.invalidate_matching(
+        lambda response: response.get("analysis_settings", {}).get("raw_detections_id") == "raw-1"
+    )
+
+    assert removed == 1
+    assert cache.get("a") is None
+    assert cache.get("b") is not None
+    assert cache.get("c") is not None
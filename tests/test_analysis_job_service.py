@@ -0,0 +1,23 @@
+import asyncio
+
+from backend.services.analysis_job_service import AnalysisJobService
+
+
+def test_get_job_only_returns_jobs_of_the_given_user():
+    async def scenario():
+        service = AnalysisJobService()
+        service.worker_count = 0
+        await service.start()
+
+        async def runner(job_id):
+            return {}
+
+        job_id = service.submit("youtube", runner, "alice@example.com")["id"]
+        return [
+            service.get_job(job_id, username=username)
+            for username in (None, "alice@example.com", "bob@example.com")
+        ]
+
+    anonymous, owner, other = asyncio.run(scenario())
+    assert anonymous["username"] == owner["username"] == "alice@example.com"
+    assert other is None
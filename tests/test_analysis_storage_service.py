@@ -0,0 +1,141 @@
+import random
+import sqlite3
+from collections import defaultdict
+
+import pytest
+
+from backend.services.analysis_storage_service import AnalysisStorageService
+
+TOP_BRANDS_QUERY = (
+    "SELECT brand, appearances, total_seconds FROM brand_totals WHERE scope = ? "
+    "ORDER BY appearances DESC, brand LIMIT ?"
+)
+
+
+@pytest.fixture
+def storage(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    return AnalysisStorageService()
+
+
+def make_analysis(rng):
+    brands = rng.sample(["nike", "adidas", "pepsi", "samsung", "apple", "lg"], rng.randint(0, 4))
+    return {
+        "brand_analysis": {
+            brand: {
+                "appearances": rng.randint(1, 5),
+                "total_seconds": round(rng.uniform(0.5, 20), 3),
+                "timestamps": [],
+                "confidence_scores": [],
+                "average_confidence": 0.8
+            }
+            for brand in brands
+        },
+        "total_analysis_time": round(rng.uniform(1, 30), 2),
+        "analysis_settings": {"frame_interval": 0.5}
+    }
+
+
+def summary_from_scratch(saved, username=None, top_k=10):
+    """저장된 분석 목록에서 집계 없이 바로 계산한 통계 요약 (비교 기준)."""
+    analyses = [analysis for analysis, owner in saved if username is None or owner == username]
+    appearances, seconds = defaultdict(int), defaultdict(float)
+    for analysis in analyses:
+        for brand, brand_data in analysis["brand_analysis"].items():
+            appearances[brand] += brand_data["appearances"]
+            seconds[brand] += brand_data["total_seconds"]
+    ranked = sorted(appearances, key=lambda brand: (-appearances[brand], brand))[:top_k]
+    return {
+        "total_analyses": len(analyses),
+        "total_brands_detected": len(appearances),
+        "most_common_brands": [
+            {"name": brand, "total_appearances": appearances[brand], "total_seconds": round(seconds[brand], 3)}
+            for brand in ranked
+        ],
+        "average_analysis_time": round(sum(a["total_analysis_time"] for a in analyses) / len(analyses), 2)
+        if analyses else 0
+    }
+
+
+def assert_summary_matches(storage, saved, username=None, top_k=10):
+    summary = storage.get_statistics_summary(username, top_k)
+    expected = summary_from_scratch(saved, username, top_k)
+    for key, value in expected.items():
+        assert summary[key] == value, key
+
+
+def test_incremental_aggregates_match_rebuild_after_save_and_delete(storage):
+    rng = random.Random(0)
+    saved = {}
+    for _ in range(60):
+        username = rng.choice([None, "a@example.com", "b@example.com"])
+        analysis = make_analysis(rng)
+        saved[storage.save_analysis(analysis, "youtube", username)] = (analysis, username)
+
+    for analysis_id in rng.sample(sorted(saved), 25):
+        assert storage.delete_analysis(analysis_id, saved[analysis_id][1])
+        del saved[analysis_id]
+
+    for username in (None, "a@example.com", "b@example.com"):
+        assert_summary_matches(storage, saved.values(), username)
+    assert_summary_matches(storage, saved.values(), top_k=2)
+
+    result = storage.rebuild_statistics()
+    assert result["consistent"], result["differences"]
+    assert result["analyses_scanned"] == len(saved)
+
+
+def test_deleting_every_analysis_empties_aggregates(storage):
+    rng = random.Random(1)
+    ids = [storage.save_analysis(make_analysis(rng), "upload", "a@example.com") for _ in range(5)]
+    for analysis_id in ids:
+        assert storage.delete_analysis(analysis_id, "a@example.com")
+
+    connection = storage._connect()
+    assert connection.execute("SELECT COUNT(*) FROM analysis_totals").fetchone()[0] == 0
+    assert connection.execute("SELECT COUNT(*) FROM brand_totals").fetchone()[0] == 0
+    assert storage.get_statistics_summary()["total_analyses"] == 0
+
+
+def test_rebuild_reports_and_repairs_drifted_aggregates(storage):
+    rng = random.Random(2)
+    saved = {}
+    for _ in range(10):
+        analysis = make_analysis(rng)
+        saved[storage.save_analysis(analysis, "youtube", None)] = (analysis, None)
+    connection = storage._connect()
+    with connection:
+        connection.execute("UPDATE brand_totals SET appearances = appearances + 100")
+
+    result = storage.rebuild_statistics()
+
+    assert not result["consistent"]
+    assert result["difference_count"] > 0
+    assert_summary_matches(storage, saved.values())
+
+
+def test_top_brands_query_reads_index_without_sorting(storage):
+    plan = storage._connect().execute("EXPLAIN QUERY PLAN " + TOP_BRANDS_QUERY, ("*", 10)).fetchall()
+    details = " ".join(row["detail"] for row in plan)
+
+    assert "idx_brand_totals_scope_ranking" in details
+    assert "TEMP B-TREE" not in details
+
+
+def test_existing_database_replaces_old_ranking_index(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    AnalysisStorageService()
+    connection = sqlite3.connect("analysis_results/analysis_history.db")
+    connection.execute("DROP INDEX idx_brand_totals_scope_ranking")
+    connection.execute("CREATE INDEX idx_brand_totals_scope_appearances ON brand_totals (scope, appearances)")
+    connection.commit()
+    connection.close()
+
+    indexes = {
+        row["name"] for row in AnalysisStorageService()._connect().execute(
+            "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'brand_totals'"
+        )
+    }
+
+    assert "idx_brand_totals_scope_ranking" in indexes
+    assert "idx_brand_totals_scope_appearances" not in indexes
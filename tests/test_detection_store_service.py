@@ -0,0 +1,88 @@
+import random
+
+import pytest
+
+from backend.services.analysis_pipeline_service import AnalysisPipelineService
+from backend.services.detection_store_service import DetectionStoreService
+from backend.services.logo_detection_service import LogoDetectionService
+from backend.services.video_processing_service import VideoProcessingService
+
+FRAME_INTERVAL = 0.5
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    return DetectionStoreService()
+
+
+@pytest.fixture
+def pipeline():
+    # 모델은 필요 없으므로 초기화(모델 로드) 없이 요약 메서드만 사용합니다
+    return AnalysisPipelineService(VideoProcessingService(), LogoDetectionService.__new__(LogoDetectionService))
+
+
+def make_results(frame_count=200, seed=0):
+    """움직이는 로고 두 개와 기준값(0.5) 바로 아래/위 신뢰도가 섞인 프레임별 탐지 결과를 만듭니다."""
+    rng = random.Random(seed)
+    results = []
+    for frame in range(frame_count):
+        detections = []
+        for brand, offset in (("nike", 0), ("adidas", 300)):
+            if rng.random() < 0.8:
+                x = offset + frame * 2.0 + rng.uniform(-1, 1)
+                detections.append({
+                    "brand": brand,
+                    "confidence": rng.choice([0.5 - 1e-9, 0.5 + 1e-9, rng.uniform(0.1, 1.0)]),
+                    "bbox": [x, 100.0 + rng.uniform(-1, 1), x + 80.3, 180.7]
+                })
+        results.append({"timestamp": round(frame * FRAME_INTERVAL, 3), "detections": detections})
+    return results
+
+
+def test_store_round_trip_keeps_values(store):
+    results = make_results()
+    columns = store.load(store.save(results, {"frame_interval": FRAME_INTERVAL, "confidence_floor": 0.1}))
+
+    assert columns["metadata"]["frame_interval"] == FRAME_INTERVAL
+    assert store.to_frame_results(columns) == results
+
+
+def test_min_confidence_matches_unrounded_threshold(store):
+    results = make_results()
+    columns = store.load(store.save(results, {}))
+
+    # float32로 저장하면 0.5 - 1e-9가 0.5로 반올림되어 기준을 통과합니다
+    filtered = store.to_frame_results(columns, min_confidence=0.5)
+    expected = [
+        {**result, "detections": [d for d in result["detections"] if d["confidence"] >= 0.5]}
+        for result in results
+    ]
+    assert filtered == expected
+
+
+@pytest.mark.parametrize("confidence", [0.5, 0.3])
+def test_rethreshold_from_store_matches_original(store, pipeline, confidence):
+    results = make_results()
+    columns = store.load(store.save(results, {"frame_interval": FRAME_INTERVAL, "track_stride": 1}))
+
+    expected = pipeline.resummarize_sync(make_results(), FRAME_INTERVAL, 1, confidence)
+    actual = pipeline.resummarize_sync(store.to_frame_results(columns), FRAME_INTERVAL, 1, confidence)
+
+    assert actual == expected
+
+
+def test_rethreshold_with_brand_filter(store, pipeline):
+    columns = store.load(store.save(make_results(), {}))
+
+    brand_analysis = pipeline.resummarize_sync(store.to_frame_results(columns, brands=["nike"]), FRAME_INTERVAL, 1, 0.3)
+
+    assert list(brand_analysis) == ["nike"]
+
+
+def test_delete_removes_store(store):
+    store_id = store.save(make_results(10), {})
+
+    assert store.delete(store_id)
+    assert store.load(store_id) is None
+    assert not store.delete(store_id)
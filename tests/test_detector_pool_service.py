@@ -0,0 +1,17 @@
+from types import SimpleNamespace
+
+import cv2
+
+from backend.services.detector_pool_service import DetectorPool
+
+
+def test_pool_sets_total_thread_budget_once(monkeypatch):
+    calls = []
+    monkeypatch.setattr(cv2, "setNumThreads", calls.append)
+    models = [SimpleNamespace(names={}) for _ in range(3)]
+
+    pool = DetectorPool(models, lambda batch, model, **options: [], 2, {"version": "v1"})
+    # 탐지 스레드가 나중에 값을 덮어쓰지 않도록 풀을 만들 때 한 번만 설정합니다
+    assert [detector.detect_batch([]) for detector in pool.detectors] == [[], [], []]
+    assert calls == [6]
+    pool.retire()
@@ -0,0 +1,132 @@
+import asyncio
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from backend.services.detector_pool_service import DetectorPool
+from backend.services.logo_detection_service import LogoDetectionService
+from backend.services.model_registry_service import ModelRegistryService
+
+
+def make_pool(config):
+    model = SimpleNamespace(names={0: config["path"]})
+    return DetectorPool([model], lambda batch, model, **options: [], 1, config)
+
+
+@pytest.fixture
+def service(monkeypatch):
+    service = LogoDetectionService(load_model=False)
+    service.model_version = "v1"
+    service._install_pool(make_pool(service._current_config()))
+    service.load_state = "ready"
+
+    # 모델 로드 대신 테스트가 finish를 설정할 때까지 기다렸다가 풀을 만듭니다
+    service.load_started = threading.Event()
+    service.load_finish = threading.Event()
+
+    def prepare_pool(config):
+        service.load_started.set()
+        assert service.load_finish.wait(5)
+        if config["path"] == "models/broken.pt":
+            raise Exception("모델 파일이 손상되었습니다")
+        return make_pool(config)
+
+    monkeypatch.setattr(service, "_prepare_pool", prepare_pool)
+    return service
+
+
+async def wait_until_loading(service):
+    # 이벤트 루프가 막혀 있으면 이 대기도 진행되지 않습니다
+    loop = asyncio.get_event_loop()
+    assert await loop.run_in_executor(None, service.load_started.wait, 5)
+
+
+def test_set_model_path_swaps_after_background_load(service):
+    old_pool = service.pool
+    old_path = service.model_path
+
+    async def scenario():
+        task = asyncio.ensure_future(service.set_model_path("models/new.pt"))
+        await wait_until_loading(service)
+
+        assert service.pool is old_pool
+        assert service.model_path == old_path
+        assert service.loading_version not in (None, service.model_version)
+
+        service.load_finish.set()
+        await task
+
+    asyncio.run(scenario())
+    assert service.pool is not old_pool
+    assert service.model_path == "models/new.pt"
+    assert service.brand_classes == {0: "models/new.pt"}
+    assert service.loading_version is None
+
+
+def test_set_model_path_keeps_current_model_when_load_fails(service):
+    old_pool = service.pool
+
+    async def scenario():
+        service.load_finish.set()
+        await service.set_model_path("models/broken.pt")
+
+    with pytest.raises(Exception, match="손상"):
+        asyncio.run(scenario())
+    assert service.pool is old_pool
+    assert service.model_path != "models/broken.pt"
+    assert service.is_ready()
+    assert "손상" in service.last_load_error
+
+
+def test_set_inference_backend_swaps_backend_and_precision(service):
+    async def scenario():
+        task = asyncio.ensure_future(service.set_inference_backend("onnx", "int8"))
+        await wait_until_loading(service)
+        assert service.inference_backend == "pytorch"
+        service.load_finish.set()
+        await task
+
+    asyncio.run(scenario())
+    assert (service.inference_backend, service.model_precision) == ("onnx", "int8")
+
+
+def test_second_swap_is_rejected_while_loading(service):
+    async def scenario():
+        task = asyncio.ensure_future(service.set_model_path("models/new.pt"))
+        await wait_until_loading(service)
+        with pytest.raises(Exception, match="로드하는 중"):
+            await service.set_inference_backend("onnx")
+        service.load_finish.set()
+        await task
+
+    asyncio.run(scenario())
+
+
+def test_set_model_path_switches_to_a_new_version(service):
+    async def scenario():
+        service.load_finish.set()
+        await service.set_model_path("models/new.pt")
+
+    asyncio.run(scenario())
+    assert service.model_version == "new-pytorch-fp32-1280"
+    assert service.get_model_identity().startswith("new-pytorch-fp32-1280:")
+
+
+def test_swap_resolves_and_registers_versions(service, tmp_path):
+    registry = ModelRegistryService()
+    registry.registry_file = str(tmp_path / "model_registry.json")
+    registry.register("models/new.pt", "v2", "onnx", "int8", 1280)
+    service.model_registry = registry
+
+    async def scenario():
+        service.load_finish.set()
+        await service.set_model_path("models/new.pt")
+        assert service.model_version == "new-pytorch-fp32-1280"
+        await service.set_inference_backend("onnx", "int8")
+
+    asyncio.run(scenario())
+    # 등록된 설정이면 그 버전으로, 아니면 새 버전을 등록해 사용 중인 버전으로 기록합니다
+    assert service.model_version == "v2"
+    assert registry.get_active()["version"] == "v2"
+    assert registry.get("new-pytorch-fp32-1280")["path"] == "models/new.pt"
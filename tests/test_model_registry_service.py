@@ -0,0 +1,26 @@
+import pytest
+
+from backend.services.model_registry_service import ModelRegistryService
+
+
+@pytest.fixture
+def registry(tmp_path):
+    registry = ModelRegistryService()
+    registry.registry_file = str(tmp_path / "model_registry.json")
+    return registry
+
+
+def test_register_assigns_sequential_versions(registry):
+    assert registry.register("models/a.pt")["version"] == "v1"
+    assert registry.register("models/b.onnx", backend="onnx", precision="int8")["version"] == "v2"
+    assert registry.find("models/b.onnx", "onnx", "int8", 1280)["version"] == "v2"
+
+
+@pytest.mark.parametrize("options, message", [
+    ({"backend": "tensorrt"}, "추론 백엔드"),
+    ({"precision": "fp16"}, "정밀도"),
+])
+def test_register_rejects_unsupported_backend_and_precision(registry, options, message):
+    with pytest.raises(Exception, match=message):
+        registry.register("models/a.pt", **options)
+    assert registry.list_versions() == []
@@ -0,0 +1,126 @@
+import random
+
+import pytest
+
+from backend.services.timeline_encoding import (
+    compact_brand_analysis,
+    decode_intervals,
+    encode_intervals,
+    expand_brand_analysis,
+    format_analysis,
+    format_brand_analysis,
+)
+
+
+def sampled_timestamps(fps, frame_interval, seconds, keep=1.0, seed=0):
+    """grab 샘플링처럼 간격마다 가장 가까운 프레임의 시각(소수점 3자리)을 고르고, 일부 프레임은 빠뜨립니다."""
+    rng = random.Random(seed)
+    timestamps = []
+    target = 0.0
+    while target < seconds:
+        if rng.random() < keep:
+            timestamps.append(round(round(target * fps) / fps, 3))
+        target += frame_interval
+    return timestamps
+
+
+def test_regular_runs_round_trip_exactly():
+    timestamps = [0.0, 0.5, 1.0, 1.5, 4.0, 4.5, 10.0]
+    scores = [0.9, 0.8, 0.7, 0.6, 0.5, 0.7, 0.4]
+
+    intervals = encode_intervals(timestamps, scores, 0.5)
+
+    assert intervals == [[0.0, 1.5, 4, 0.75], [4.0, 4.5, 2, 0.6], [10.0, 10.0, 1, 0.4]]
+    decoded_timestamps, decoded_scores = decode_intervals(intervals)
+    assert decoded_timestamps == timestamps
+    # 구간 안의 신뢰도는 평균으로 채우므로 등장 횟수 가중 평균은 그대로입니다
+    assert decoded_scores == [0.75] * 4 + [0.6] * 2 + [0.4]
+    assert sum(decoded_scores) == pytest.approx(sum(scores))
+
+
+@pytest.mark.parametrize("fps", [25, 30000 / 1001, 60])
+@pytest.mark.parametrize("frame_interval", [0.5, 1.0, 2.0])
+def test_sampled_timestamps_round_trip_within_rounding(fps, frame_interval):
+    timestamps = sampled_timestamps(fps, frame_interval, 600, keep=0.85, seed=int(fps * frame_interval))
+    scores = [0.5] * len(timestamps)
+
+    intervals = encode_intervals(timestamps, scores, frame_interval)
+    decoded, _ = decode_intervals(intervals)
+
+    assert len(decoded) == len(timestamps)
+    assert max(abs(a - b) for a, b in zip(decoded, timestamps)) <= 0.0015
+    assert sum(interval[2] for interval in intervals) == len(timestamps)
+
+
+def test_gap_longer_than_one_and_a_half_intervals_starts_new_interval():
+    intervals = encode_intervals([0.0, 0.5, 1.3, 1.8], [1, 1, 1, 1], 0.5)
+
+    assert [interval[:3] for interval in intervals] == [[0.0, 0.5, 2], [1.3, 1.8, 2]]
+
+
+def test_step_estimated_when_frame_interval_unknown():
+    intervals = encode_intervals([0.0, 2.0, 4.0, 10.0], [1, 1, 1, 1])
+
+    assert [interval[:3] for interval in intervals] == [[0.0, 4.0, 3], [10.0, 10.0, 1]]
+
+
+def test_empty_timeline():
+    assert encode_intervals([], [], 0.5) == []
+    assert decode_intervals([]) == ([], [])
+
+
+def brand_analysis():
+    return {
+        "nike": {
+            "appearances": 5,
+            "total_seconds": 3.0,
+            "timestamps": [0.0, 0.5, 1.0, 3.0, 3.5],
+            "confidence_scores": [0.9, 0.7, 0.8, 0.6, 0.6],
+            "average_confidence": 0.72,
+            "exposures": [{"track_id": 1, "start": 0.0, "end": 1.5}]
+        },
+        "pepsi": {"appearances": 0, "total_seconds": 0, "timestamps": [], "confidence_scores": []}
+    }
+
+
+def test_brand_analysis_round_trip_keeps_summary_fields():
+    original = brand_analysis()
+
+    compact = compact_brand_analysis(original, 0.5)
+    expanded = expand_brand_analysis(compact)
+
+    assert "timestamps" not in compact["nike"]
+    assert compact["nike"]["intervals"] == [[0.0, 1.0, 3, 0.8], [3.0, 3.5, 2, 0.6]]
+    assert expanded["nike"]["timestamps"] == original["nike"]["timestamps"]
+    for key in ("appearances", "total_seconds", "average_confidence", "exposures"):
+        assert expanded["nike"][key] == original["nike"][key]
+    assert expanded["pepsi"]["timestamps"] == []
+    # 입력은 바꾸지 않습니다
+    assert original == brand_analysis()
+
+
+def test_compact_and_expand_are_idempotent():
+    compact = compact_brand_analysis(brand_analysis(), 0.5)
+    expanded = expand_brand_analysis(compact)
+
+    assert compact_brand_analysis(compact, 0.5) == compact
+    assert expand_brand_analysis(expanded) == expanded
+    assert format_brand_analysis(compact, "compact") == compact
+
+
+def test_format_analysis_uses_frame_interval_from_settings():
+    analysis = {
+        "brand_analysis": {"nike": {"timestamps": [0.0, 2.0, 4.0], "confidence_scores": [1, 1, 1]}},
+        "analysis_settings": {"frame_interval": 1.0}
+    }
+
+    compact = format_analysis(analysis, "compact")
+
+    # 2초 간격은 frame_interval(1초)의 1.5배보다 멀어 각각 따로 묶입니다
+    assert len(compact["brand_analysis"]["nike"]["intervals"]) == 3
+    assert format_analysis({"video_info": {}}, "compact") == {"video_info": {}}
+
+
+def test_unknown_format_is_rejected():
+    with pytest.raises(ValueError):
+        format_brand_analysis(brand_analysis(), "columnar")
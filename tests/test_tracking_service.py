@@ -0,0 +1,158 @@
+import numpy as np
+import pytest
+
+from backend.services.tracking_service import ByteTracker, TrackingService, box_iou_matrix
+
+
+def detection(brand, x, confidence=0.9, y=100.0, size=50.0):
+    return {"brand": brand, "confidence": confidence, "bbox": [x, y, x + size, y + size]}
+
+
+def frame(timestamp, *detections):
+    return {"timestamp": timestamp, "detections": list(detections)}
+
+
+def track_ids(results):
+    return [[d.get("track_id") for d in result["detections"]] for result in results]
+
+
+@pytest.fixture
+def service():
+    return TrackingService()
+
+
+def test_box_iou_matrix():
+    a = np.array([[0, 0, 10, 10], [0, 0, 0, 0]], dtype=float)
+    b = np.array([[5, 0, 15, 10], [20, 20, 30, 30]], dtype=float)
+
+    iou = box_iou_matrix(a, b)
+
+    assert iou.shape == (2, 2)
+    assert iou[0, 0] == pytest.approx(50 / 150)
+    assert iou[0, 1] == 0
+    assert iou[1].tolist() == [0, 0]
+
+
+def test_moving_logo_keeps_one_track(service):
+    results = [frame(t * 0.5, detection("nike", 100 + t * 20)) for t in range(10)]
+
+    tracked, stats = service.track(results, 0.5)
+
+    assert {d["track_id"] for r in tracked for d in r["detections"]} == {1}
+    assert stats["tracks"] == 1
+
+
+def test_side_by_side_logos_of_same_brand_keep_separate_tracks(service):
+    results = [
+        frame(t * 0.5, detection("nike", 100 + t * 10), detection("nike", 300 - t * 10))
+        for t in range(6)
+    ]
+
+    tracked, stats = service.track(results, 0.5)
+
+    assert track_ids(tracked) == [[1, 2]] * 6
+    assert stats["tracks"] == 2
+
+
+def test_overlapping_logos_of_other_brands_are_not_associated(service):
+    results = [frame(0.0, detection("nike", 100)), frame(0.5, detection("adidas", 100))]
+
+    tracked, _ = service.track(results, 0.5)
+
+    assert track_ids(tracked) == [[1], [2]]
+
+
+def test_low_confidence_detection_continues_track_seen_in_previous_frame(service):
+    results = [
+        frame(0.0, detection("nike", 100)),
+        frame(0.5, detection("nike", 102, confidence=0.3)),
+        frame(1.0, detection("nike", 104)),
+    ]
+
+    tracked, stats = service.track(results, 0.5)
+
+    assert track_ids(tracked) == [[1], [1], [1]]
+    assert stats["tracks"] == 1
+
+
+def test_low_confidence_detection_does_not_revive_lost_track(service):
+    results = [
+        frame(0.0, detection("nike", 100)),
+        frame(0.5),
+        frame(1.0, detection("nike", 100, confidence=0.3)),
+    ]
+
+    tracked, _ = service.track(results, 0.5)
+
+    # 2차 연결은 직전 프레임에 보였던 트랙만 대상으로 합니다
+    assert track_ids(tracked) == [[1], [], [2]]
+
+
+def test_high_confidence_detection_revives_track_within_lost_window(service):
+    results = [frame(0.0, detection("nike", 100)), frame(0.5), frame(1.0, detection("nike", 100))]
+
+    tracked, _ = service.track(results, 0.5)
+
+    assert track_ids(tracked) == [[1], [], [1]]
+
+
+def test_track_lost_longer_than_window_starts_new_track(service):
+    results = [frame(0.0, detection("nike", 100)), frame(2.0, detection("nike", 100))]
+
+    tracked, stats = service.track(results, 0.5)
+
+    assert track_ids(tracked) == [[1], [2]]
+    assert stats["tracks"] == 2
+
+
+def test_new_track_confidence_filters_unmatched_detections():
+    tracker = ByteTracker(0.6, 0.3, 0.5, 1.0, new_track_confidence=0.5)
+    detections = [detection("nike", 100, confidence=0.4), detection("pepsi", 300, confidence=0.7)]
+
+    tracker.update(0.0, detections)
+
+    assert "track_id" not in detections[0]
+    assert detections[1]["track_id"] == 1
+
+
+def test_stride_interpolates_skipped_frames(service):
+    # stride 3: 0.0, 1.5, 3.0초만 추론하고 사이 프레임을 보간합니다
+    results = [
+        frame(0.0, detection("nike", 100, confidence=0.9), detection("pepsi", 400)),
+        frame(1.5, detection("nike", 115, confidence=0.7)),
+        frame(3.0, detection("nike", 130, confidence=0.8)),
+    ]
+
+    tracked, stats = service.track(results, 0.5, stride=3)
+
+    assert [r["timestamp"] for r in tracked] == [0.0, 0.5, 1.0, 1.5, 2.0, 2.5, 3.0]
+    assert stats["frames_propagated"] == 4
+    propagated = [r for r in tracked if r.get("propagated")]
+    assert [r["timestamp"] for r in propagated] == [0.5, 1.0, 2.0, 2.5]
+    # 양쪽 추론 프레임에 모두 있는 트랙(nike)만 채우고, 위치는 선형 보간, 신뢰도는 양쪽 중 작은 값
+    for result, x in zip(propagated, [105, 110, 120, 125]):
+        (filled,) = result["detections"]
+        assert filled["brand"] == "nike"
+        assert filled["track_id"] == 1
+        assert filled["propagated"] is True
+        assert filled["confidence"] == 0.7
+        assert filled["bbox"] == pytest.approx([x, 100, x + 50, 150])
+
+
+def test_stride_does_not_fill_gaps_longer_than_sample_interval(service):
+    # 성긴 탐색 구간처럼 추론 간격(1.5초)보다 훨씬 떨어진 프레임 사이는 채우지 않습니다
+    results = [frame(0.0, detection("nike", 100)), frame(6.0, detection("nike", 100))]
+
+    tracked, stats = service.track(results, 0.5, stride=3)
+
+    assert [r["timestamp"] for r in tracked] == [0.0, 6.0]
+    assert stats["frames_propagated"] == 0
+
+
+def test_stride_one_does_not_interpolate(service):
+    results = [frame(0.0, detection("nike", 100)), frame(1.5, detection("nike", 130))]
+
+    tracked, stats = service.track(results, 0.5)
+
+    assert len(tracked) == 2
+    assert stats["frames_propagated"] == 0
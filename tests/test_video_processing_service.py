@@ -0,0 +1,154 @@
+import os
+
+import cv2
+import numpy as np
+import pytest
+
+from backend.services.video_processing_service import FrameLetterboxer, VideoProcessingService
+
+NTSC_FPS = 30000 / 1001
+
+
+def write_clip(path, fps: float, seconds: float, size=(96, 64)):
+    """프레임 번호가 다른 밝기로 보이는 테스트 영상을 만듭니다."""
+    writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*"mp4v"), fps, size)
+    assert writer.isOpened()
+    for index in range(int(round(seconds * fps))):
+        writer.write(np.full((size[1], size[0], 3), index % 250, dtype=np.uint8))
+    writer.release()
+    return str(path)
+
+
+@pytest.fixture(scope="module")
+def ntsc_clip(tmp_path_factory):
+    return write_clip(tmp_path_factory.mktemp("video") / "ntsc.mp4", NTSC_FPS, 30)
+
+
+@pytest.fixture(scope="module")
+def pal_clip(tmp_path_factory):
+    return write_clip(tmp_path_factory.mktemp("video") / "pal.mp4", 25, 10)
+
+
+@pytest.fixture
+def service():
+    service = VideoProcessingService()
+    service.decode_processes = 1
+    return service
+
+
+def timestamps(frames):
+    return [round(item[0], 3) for item in frames]
+
+
+@pytest.mark.parametrize("frame_interval", [0.5, 0.7, 1.0, 2.0, 5.0])
+def test_seek_matches_grab_on_ntsc_clip(service, ntsc_clip, frame_interval):
+    grab = timestamps(service.iter_frames(ntsc_clip, frame_interval, strategy="grab"))
+    seek = timestamps(service.iter_frames(ntsc_clip, frame_interval, strategy="seek"))
+
+    assert len(grab) == int(np.ceil(30 / frame_interval - 1e-9))
+    assert seek == grab
+
+
+def test_seek_uses_grab_half_frame_tolerance(service, pal_clip):
+    grab = timestamps(service.iter_frames(pal_clip, 0.5, strategy="grab"))
+    seek = timestamps(service.iter_frames(pal_clip, 0.5, strategy="seek"))
+
+    # 25fps에서 0.5초에 가장 가까운 프레임은 0.48초 프레임입니다
+    assert grab[1] == 0.48
+    assert seek == grab
+
+
+def test_seek_matches_grab_within_time_ranges(service, ntsc_clip):
+    time_ranges = [(3.0, 7.0), (20.0, 25.0)]
+    grab = timestamps(service.iter_frames(ntsc_clip, 0.5, strategy="grab", time_ranges=time_ranges))
+    seek = timestamps(service.iter_frames(ntsc_clip, 0.5, strategy="seek", time_ranges=time_ranges))
+    full = timestamps(service.iter_frames(ntsc_clip, 0.5, strategy="grab"))
+
+    assert seek == grab
+    assert grab == [t for t in full if 3.0 - 0.02 <= t <= 7.0 + 0.02 or 20.0 - 0.02 <= t <= 25.0 + 0.02]
+
+
+def test_grab_time_ranges_use_estimated_keyframe_interval(service, ntsc_clip, monkeypatch):
+    time_ranges = [(3.0, 7.0), (20.0, 25.0)]
+    expected = timestamps(service.iter_frames(ntsc_clip, 0.5, strategy="seek", time_ranges=time_ranges))
+
+    seeks = []
+    estimates = []
+    original_grab = service._iter_frames_grab
+
+    def grab(video_path, frame_interval, time_ranges=None, keyframe_interval=None):
+        seeks.append(keyframe_interval)
+        return original_grab(video_path, frame_interval, time_ranges, keyframe_interval)
+
+    monkeypatch.setattr(service, "estimate_keyframe_interval", lambda path: estimates.append(path) or 15.0)
+    monkeypatch.setattr(service, "_iter_frames_grab", grab)
+
+    # 13초 간격은 기본값(2초)보다 크지만 추정한 키프레임 간격(15초)보다 작으므로 탐색 없이 grab으로 넘어갑니다
+    assert timestamps(service.iter_frames(ntsc_clip, 0.5, strategy="grab", time_ranges=time_ranges)) == expected
+    assert seeks == [15.0]
+    assert estimates == [ntsc_clip]
+
+
+@pytest.mark.parametrize("strategy", ["grab", "seek"])
+def test_parallel_decode_matches_serial_order(service, ntsc_clip, strategy):
+    parallel_service = VideoProcessingService()
+    parallel_service.decode_processes = 2
+    parallel_service.parallel_decode_min_duration = 0
+    # 조각 수가 프로세스 수보다 훨씬 많아 결과가 뒤섞여 도착해도 순서대로 나와야 합니다
+    parallel_service.decode_chunk_seconds = 1.3
+
+    serial = list(service.iter_frames(ntsc_clip, 0.5, strategy=strategy))
+    parallel = list(parallel_service.iter_frames(ntsc_clip, 0.5, strategy=strategy))
+
+    assert timestamps(parallel) == timestamps(serial)
+    assert all(np.array_equal(a, b) for (_, a), (_, b) in zip(parallel, serial))
+
+
+
+def test_parallel_decode_letterboxes_in_workers(service, ntsc_clip):
+    parallel_service = VideoProcessingService()
+    parallel_service.decode_processes = 2
+    parallel_service.parallel_decode_min_duration = 0
+    parallel_service.decode_chunk_seconds = 4
+
+    # 테스트 영상(96x64)보다 작은 입력 크기로 줄여 작업 프로세스가 축소한 프레임을 보내게 합니다
+    serial = list(service.iter_frames(ntsc_clip, 1.0, strategy="grab", letterboxer=FrameLetterboxer(48, 0)))
+    parallel = list(parallel_service.iter_frames(ntsc_clip, 1.0, strategy="grab", letterboxer=FrameLetterboxer(48, 0)))
+
+    assert timestamps(parallel) == timestamps(serial)
+    for (_, image, transform), (_, expected_image, expected_transform) in zip(parallel, serial):
+        assert image.shape == (48, 48, 3)
+        assert np.array_equal(image, expected_image)
+        assert vars(transform) == vars(expected_transform)
+
+
+def test_shrink_then_place_matches_letterbox():
+    rng = np.random.default_rng(0)
+    frame = rng.integers(0, 255, size=(1080, 1920, 3), dtype=np.uint8)
+    letterboxer = FrameLetterboxer(640, 4)
+
+    expected, expected_transform = letterboxer.letterbox(frame)
+    expected = expected.copy()
+    small, transform = letterboxer.shrink(frame)
+    placed = letterboxer.place(small, transform)
+
+    assert small.shape == (360, 640, 3)
+    assert np.array_equal(placed, expected)
+    assert vars(transform) == vars(expected_transform)
+    assert np.array_equal(transform.content(placed), small)
+
+
+def test_parallel_decode_settings_from_environment(monkeypatch):
+    monkeypatch.setenv("DECODE_PROCESSES", "3")
+    monkeypatch.setenv("PARALLEL_DECODE_MIN_DURATION", "120")
+
+    service = VideoProcessingService()
+
+    assert service.decode_processes == 3
+    assert service.parallel_decode_min_duration == 120
+
+
+def test_parallel_decode_uses_all_cores_by_default(monkeypatch):
+    monkeypatch.delenv("DECODE_PROCESSES", raising=False)
+
+    assert VideoProcessingService().decode_processes == (os.cpu_count() or 1)
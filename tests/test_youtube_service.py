@@ -0,0 +1,185 @@
+import asyncio
+import copy
+import os
+
+import pytest
+
+from backend.services.youtube_service import YouTubeService
+
+URL = "https://www.youtube.com/watch?v=dQw4w9WgXcQ"
+
+
+class StubYoutubeDL:
+    """yt_dlp.YoutubeDL 대신 쓰는 스텁입니다. 다운로드하면 outtmpl 위치에 작은 파일을 씁니다."""
+
+    instances = []
+
+    def __init__(self, opts):
+        self.opts = opts
+        self.processed = []
+        self.downloaded = []
+        StubYoutubeDL.instances.append(self)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    @staticmethod
+    def sanitize_info(info, remove_private_keys=False):
+        StubYoutubeDL.sanitized = remove_private_keys
+        return copy.deepcopy(info)
+
+    def extract_info(self, url, download=False):
+        return {"id": "dQw4w9WgXcQ", "title": "stub", "__x_forwarded_for_ip": "203.0.113.7"}
+
+    def process_ie_result(self, info, download=True):
+        info["requested_downloads"] = [{"filepath": self._write()}]
+        self.processed.append(info)
+        return info
+
+    def download(self, urls):
+        self.downloaded.extend(urls)
+        self._write()
+
+    def _write(self):
+        path = self.opts["outtmpl"] % {"ext": "mp4"}
+        with open(path, "wb") as f:
+            f.write(b"stub")
+        return path
+
+
+@pytest.fixture
+def service(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    StubYoutubeDL.instances = []
+    return YouTubeService(ydl_factory=StubYoutubeDL)
+
+
+def test_download_with_info_uses_injected_sanitize_info(service):
+    info = service._extract_info_sync(URL)
+
+    video_path = service._download_sync(URL, "360p", info)
+
+    ydl = StubYoutubeDL.instances[-1]
+    assert video_path.endswith(".mp4")
+    assert ydl.downloaded == []
+    # 비공개 키는 그대로 넘기고, 캐시된 추출 정보는 바꾸지 않습니다
+    assert StubYoutubeDL.sanitized is False
+    assert ydl.processed[0]["__x_forwarded_for_ip"] == "203.0.113.7"
+    assert "requested_downloads" not in service._extract_info_sync(URL)
+
+
+class FakeDownloads:
+    """download_video 대신 호출 횟수를 세고, release()가 불릴 때까지 다운로드를 끝내지 않습니다."""
+
+    def __init__(self, directory, fail=False):
+        self.directory = directory
+        self.fail = fail
+        self.calls = 0
+        self.finished = asyncio.Event()
+
+    async def __call__(self, url, resolution="360p", info=None):
+        self.calls += 1
+        await self.finished.wait()
+        if self.fail:
+            raise Exception("다운로드 실패")
+        path = os.path.join(self.directory, f"video_{self.calls}.mp4")
+        with open(path, "wb") as f:
+            f.write(b"stub")
+        return path
+
+    def release(self):
+        self.finished.set()
+
+
+def run(coroutine_function):
+    return asyncio.run(coroutine_function())
+
+
+def test_concurrent_acquires_share_one_download(service, monkeypatch):
+    downloads = FakeDownloads(service.download_dir)
+    monkeypatch.setattr(service, "download_video", downloads)
+
+    async def scenario():
+        first = asyncio.ensure_future(service.acquire_video(URL))
+        second = asyncio.ensure_future(service.acquire_video("https://youtu.be/dQw4w9WgXcQ"))
+        await asyncio.sleep(0)
+        downloads.release()
+        first_path, second_path = await first, await second
+
+        assert downloads.calls == 1
+        assert first_path == second_path
+
+        service.release_video(first_path)
+        assert os.path.exists(first_path)
+        service.release_video(second_path)
+        assert not os.path.exists(first_path)
+        assert service._downloads == {}
+
+    run(scenario)
+
+
+def test_cancelled_waiter_does_not_cancel_shared_download(service, monkeypatch):
+    downloads = FakeDownloads(service.download_dir)
+    monkeypatch.setattr(service, "download_video", downloads)
+
+    async def scenario():
+        cancelled = asyncio.ensure_future(service.acquire_video(URL))
+        waiting = asyncio.ensure_future(service.acquire_video(URL))
+        await asyncio.sleep(0)
+        cancelled.cancel()
+        await asyncio.sleep(0)
+        downloads.release()
+        video_path = await waiting
+
+        assert cancelled.cancelled()
+        assert os.path.exists(video_path)
+        service.release_video(video_path)
+        assert not os.path.exists(video_path)
+        assert service._downloads == {}
+
+    run(scenario)
+
+
+def test_download_abandoned_by_all_waiters_is_removed_when_done(service, monkeypatch):
+    downloads = FakeDownloads(service.download_dir)
+    monkeypatch.setattr(service, "download_video", downloads)
+
+    async def scenario():
+        waiter = asyncio.ensure_future(service.acquire_video(URL))
+        await asyncio.sleep(0)
+        waiter.cancel()
+        await asyncio.sleep(0)
+        assert service._downloads == {}
+
+        downloads.release()
+        for _ in range(5):
+            await asyncio.sleep(0)
+        assert os.listdir(service.download_dir) == []
+
+    run(scenario)
+
+
+def test_failed_download_is_retried_by_next_acquire(service, monkeypatch):
+    failing = FakeDownloads(service.download_dir, fail=True)
+    monkeypatch.setattr(service, "download_video", failing)
+
+    async def scenario():
+        waiter = asyncio.ensure_future(service.acquire_video(URL))
+        await asyncio.sleep(0)
+        failing.release()
+        with pytest.raises(Exception, match="다운로드 실패"):
+            await waiter
+        assert service._downloads == {}
+
+        succeeding = FakeDownloads(service.download_dir)
+        succeeding.release()
+        monkeypatch.setattr(service, "download_video", succeeding)
+        video_path = await service.acquire_video(URL)
+        assert succeeding.calls == 1
+        service.release_video(video_path)
+        assert service._downloads == {}
+
+    run(scenario)